@@ -0,0 +1,61 @@
+"""
+Named version counters kept in the shared cache.
+
+Anything derived from a set of tables (cached documents, report files, ...)
+can include ``get_version(name)`` in its key and call ``bump_version(name)``
+when those tables change; every worker then sees the new version on its
+next read. A missing counter (first use, cache flush, eviction) restarts
+from the current time in milliseconds, so it never repeats a version handed
+out before.
+"""
+import logging
+import time
+
+from django.core.cache import cache
+
+logger = logging.getLogger("backend")
+
+VERSION_KEY_PREFIX = "version:"
+
+
+def _initial_version():
+    return int(time.time() * 1000)
+
+
+def get_version(name):
+    """Current version of ``name``."""
+    key = f"{VERSION_KEY_PREFIX}{name}"
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(*names):
+    """Current versions of several counters, fetched in one cache round trip."""
+    keys = [f"{VERSION_KEY_PREFIX}{name}" for name in names]
+    found = cache.get_many(keys)
+    versions = []
+    for name, key in zip(names, keys):
+        version = found.get(key)
+        versions.append(get_version(name) if version is None else version)
+    return versions
+
+
+def bump_version(name):
+    """
+    Move ``name`` to a new version. Failures are logged rather than raised:
+    callers run inside model signals, where a cache outage must not break
+    the write itself.
+    """
+    key = f"{VERSION_KEY_PREFIX}{name}"
+    try:
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.add(key, _initial_version(), timeout=None)
+            return cache.incr(key)
+    except Exception as e:
+        logger.warning(f"Could not bump cache version {name}: {str(e)}")
+        return None
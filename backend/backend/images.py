@@ -0,0 +1,183 @@
+"""
+Resized WebP and JPEG derivatives of uploaded images.
+
+Every model in IMAGE_VARIANT_MODELS has an ``image`` field, a ``variants``
+JSON map and a ``variants_status``. New rows start ``pending``; the
+``generate_image_variants`` worker claims them one at a time, renders
+``settings.IMAGE_VARIANT_WIDTHS`` (never wider than the original) in each
+format with EXIF orientation applied and all metadata dropped, and stores
+
+    {"width": 4000, "height": 3000,
+     "webp": {"320": "variants/property_images/x-320w.webp", ...},
+     "jpeg": {"320": "variants/property_images/x-320w.jpg", ...}}
+
+Serializers expose it through ``image_srcset``.
+"""
+import io
+import logging
+import os
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+logger = logging.getLogger("backend")
+
+IMAGE_VARIANT_MODELS = (
+    "property.PropertyImage",
+    "property.RoomImage",
+    "property.ReviewImage",
+    "property.SitePageImage",
+    "blog.BlogImage",
+)
+
+VARIANT_STATUS_CHOICES = [
+    ('pending', 'Pending'),
+    ('processing', 'Processing'),
+    ('ready', 'Ready'),
+    ('failed', 'Failed'),
+]
+
+# format -> (file extension, Pillow format, save options)
+VARIANT_FORMATS = {
+    "webp": ("webp", "WEBP", {"quality": 80, "method": 4}),
+    "jpeg": ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+}
+VARIANT_DIR = "variants"
+
+# A claim older than this belongs to a dead worker
+VARIANT_PROCESSING_TIMEOUT = timedelta(minutes=10)
+
+
+def image_variant_models(labels=None):
+    return [apps.get_model(label) for label in (labels or IMAGE_VARIANT_MODELS)]
+
+
+def media_url(name):
+    return f"{settings.WEBSITE_URL}{settings.MEDIA_URL}{name}"
+
+
+def image_srcset(variants):
+    """``{"webp": "<url> 320w, ...", "jpeg": ...}`` for a ``variants`` map, or None while not ready."""
+    if not variants:
+        return None
+    srcset = {}
+    for name in VARIANT_FORMATS:
+        widths = variants.get(name) or {}
+        srcset[name] = ", ".join(
+            f"{media_url(path)} {width}w" for width, path in sorted(widths.items(), key=lambda item: int(item[0]))
+        )
+    return srcset
+
+
+def _variant_name(original_name, width, extension):
+    directory, filename = os.path.split(original_name)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(VARIANT_DIR, directory, f"{stem}-{width}w.{extension}")
+
+
+def _delete_variant_files(variants):
+    for name in VARIANT_FORMATS:
+        for path in (variants or {}).get(name, {}).values():
+            try:
+                default_storage.delete(path)
+            except Exception as e:
+                logger.warning(f"Could not delete image variant {path}: {str(e)}")
+
+
+def render_variants(image_field):
+    """Write the derivatives of ``image_field`` to storage and return its ``variants`` map."""
+    with image_field.open("rb") as source:
+        original = Image.open(source)
+        original.load()
+    # Bake the EXIF rotation into the pixels; nothing else of the metadata is written
+    original = ImageOps.exif_transpose(original)
+    has_alpha = original.mode in ("RGBA", "LA") or (original.mode == "P" and "transparency" in original.info)
+    original = original.convert("RGBA" if has_alpha else "RGB")
+
+    widths = sorted({width for width in settings.IMAGE_VARIANT_WIDTHS if width < original.width})
+    if not widths or original.width <= max(settings.IMAGE_VARIANT_WIDTHS):
+        widths.append(original.width)
+
+    variants = {"width": original.width, "height": original.height}
+    for name, (extension, image_format, options) in VARIANT_FORMATS.items():
+        variants[name] = {}
+        for width in widths:
+            height = max(1, round(original.height * width / original.width))
+            resized = original if width == original.width else original.resize((width, height), Image.LANCZOS)
+            if image_format == "JPEG" and resized.mode == "RGBA":
+                flat = Image.new("RGB", resized.size, (255, 255, 255))
+                flat.paste(resized, mask=resized.getchannel("A"))
+                resized = flat
+            output = io.BytesIO()
+            resized.save(output, image_format, **options)
+            path = _variant_name(image_field.name, width, extension)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            variants[name][str(width)] = default_storage.save(path, ContentFile(output.getvalue()))
+    return variants
+
+
+def claim_next_image():
+    """Atomically move a pending image of any variant model to processing and return it, or None."""
+    for model in image_variant_models():
+        candidates = model.objects.filter(variants_status='pending').order_by('id').values_list('id', flat=True)[:10]
+        for image_id in candidates:
+            claimed = model.objects.filter(id=image_id, variants_status='pending').update(
+                variants_status='processing', updated_at=timezone.now()
+            )
+            if claimed:
+                return model.objects.get(id=image_id)
+    return None
+
+
+def process_image(instance):
+    """Render the variants of a claimed image and record the outcome on it."""
+    previous = instance.variants
+    try:
+        instance.variants = render_variants(instance.image)
+        instance.variants_status = 'ready'
+        stale = {
+            name: {width: path for width, path in (previous or {}).get(name, {}).items()
+                   if path not in instance.variants[name].values()}
+            for name in VARIANT_FORMATS
+        }
+        _delete_variant_files(stale)
+    except Exception as e:
+        logger.warning(f"Could not render variants of {instance._meta.label} {instance.pk}: {str(e)}")
+        instance.variants = {}
+        instance.variants_status = 'failed'
+    # Only the variant columns are written; post_save still fires, so receivers
+    # (cached documents) pick up the new variants
+    instance.save(update_fields=['variants', 'variants_status', 'updated_at'])
+    return instance
+
+
+def requeue_stale_images():
+    """Return images claimed by a dead worker to the queue."""
+    cutoff = timezone.now() - VARIANT_PROCESSING_TIMEOUT
+    return sum(
+        model.objects.filter(variants_status='processing', updated_at__lt=cutoff).update(variants_status='pending')
+        for model in image_variant_models()
+    )
+
+
+def requeue_images(labels=None, statuses=('ready', 'failed')):
+    """Queue images again (e.g. after changing IMAGE_VARIANT_WIDTHS); returns how many."""
+    return sum(
+        model.objects.filter(variants_status__in=statuses).update(variants_status='pending')
+        for model in image_variant_models(labels)
+    )
+
+
+def queue_replaced_image(sender, instance, update_fields=None, **kwargs):
+    """pre_save receiver: an existing row given a new image file goes back to the queue."""
+    if instance.pk is None or (update_fields is not None and 'image' not in update_fields):
+        return
+    current = sender.objects.filter(pk=instance.pk).values_list('image', flat=True).first()
+    if current is not None and current != instance.image.name:
+        instance.variants_status = 'pending'
@@ -0,0 +1,156 @@
+"""
+Keyset (cursor) pagination and sparse fieldsets for function-based list views.
+"""
+import base64
+import bisect
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginates newest-first on (created_at, id).
+
+    The cursor encodes the (created_at, id) of the last row of the previous
+    page, so each page is a single indexed range scan regardless of how deep
+    the client has paged. Clients pass ``?cursor=`` from ``next`` and may set
+    ``?page_size=`` up to ``API_MAX_PAGE_SIZE``.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    ordering = ('created_at', 'id')
+
+    def __init__(self, ordering=None):
+        if ordering:
+            self.ordering = ordering
+        self.page_size = settings.REST_FRAMEWORK.get('PAGE_SIZE') or 50
+        self.max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+        self.has_next = False
+        self.last_position = None
+        self.request = None
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if not value:
+            return self.page_size
+        try:
+            size = int(value)
+        except ValueError:
+            raise ValidationError({self.page_size_query_param: 'Must be an integer.'})
+        if size < 1:
+            raise ValidationError({self.page_size_query_param: 'Must be a positive integer.'})
+        return min(size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            created_at, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            return datetime.fromisoformat(created_at), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+
+    def encode_cursor(self, position):
+        created_at, pk = position
+        payload = json.dumps([created_at.isoformat(), pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        time_field, id_field = self.ordering
+
+        queryset = queryset.order_by(f'-{time_field}', f'-{id_field}')
+        position = self.decode_cursor(request)
+        if position is not None:
+            created_at, pk = position
+            queryset = queryset.filter(
+                Q(**{f'{time_field}__lt': created_at}) |
+                Q(**{time_field: created_at, f'{id_field}__lt': pk})
+            )
+
+        page = list(queryset[:page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        if page:
+            last = page[-1]
+            self.last_position = (getattr(last, time_field), getattr(last, id_field))
+        return page
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last_position))
+
+    def get_first_link(self):
+        return remove_query_param(self.request.build_absolute_uri(), self.cursor_query_param)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'first': self.get_first_link(),
+            'results': data,
+        })
+
+
+class RankedPagination(KeysetPagination):
+    """
+    Paginates a list of ``(score, id)`` pairs already sorted ascending, for
+    results ordered by a value computed outside the database (distance,
+    relevance). The cursor holds the last pair of the previous page.
+    """
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            score, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            return float(score), int(pk)
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'})
+
+    def encode_cursor(self, position):
+        return base64.urlsafe_b64encode(json.dumps(list(position)).encode()).decode()
+
+    def paginate_ranked(self, ranked, request):
+        """The page of ``ranked`` after the request's cursor."""
+        self.request = request
+        page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+        if position is not None:
+            start = bisect.bisect_right(ranked, position)
+        else:
+            start = 0
+        page = ranked[start:start + page_size + 1]
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        if page:
+            self.last_position = page[-1]
+        return page
+
+
+def apply_sparse_fieldset(serializer, request, param='fields'):
+    """
+    Drop every field not listed in ``?fields=a,b,c`` from ``serializer``
+    (or its child, for ``many=True``) before it is rendered, so unrequested
+    nested serializers are never evaluated. Unknown names are ignored.
+    """
+    requested = request.query_params.get(param)
+    if not requested:
+        return serializer
+    allowed = {name.strip() for name in requested.split(',') if name.strip()}
+    target = getattr(serializer, 'child', serializer)
+    for name in list(target.fields):
+        if name not in allowed:
+            target.fields.pop(name)
+    return serializer
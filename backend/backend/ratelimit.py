@@ -0,0 +1,161 @@
+"""
+Rate limiting shared by RateLimitMiddleware and the DRF throttles.
+
+Routes map to budgets through ``settings.RATE_LIMIT_ROUTES``, and every
+metered request of a client also counts against one ceiling over all routes,
+``settings.RATE_LIMIT_IP_PER_MINUTE``. The route table is
+compiled once per HTTP method into a single regex, so finding a request's
+budget costs one match. Counters are fixed windows kept in the shared cache
+with an atomic ``incr``, created with ``add`` and an expiry when a window
+opens, so concurrent requests never undercount. If the cache is unreachable
+each process falls back to counting in memory.
+"""
+import logging
+import re
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+
+logger = logging.getLogger("backend")
+
+RATE_LIMIT_KEY_PREFIX = "rl:"
+RATE_LIMIT_WINDOW = 60  # seconds, the window of the per-route budgets
+
+RouteBudget = namedtuple('RouteBudget', 'name methods pattern per_minute throttled')
+
+UNMETERED = RouteBudget('unmetered', None, None, None, False)
+
+
+class RouteTable:
+    """``RATE_LIMIT_ROUTES`` compiled into one alternation per HTTP method."""
+
+    def __init__(self, routes):
+        self.budgets = [RouteBudget(*route) for route in routes]
+        self._matchers = {}
+        self._lock = threading.Lock()
+
+    def _compile(self, method):
+        groups = []
+        for i, budget in enumerate(self.budgets):
+            if budget.methods is None or method in budget.methods:
+                groups.append(f"(?P<b{i}>{budget.pattern})")
+        return re.compile('|'.join(groups)) if groups else None
+
+    def match(self, method, path):
+        matcher = self._matchers.get(method)
+        if matcher is None and method not in self._matchers:
+            with self._lock:
+                matcher = self._matchers[method] = self._compile(method)
+        found = matcher.fullmatch(path) if matcher else None
+        if found is None:
+            return UNMETERED
+        return self.budgets[int(found.lastgroup[1:])]
+
+
+_route_table = None
+
+
+def route_budget(request):
+    """The RouteBudget governing ``request``, memoized on the request."""
+    global _route_table
+    budget = getattr(request, '_rate_limit_budget', None)
+    if budget is None:
+        if _route_table is None:
+            _route_table = RouteTable(settings.RATE_LIMIT_ROUTES)
+        budget = _route_table.match(request.method, request.path)
+        request._rate_limit_budget = budget
+    return budget
+
+
+class RateLimiter:
+    """Fixed-window request counters in the cache, with an in-process fallback."""
+
+    def __init__(self):
+        self._local = {}
+        self._lock = threading.Lock()
+        self._fallback_logged_at = 0
+
+    def hit(self, key, limit, window):
+        """
+        Count one request against ``key``. Returns ``(allowed, count,
+        retry_after)`` where ``retry_after`` is the number of seconds until
+        the window resets.
+        """
+        now = time.time()
+        bucket = int(now // window)
+        cache_key = f"{RATE_LIMIT_KEY_PREFIX}{key}:{window}:{bucket}"
+        try:
+            count = self._incr(cache_key, window)
+        except Exception as e:
+            self._log_fallback(e, now)
+            count = self._local_incr(cache_key, (bucket + 1) * window, now)
+        return count <= limit, count, (bucket + 1) * window - now
+
+    def _incr(self, key, window):
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # First request of the window; add() loses to a concurrent creator
+            if cache.add(key, 1, timeout=window + 1):
+                return 1
+            return cache.incr(key)
+
+    def _local_incr(self, key, expires_at, now):
+        with self._lock:
+            if len(self._local) > 10000:
+                self._local = {k: v for k, v in self._local.items() if v[1] > now}
+            count, _ = self._local.get(key, (0, expires_at))
+            self._local[key] = (count + 1, expires_at)
+            return count + 1
+
+    def _log_fallback(self, error, now):
+        if now - self._fallback_logged_at >= RATE_LIMIT_WINDOW:
+            self._fallback_logged_at = now
+            logger.warning(f"Rate limit cache unavailable, counting in process: {str(error)}")
+
+
+limiter = RateLimiter()
+
+
+def client_ip(request):
+    """Client IP address, preferring the first X-Forwarded-For hop."""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        return x_forwarded_for.split(',')[0]
+    return request.META.get('REMOTE_ADDR')
+
+
+def _too_many_requests(limit, retry_after):
+    response = JsonResponse(
+        {
+            'error': 'Rate limit exceeded. Please try again later.',
+            'detail': f'Maximum {limit} requests per {RATE_LIMIT_WINDOW} seconds allowed.'
+        },
+        status=429
+    )
+    response['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+def check_rate_limit(request):
+    """
+    Count ``request`` against its route budget and against the client's
+    ceiling over all routes; a 429 response if either is spent, else None.
+    """
+    budget = route_budget(request)
+    if budget.per_minute is None:
+        return None
+    ip = client_ip(request)
+    allowed, _, retry_after = limiter.hit(f"{budget.name}:{ip}", budget.per_minute, RATE_LIMIT_WINDOW)
+    if not allowed:
+        return _too_many_requests(budget.per_minute, retry_after)
+    # Each route group has its own bucket; this one caps their sum
+    ceiling = settings.RATE_LIMIT_IP_PER_MINUTE
+    allowed, _, retry_after = limiter.hit(f"ip:{ip}", ceiling, RATE_LIMIT_WINDOW)
+    if not allowed:
+        return _too_many_requests(ceiling, retry_after)
+    return None
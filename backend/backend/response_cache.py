@@ -0,0 +1,77 @@
+"""
+Versioned caching of whole JSON responses for read-mostly endpoints.
+
+A response is cached as rendered bytes under a key made of the endpoint
+name and the current cache versions (backend.cache_versions) of the models
+it is built from; signals bump a model's version when it changes, so stale
+bytes are never served and need no explicit deletion. The same versions
+form a strong ETag: a client repeating ``If-None-Match`` gets a 304 after
+one cache round trip, without touching the database or the serializers.
+When the cache is unreachable the response is built from the database on
+every request, without an ETag.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.renderers import JSONRenderer
+
+from .cache_versions import get_versions
+
+logger = logging.getLogger("backend")
+
+RESPONSE_CACHE_KEY_PREFIX = "response:"
+
+
+def model_version(model):
+    """Name of the cache version bumped whenever rows of ``model`` change."""
+    return f"model:{model._meta.label_lower}"
+
+
+def _etag_matches(request, etag):
+    header = request.META.get("HTTP_IF_NONE_MATCH")
+    if not header:
+        return False
+    # If-None-Match uses the weak comparison: W/"x" matches "x"
+    candidates = {tag[2:] if tag.startswith("W/") else tag for tag in parse_etags(header)}
+    return "*" in candidates or etag in candidates
+
+
+def cached_json_response(request, name, models, build):
+    """
+    The JSON response of ``build()`` (serializer data) for the endpoint
+    ``name``, which depends only on the rows of ``models``. Answers 304 when
+    the client already holds the current version.
+    """
+    try:
+        versions = get_versions(*(model_version(model) for model in models))
+    except Exception as e:
+        logger.warning(f"Response cache unavailable, building {name} uncached: {str(e)}")
+        return HttpResponse(JSONRenderer().render(build()), content_type="application/json")
+    version_key = "-".join(str(version) for version in versions)
+    etag = f'"{name}-{version_key}"'
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+        response["ETag"] = etag
+        return response
+
+    key = f"{RESPONSE_CACHE_KEY_PREFIX}{name}:{version_key}"
+    try:
+        body = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Response cache unavailable, building {name} uncached: {str(e)}")
+        body = None
+    if body is None:
+        body = JSONRenderer().render(build())
+        try:
+            cache.set(key, body, timeout=settings.RESPONSE_CACHE_TIMEOUT)
+            logger.debug(f"Cached response {name} at version {version_key}")
+        except Exception as e:
+            logger.warning(f"Could not cache response {name}: {str(e)}")
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    # Clients may keep the body but must revalidate it on every use
+    response["Cache-Control"] = "no-cache"
+    return response
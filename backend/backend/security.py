@@ -1,54 +1,26 @@
 """
 Custom security middleware and utilities for DDoS and malware protection.
 """
-from django.core.cache import cache
 from django.http import JsonResponse
 from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 import time
 import hashlib
 import re
+from .ratelimit import check_rate_limit, client_ip
 
 
 class IPRateLimitMiddleware(MiddlewareMixin):
     """
     Middleware to rate limit requests per IP address to prevent DDoS attacks.
+    Uses the same route budgets and counters as backend.middleware.RateLimitMiddleware.
     """
     def process_request(self, request):
-        # Skip rate limiting for certain paths
-        exempt_paths = ['/api/admin/', '/static/', '/media/']
-        if any(request.path.startswith(path) for path in exempt_paths):
-            return None
-
-        # Get client IP
-        ip = self.get_client_ip(request)
-        
-        # Check rate limit
-        cache_key = f'ratelimit:{ip}'
-        request_count = cache.get(cache_key, 0)
-        
-        # Get rate limit from settings
-        max_requests = getattr(settings, 'RATE_LIMIT_REQUESTS_PER_MINUTE', 60)
-        
-        if request_count >= max_requests:
-            return JsonResponse(
-                {'error': 'Rate limit exceeded. Please try again later.'},
-                status=429
-            )
-        
-        # Increment counter
-        cache.set(cache_key, request_count + 1, 60)  # 60 seconds TTL
-        
-        return None
+        return check_rate_limit(request)
 
     def get_client_ip(self, request):
         """Get the real client IP address, handling proxies."""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        return ip
+        return client_ip(request)
 
 
 class RequestSizeMiddleware(MiddlewareMixin):
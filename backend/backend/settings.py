@@ -115,6 +115,7 @@ INSTALLED_APPS = [
     "offer",
     "stats",
     "blog",
+    "jobs",
     "whitenoise",
 ]
 
@@ -198,6 +199,15 @@ DATABASES = {
     }
 }
 
+if DB_ENGINE == 'django.db.backends.sqlite3':
+    # Concurrent writers wait up to this many seconds for the write lock
+    DB_OPTIONS['timeout'] = config('DB_SQLITE_TIMEOUT', default=20, cast=int)
+    # A file test database, so tests writing from several threads queue for
+    # the lock; the default in-memory one fails them with "table is locked"
+    DATABASES["default"]["TEST"] = {
+        "NAME": config('DB_TEST_NAME', default=str(BASE_DIR / "test_db.sqlite3")),
+    }
+
 
 # Cache
 CACHES = {
@@ -289,6 +299,71 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Rate limiting (backend.ratelimit). RateLimitMiddleware gives each client IP
+# a per-minute budget per route group; the DRF anon/user throttles above
+# additionally count requests to routes marked as throttled.
+RATE_LIMIT_REQUESTS_PER_MINUTE = config('RATE_LIMIT_REQUESTS_PER_MINUTE', default=500 if APP_ENV == 'PROD' else 2000, cast=int)
+RATE_LIMIT_OTP_PER_MINUTE = config('RATE_LIMIT_OTP_PER_MINUTE', default=10, cast=int)
+# Ceiling on one IP's metered requests per minute summed over all route budgets
+RATE_LIMIT_IP_PER_MINUTE = config('RATE_LIMIT_IP_PER_MINUTE', default=RATE_LIMIT_REQUESTS_PER_MINUTE, cast=int)
+
+# Route budgets, first match wins:
+# (name, methods or None for any, full-path regex, requests per minute or None for unlimited, DRF throttled)
+RATE_LIMIT_ROUTES = [
+    ('unmetered', None, r'/(api/admin|admin|static|media)/.*', None, False),
+    ('otp', ('POST',), r'/api/users/(send|verify)-otp/?', RATE_LIMIT_OTP_PER_MINUTE, True),
+    # Read-only endpoints hit repeatedly while forms and dashboards load
+    ('reference', ('GET',), r'/api/property/(amenities|rules|documentations|image-categories|state|city|country|properties|properties/\d+|all-properties)/?', RATE_LIMIT_REQUESTS_PER_MINUTE, False),
+    # Typeahead, called on every keystroke
+    ('typeahead', ('GET',), r'/api/property/(autocomplete|search/[^/]+|areas/[^/]+)/?', RATE_LIMIT_REQUESTS_PER_MINUTE, False),
+    ('dashboard', ('GET',), r'/api/stats/(dashboard|property-occupancy|sales|expenses|users)/?', RATE_LIMIT_REQUESTS_PER_MINUTE, False),
+    ('default', None, r'.*', RATE_LIMIT_REQUESTS_PER_MINUTE, True),
+]
+
+# Upper bound for ?page_size= on keyset-paginated list endpoints (backend.pagination)
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=200, cast=int)
+
+# Most stays priced by one POST /api/property/quote/ request (property.pricing)
+QUOTE_MAX_STAYS = config('QUOTE_MAX_STAYS', default=200, cast=int)
+
+# Report jobs (jobs app): how long finished report files are kept and reused,
+# and how often an idle worker polls for new jobs
+REPORT_JOB_RESULT_TTL = config('REPORT_JOB_RESULT_TTL', default=86400, cast=int)  # 24 hours
+REPORT_JOB_POLL_INTERVAL = config('REPORT_JOB_POLL_INTERVAL', default=2, cast=int)  # seconds
+
+# Lifetime of the cached per-user auth principal (users.principal); changes to
+# users, permissions and property assignments invalidate it sooner
+AUTH_PRINCIPAL_CACHE_TIMEOUT = config('AUTH_PRINCIPAL_CACHE_TIMEOUT', default=3600, cast=int)  # 1 hour
+
+# Lifetime of cached reference-data responses (backend.response_cache); model
+# changes replace them sooner through cache version bumps
+RESPONSE_CACHE_TIMEOUT = config('RESPONSE_CACHE_TIMEOUT', default=86400, cast=int)  # 24 hours
+
+# Lifetime of cached property_detail documents (property.documents); changes
+# to anything a document shows replace it sooner
+PROPERTY_DOCUMENT_CACHE_TIMEOUT = config('PROPERTY_DOCUMENT_CACHE_TIMEOUT', default=86400, cast=int)  # 24 hours
+
+# How often (seconds) a worker checks whether its in-memory location
+# autocomplete index (property.autocomplete) is out of date
+AUTOCOMPLETE_VERSION_CHECK_INTERVAL = config('AUTOCOMPLETE_VERSION_CHECK_INTERVAL', default=2, cast=int)
+
+# How often (seconds) a worker checks whether its in-memory offer index
+# (offer.resolution) is out of date
+OFFER_INDEX_VERSION_CHECK_INTERVAL = config('OFFER_INDEX_VERSION_CHECK_INTERVAL', default=2, cast=int)
+
+# How often (seconds) a worker checks whether its in-memory copy of the
+# Setting rows (property.settings_registry) is out of date
+SETTINGS_VERSION_CHECK_INTERVAL = config('SETTINGS_VERSION_CHECK_INTERVAL', default=2, cast=int)
+
+# Widths (px) of the WebP/JPEG variants rendered for uploaded images
+# (backend.images), and how often an idle generate_image_variants worker polls
+IMAGE_VARIANT_WIDTHS = config('IMAGE_VARIANT_WIDTHS', default='320,640,1024,1600', cast=Csv(int))
+IMAGE_VARIANT_POLL_INTERVAL = config('IMAGE_VARIANT_POLL_INTERVAL', default=5, cast=int)  # seconds
+
+# How often (seconds) flush_blog_views moves buffered blog page views
+# (blog.view_counts) into Blog.views_count
+BLOG_VIEW_FLUSH_INTERVAL = config('BLOG_VIEW_FLUSH_INTERVAL', default=60, cast=int)
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=config('JWT_ACCESS_TOKEN_LIFETIME_MINUTES', default=5, cast=int)),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=config('JWT_REFRESH_TOKEN_LIFETIME_DAYS', default=1, cast=int)),
@@ -0,0 +1,106 @@
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.request import Request
+
+from users.models import HsUser
+
+from .pagination import KeysetPagination
+from .ratelimit import RATE_LIMIT_WINDOW, RateLimiter, RouteTable, check_rate_limit, limiter, route_budget
+
+# Middle of a window, so the counters cannot roll over during a test
+NOW = 1_700_000_030.0
+
+
+@mock.patch("backend.ratelimit.time.time", return_value=NOW)
+class RateLimitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def request(self, method, path, ip="10.0.0.1"):
+        return getattr(self.factory, method.lower())(path, REMOTE_ADDR=ip)
+
+    def test_routes_resolve_to_their_budgets(self, _):
+        table = RouteTable(settings.RATE_LIMIT_ROUTES)
+        self.assertEqual(table.match("POST", "/api/users/send-otp/").name, "otp")
+        self.assertEqual(table.match("POST", "/api/users/verify-otp").name, "otp")
+        self.assertEqual(table.match("GET", "/api/property/amenities/").name, "reference")
+        self.assertEqual(table.match("GET", "/api/property/properties/12/").name, "reference")
+        self.assertEqual(table.match("GET", "/api/property/autocomplete/").name, "typeahead")
+        self.assertEqual(table.match("GET", "/api/stats/dashboard/").name, "dashboard")
+        # Budgets only apply to their methods; everything else is the default
+        self.assertEqual(table.match("POST", "/api/property/amenities/").name, "default")
+        self.assertEqual(table.match("GET", "/api/users/send-otp/").name, "default")
+
+    def test_limiter_counts_with_add_then_incr(self, _):
+        rate_limiter = RateLimiter()
+        results = [rate_limiter.hit("key", 3, RATE_LIMIT_WINDOW) for _ in range(4)]
+        self.assertEqual([count for _, count, _ in results], [1, 2, 3, 4])
+        self.assertEqual([allowed for allowed, _, _ in results], [True, True, True, False])
+        self.assertEqual(results[-1][2], RATE_LIMIT_WINDOW - NOW % RATE_LIMIT_WINDOW)
+        self.assertEqual(rate_limiter._local, {})
+
+    def test_limiter_counts_in_process_without_cache(self, _):
+        rate_limiter = RateLimiter()
+        with mock.patch("backend.ratelimit.cache.incr", side_effect=ConnectionError("down")):
+            results = [rate_limiter.hit("key", 2, RATE_LIMIT_WINDOW) for _ in range(3)]
+        self.assertEqual([allowed for allowed, _, _ in results], [True, True, False])
+        self.assertEqual(len(rate_limiter._local), 1)
+
+    def test_spent_budget_returns_429_per_route_and_client(self, _):
+        budget = route_budget(self.request("POST", "/api/users/send-otp/"))
+        for _ in range(budget.per_minute):
+            self.assertIsNone(check_rate_limit(self.request("POST", "/api/users/send-otp/")))
+
+        response = check_rate_limit(self.request("POST", "/api/users/send-otp/"))
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], str(int(RATE_LIMIT_WINDOW - NOW % RATE_LIMIT_WINDOW)))
+
+        # Other routes and other clients keep their own buckets
+        self.assertIsNone(check_rate_limit(self.request("GET", "/api/property/amenities/")))
+        self.assertIsNone(check_rate_limit(self.request("POST", "/api/users/send-otp/", ip="10.0.0.2")))
+        self.assertEqual(cache.get(f"rl:otp:10.0.0.1:{RATE_LIMIT_WINDOW}:{int(NOW // RATE_LIMIT_WINDOW)}"), budget.per_minute + 1)
+
+    @override_settings(RATE_LIMIT_IP_PER_MINUTE=3)
+    def test_ceiling_counts_every_route_of_a_client(self, _):
+        for method, path in [("GET", "/api/property/amenities/"), ("GET", "/api/stats/dashboard/"), ("POST", "/api/booking/bookings/")]:
+            self.assertIsNone(check_rate_limit(self.request(method, path)))
+        # A fresh route budget does not lift the client above the ceiling
+        response = check_rate_limit(self.request("GET", "/api/property/autocomplete/"))
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(b"Maximum 3 requests", response.content)
+        self.assertIsNone(check_rate_limit(self.request("GET", "/api/property/autocomplete/", ip="10.0.0.2")))
+
+    def test_middleware_answers_429(self, _):
+        budget = route_budget(self.request("POST", "/api/users/verify-otp/"))
+        key = "otp:127.0.0.1"
+        for _ in range(budget.per_minute):
+            limiter.hit(key, budget.per_minute, RATE_LIMIT_WINDOW)
+        response = self.client.post("/api/users/verify-otp/", {})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Rate limit exceeded", response.json()["error"])
+
+
+@override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "PAGE_SIZE": 2})
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        for i in range(5):
+            HsUser.objects.create(mobile=f"900000000{i}", name=f"User {i}")
+
+    def page(self, path):
+        paginator = KeysetPagination()
+        rows = paginator.paginate_queryset(HsUser.objects.all(), Request(RequestFactory().get(path)))
+        return [user.mobile for user in rows], paginator.get_paginated_response([]).data["next"]
+
+    def test_requests_without_parameters_get_the_default_page(self):
+        mobiles, next_url = self.page("/api/users/")
+        self.assertEqual(mobiles, ["9000000004", "9000000003"])
+
+        seen = list(mobiles)
+        while next_url:
+            mobiles, next_url = self.page(next_url)
+            seen.extend(mobiles)
+        self.assertEqual(seen, [f"900000000{i}" for i in range(4, -1, -1)])
@@ -1,76 +1,42 @@
 """
 Custom throttling classes for Django REST Framework
 """
-import re
 from rest_framework.throttling import UserRateThrottle, AnonRateThrottle
 
+from .ratelimit import limiter, route_budget
 
-class ReadOnlyExemptThrottle(UserRateThrottle):
+
+class RouteBudgetThrottleMixin:
+    """
+    Skips routes whose budget in settings.RATE_LIMIT_ROUTES is not throttled
+    (read-only endpoints that forms and dashboards call repeatedly) and
+    counts the rest with the shared atomic limiter instead of DRF's cached
+    request history.
+    """
+
+    def allow_request(self, request, view):
+        if not route_budget(request).throttled or self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        allowed, _, self.retry_after = limiter.hit(self.key, self.num_requests, self.duration)
+        return allowed
+
+    def wait(self):
+        return getattr(self, 'retry_after', None)
+
+
+class ReadOnlyExemptThrottle(RouteBudgetThrottleMixin, UserRateThrottle):
     """
     Throttle class that exempts GET requests to read-only endpoints from throttling.
     This allows form initialization to make multiple GET requests without hitting rate limits.
     """
-    
-    # Paths that should be exempt from throttling for GET requests
-    EXEMPT_GET_PATHS = [
-        r'^/api/property/amenities/?$',
-        r'^/api/property/rules/?$',
-        r'^/api/property/documentations/?$',
-        r'^/api/property/image-categories/?$',
-        r'^/api/property/state/?$',
-        r'^/api/property/city/?$',
-        r'^/api/property/country/?$',
-        r'^/api/property/properties/?$',
-        r'^/api/property/properties/\d+/?$',
-        r'^/api/property/all-properties/?$',
-        r'^/api/stats/dashboard/?$',
-        r'^/api/stats/property-occupancy/?$',
-        r'^/api/stats/sales/?$',
-        r'^/api/stats/expenses/?$',
-        r'^/api/stats/users/?$',
-    ]
-    
-    def allow_request(self, request, view):
-        # If it's a GET request to an exempt path, allow it without throttling
-        if request.method == 'GET':
-            for pattern in self.EXEMPT_GET_PATHS:
-                if re.match(pattern, request.path):
-                    return True
-        
-        # Otherwise, use the default throttling behavior
-        return super().allow_request(request, view)
 
 
-class ReadOnlyExemptAnonThrottle(AnonRateThrottle):
+class ReadOnlyExemptAnonThrottle(RouteBudgetThrottleMixin, AnonRateThrottle):
     """
     Throttle class for anonymous users that exempts GET requests to read-only endpoints.
     """
-    
-    # Paths that should be exempt from throttling for GET requests
-    EXEMPT_GET_PATHS = [
-        r'^/api/property/amenities/?$',
-        r'^/api/property/rules/?$',
-        r'^/api/property/documentations/?$',
-        r'^/api/property/image-categories/?$',
-        r'^/api/property/state/?$',
-        r'^/api/property/city/?$',
-        r'^/api/property/country/?$',
-        r'^/api/property/properties/?$',
-        r'^/api/property/properties/\d+/?$',
-        r'^/api/property/all-properties/?$',
-        r'^/api/stats/dashboard/?$',
-        r'^/api/stats/property-occupancy/?$',
-        r'^/api/stats/sales/?$',
-        r'^/api/stats/expenses/?$',
-        r'^/api/stats/users/?$',
-    ]
-    
-    def allow_request(self, request, view):
-        # If it's a GET request to an exempt path, allow it without throttling
-        if request.method == 'GET':
-            for pattern in self.EXEMPT_GET_PATHS:
-                if re.match(pattern, request.path):
-                    return True
-        
-        # Otherwise, use the default throttling behavior
-        return super().allow_request(request, view)
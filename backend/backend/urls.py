@@ -12,5 +12,6 @@ urlpatterns = [
     path('api/offers/', include('offer.urls')),
     path('api/stats/', include('stats.urls')),
     path('api/blog/', include('blog.urls')),
+    path('api/jobs/', include('jobs.urls')),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
 
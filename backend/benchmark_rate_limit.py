@@ -0,0 +1,103 @@
+"""
+Load benchmark for the rate limiter.
+
+Drives check_rate_limit() with requests spread over the route budgets from
+several threads against the configured cache, and the get/set counter it
+replaced for comparison, and prints the overhead per request. Clients use
+addresses from 198.18.0.0/15 (reserved for benchmarks), one per request
+block, so no request is refused; their counters expire with the window.
+
+    python benchmark_rate_limit.py --requests 20000 --threads 8
+"""
+import argparse
+import os
+import threading
+import time
+
+import django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+django.setup()
+
+from django.core.cache import cache, caches
+from django.test import RequestFactory
+
+from backend.ratelimit import RATE_LIMIT_WINDOW, check_rate_limit
+
+PATHS = [
+    ('GET', '/api/property/amenities/'),
+    ('GET', '/api/property/autocomplete/'),
+    ('GET', '/api/stats/dashboard/'),
+    ('GET', '/api/booking/bookings/'),
+    ('POST', '/api/booking/bookings/'),
+]
+
+
+def previous_check(request, max_requests=500, window=RATE_LIMIT_WINDOW):
+    """The counter RateLimitMiddleware used before: cache.get, then cache.set."""
+    ip = request.META.get('REMOTE_ADDR')
+    cache_key = f'ratelimit:{ip}:{int(time.time() / window)}'
+    current_requests = cache.get(cache_key, 0)
+    if current_requests >= max_requests:
+        return 429
+    cache.set(cache_key, current_requests + 1, window)
+    return None
+
+
+def build_requests(count, offset):
+    factory = RequestFactory()
+    requests = []
+    for i in range(count):
+        # 100 requests per client stay under every route budget and the ceiling
+        client = offset + i // 100
+        ip = f"198.18.{client // 256 % 256}.{client % 256}"
+        method, path = PATHS[i % len(PATHS)]
+        requests.append(getattr(factory, method.lower())(path, REMOTE_ADDR=ip))
+    return requests
+
+
+def run(check, requests_per_thread, threads):
+    """Seconds taken for ``threads`` threads to pass their requests through ``check``, and the 429s seen."""
+    batches = [build_requests(requests_per_thread, t * (requests_per_thread // 100 + 1)) for t in range(threads)]
+    refused, errors = [], []
+    start = threading.Barrier(threads + 1)
+
+    def worker(batch):
+        start.wait()
+        try:
+            refused.append(sum(1 for request in batch if check(request) is not None))
+        except Exception as e:
+            errors.append(e)
+
+    workers = [threading.Thread(target=worker, args=(batch,)) for batch in batches]
+    for thread in workers:
+        thread.start()
+    start.wait()
+    started = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return time.perf_counter() - started, sum(refused)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=20000, help='Requests per run, split over the threads.')
+    parser.add_argument('--threads', type=int, default=8)
+    args = parser.parse_args()
+
+    backend = caches['default']
+    print(f"Cache: {backend.__class__.__module__}.{backend.__class__.__name__}")
+    per_thread = args.requests // args.threads
+    for name, check in (('atomic limiter', check_rate_limit), ('previous get/set', previous_check)):
+        for threads in sorted({1, args.threads}):
+            count = per_thread * threads
+            elapsed, refused = run(check, per_thread, threads)
+            print(
+                f"{name:>16}, {threads} thread(s): {count} requests in {elapsed:.2f}s, "
+                f"{elapsed / count * 1e6:.0f} µs/request, {count / elapsed:.0f} requests/s, {refused} refused"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.view_counts import flush_view_counts
+
+
+class Command(BaseCommand):
+    help = "Periodically move buffered blog page views into Blog.views_count."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Flush once and exit (e.g. from cron) instead of flushing every interval.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=None,
+            help="Seconds between flushes (default BLOG_VIEW_FLUSH_INTERVAL).",
+        )
+
+    def flush(self):
+        result = flush_view_counts()
+        if result is None:
+            self.stdout.write("Another flush is running, skipped")
+            return
+        blogs, views = result
+        if views:
+            self.stdout.write(f"Flushed {views} views of {blogs} blogs")
+
+    def handle(self, *args, **options):
+        sleep = options["sleep"] if options["sleep"] is not None else settings.BLOG_VIEW_FLUSH_INTERVAL
+        while True:
+            self.flush()
+            if options["once"]:
+                break
+            time.sleep(sleep)
+        self.stdout.write(self.style.SUCCESS("Blog views flushed"))
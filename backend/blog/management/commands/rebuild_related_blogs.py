@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blog.related import refresh_related_blogs
+
+
+class Command(BaseCommand):
+    help = "Recompute the RelatedBlog table behind the related_blogs endpoint."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--blog",
+            type=int,
+            action="append",
+            dest="blog_ids",
+            help="Only refresh the lists affected by the given blog id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_related_blogs(options.get("blog_ids"))
+        self.stdout.write(self.style.SUCCESS(f"Refreshed related blogs of {count} blogs"))
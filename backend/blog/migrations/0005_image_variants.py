@@ -0,0 +1,23 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_add_default_categories'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogimage',
+            name='variants',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blogimage',
+            name='variants_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('ready', 'Ready'), ('failed', 'Failed')], db_index=True, default='pending', editable=False, max_length=12),
+        ),
+    ]
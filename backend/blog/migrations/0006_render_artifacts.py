@@ -0,0 +1,49 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:23
+
+from django.db import migrations, models
+
+from blog.rendering import render_content
+
+
+def render_existing_blogs(apps, schema_editor):
+    """Fill the render artifacts of blogs saved before they existed."""
+    Blog = apps.get_model('blog', 'Blog')
+    for blog in Blog.objects.only('id', 'content').iterator():
+        rendered = render_content(blog.content)
+        Blog.objects.filter(id=blog.id).update(
+            content_html=rendered.html,
+            plain_text=rendered.plain_text,
+            excerpt=rendered.excerpt,
+            word_count=rendered.word_count,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='excerpt',
+            field=models.CharField(blank=True, editable=False, max_length=300),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='plain_text',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(render_existing_blogs, migrations.RunPython.noop),
+    ]
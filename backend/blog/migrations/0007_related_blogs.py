@@ -0,0 +1,27 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:26
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_render_artifacts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RelatedBlog',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('score', models.FloatField()),
+                ('source', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_links', to='blog.blog')),
+                ('target', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='related_from', to='blog.blog')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['source', '-score'], name='blog_relate_source__15330a_idx')],
+                'unique_together': {('source', 'target')},
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
+from backend.images import VARIANT_STATUS_CHOICES
+from .rendering import EXCERPT_LENGTH, read_time_minutes, render_content
 from users.models import HsUser
 
 
@@ -48,6 +50,10 @@ class BlogTag(models.Model):
 class BlogImage(models.Model):
     id = models.AutoField(primary_key=True)
     image = models.ImageField(upload_to='blog_images/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    variants_status = models.CharField(
+        max_length=12, choices=VARIANT_STATUS_CHOICES, default='pending', db_index=True, editable=False
+    )
     alt_text = models.CharField(max_length=255, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
@@ -71,6 +77,11 @@ class Blog(models.Model):
     )
     images = models.ManyToManyField(BlogImage, blank=True, related_name='blogs')
     content = models.TextField()  # JSON string from Lexical editor
+    # Derived from content on save (blog.rendering)
+    content_html = models.TextField(blank=True, editable=False)
+    plain_text = models.TextField(blank=True, editable=False)
+    excerpt = models.CharField(max_length=EXCERPT_LENGTH, blank=True, editable=False)
+    word_count = models.PositiveIntegerField(default=0, editable=False)
     category = models.ForeignKey(
         BlogCategory, 
         on_delete=models.SET_NULL, 
@@ -103,17 +114,48 @@ class Blog(models.Model):
             self.published_at = timezone.now()
         elif not self.is_published:
             self.published_at = None
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'content' in update_fields:
+            self.render_content()
+            if update_fields is not None:
+                kwargs['update_fields'] = set(update_fields) | {'content_html', 'plain_text', 'excerpt', 'word_count'}
             
         super().save(*args, **kwargs)
 
+    def render_content(self):
+        rendered = render_content(self.content)
+        self.content_html = rendered.html
+        self.plain_text = rendered.plain_text
+        self.excerpt = rendered.excerpt
+        self.word_count = rendered.word_count
+
     def __str__(self):
         return self.title
 
     @property
     def read_time(self):
-        """Estimate reading time in minutes based on content length"""
-        words_per_minute = 200
-        word_count = len(self.content.split())
-        minutes = word_count // words_per_minute
-        return max(1, minutes)  # Minimum 1 minute
+        """Estimate reading time in minutes based on the stored word count"""
+        return read_time_minutes(self.word_count)
+
+
+
+class RelatedBlog(models.Model):
+    """
+    Precomputed ``related_blogs`` entry: ``target`` is one of the
+    best-scoring published blogs to show next to published ``source``
+    (blog.related).
+    """
+    id = models.BigAutoField(primary_key=True)
+    source = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='related_links')
+    target = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='related_from')
+    score = models.FloatField()
 
+    class Meta:
+        unique_together = ('source', 'target')
+        indexes = [
+            models.Index(fields=['source', '-score']),
+        ]
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id} ({self.score:.3f})"
@@ -0,0 +1,26 @@
+from django.db.models import Count, Prefetch, Q
+
+from .models import Blog, BlogCategory, BlogTag
+
+
+def with_published_blog_count(queryset):
+    """Annotate categories or tags with the ``published_blog_count`` their serializers show."""
+    return queryset.annotate(published_blog_count=Count('blogs', filter=Q(blogs__is_published=True)))
+
+
+def blog_list_queryset(queryset=None):
+    """
+    Return ``queryset`` (default: all blogs) ready for BlogListSerializer:
+    the large content columns are left unloaded and the related rows it
+    shows are fetched in a fixed number of queries.
+    """
+    if queryset is None:
+        queryset = Blog.objects.all()
+    return (
+        queryset.defer('content', 'content_html', 'plain_text')
+        .select_related('author', 'featured_image')
+        .prefetch_related(
+            Prefetch('category', queryset=with_published_blog_count(BlogCategory.objects.all())),
+            Prefetch('tags', queryset=with_published_blog_count(BlogTag.objects.all())),
+        )
+    )
@@ -0,0 +1,121 @@
+"""
+Precomputed related-blog graph behind ``related_blogs``.
+
+Every published blog keeps RelatedBlog rows for its RELATED_BLOG_LIMIT
+best published candidates, i.e. blogs sharing its category or a tag,
+scored by
+
+    TAG_WEIGHT * Jaccard(tags) + CATEGORY_WEIGHT * same category
+        + RECENCY_WEIGHT * publication proximity
+
+Proximity (1 for the same day, 1/2 RECENCY_SCALE_DAYS apart, ...) is
+relative to the source blog rather than to today, so a stored score never
+goes stale on its own and only changes when one of the two blogs does.
+Signals refresh the lists a changed blog can enter or leave: its own, the
+ones already listing it and those of the blogs it now shares a category or
+tag with.
+"""
+import logging
+from collections import defaultdict, namedtuple
+
+from django.db import transaction
+
+from .models import Blog, RelatedBlog
+
+logger = logging.getLogger("blog")
+
+RELATED_BLOG_LIMIT = 10
+TAG_WEIGHT = 0.6
+CATEGORY_WEIGHT = 0.3
+RECENCY_WEIGHT = 0.1
+RECENCY_SCALE_DAYS = 90
+
+BlogFeatures = namedtuple("BlogFeatures", "category_id published_at tag_ids")
+
+
+class RelatedBlogGraph:
+    """Categories, tags and publication dates of every published blog."""
+
+    def __init__(self):
+        tag_ids = defaultdict(set)
+        rows = Blog.tags.through.objects.filter(blog__is_published=True).values_list('blog_id', 'blogtag_id')
+        for blog_id, tag_id in rows:
+            tag_ids[blog_id].add(tag_id)
+        self.features = {
+            blog_id: BlogFeatures(category_id, published_at, frozenset(tag_ids[blog_id]))
+            for blog_id, category_id, published_at in Blog.objects.filter(is_published=True).values_list(
+                'id', 'category_id', 'published_at'
+            )
+        }
+        self.by_category = defaultdict(set)
+        self.by_tag = defaultdict(set)
+        for blog_id, features in self.features.items():
+            if features.category_id:
+                self.by_category[features.category_id].add(blog_id)
+            for tag_id in features.tag_ids:
+                self.by_tag[tag_id].add(blog_id)
+
+    def neighbours(self, blog_id):
+        """Published blogs sharing the category or a tag of ``blog_id``."""
+        features = self.features.get(blog_id)
+        if features is None:
+            return set()
+        found = set(self.by_category.get(features.category_id, ())) if features.category_id else set()
+        for tag_id in features.tag_ids:
+            found |= self.by_tag[tag_id]
+        found.discard(blog_id)
+        return found
+
+    def score(self, source_id, target_id):
+        source, target = self.features[source_id], self.features[target_id]
+        union = source.tag_ids | target.tag_ids
+        tags = len(source.tag_ids & target.tag_ids) / len(union) if union else 0.0
+        category = 1.0 if source.category_id and source.category_id == target.category_id else 0.0
+        proximity = 0.0
+        if source.published_at and target.published_at:
+            days = abs((source.published_at - target.published_at).total_seconds()) / 86400
+            proximity = 1 / (1 + days / RECENCY_SCALE_DAYS)
+        return TAG_WEIGHT * tags + CATEGORY_WEIGHT * category + RECENCY_WEIGHT * proximity
+
+    def related(self, source_id):
+        """[(score, target_id)] best first; equal scores prefer the newer blog."""
+        scored = [(self.score(source_id, target_id), target_id) for target_id in self.neighbours(source_id)]
+        scored.sort(key=lambda item: (-item[0], -self._timestamp(item[1]), item[1]))
+        return scored[:RELATED_BLOG_LIMIT]
+
+    def _timestamp(self, blog_id):
+        published_at = self.features[blog_id].published_at
+        return published_at.timestamp() if published_at else 0.0
+
+
+def refresh_related_blogs(blog_ids=None):
+    """
+    Recompute the related lists affected by changes to the given blogs (all
+    lists when ``blog_ids`` is None). Returns the number of lists written.
+    """
+    graph = RelatedBlogGraph()
+    if blog_ids is None:
+        sources = set(graph.features)
+    else:
+        blog_ids = set(blog_ids)
+        if not blog_ids:
+            return 0
+        sources = set(blog_ids)
+        sources |= set(RelatedBlog.objects.filter(target_id__in=blog_ids).values_list('source_id', flat=True))
+        for blog_id in blog_ids:
+            sources |= graph.neighbours(blog_id)
+
+    rows = [
+        RelatedBlog(source_id=source_id, target_id=target_id, score=score)
+        for source_id in sources
+        if source_id in graph.features
+        for score, target_id in graph.related(source_id)
+    ]
+    with transaction.atomic():
+        if blog_ids is None:
+            RelatedBlog.objects.all().delete()
+        else:
+            RelatedBlog.objects.filter(source_id__in=sources).delete()
+        RelatedBlog.objects.bulk_create(rows)
+    logger.info(f"Refreshed related blogs of {len(sources)} blogs ({len(rows)} links)")
+    return len(sources)
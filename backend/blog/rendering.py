@@ -0,0 +1,113 @@
+"""
+Server-side rendering of Lexical editor content.
+
+``Blog.content`` is the editor's JSON state. ``render_content`` walks it
+once, when a blog is saved, and returns everything the API shows of it:
+sanitized HTML (the markup of the frontend's ``lexicalToHtml``, with all
+text escaped and only http(s)/mailto/relative links kept), the plain text,
+an excerpt and the word count behind ``read_time``.
+"""
+import json
+import re
+from collections import namedtuple
+from html import escape
+
+from django.utils.html import strip_tags
+from django.utils.text import Truncator
+
+RenderedContent = namedtuple("RenderedContent", "html plain_text excerpt word_count")
+
+EXCERPT_LENGTH = 300
+WORDS_PER_MINUTE = 200
+
+# Lexical text format bit flags -> wrapping tag, innermost first
+TEXT_FORMATS = ((1, "strong"), (2, "em"), (8, "u"), (16, "code"))
+HEADING_TAGS = {"h1", "h2", "h3", "h4", "h5", "h6"}
+HEADING_CLASSES = {"h1": "text-3xl", "h2": "text-2xl"}
+BLOCK_TYPES = {"paragraph", "heading", "quote", "code", "list", "listitem"}
+SAFE_URL = re.compile(r"^(https?://|mailto:|/|#)", re.IGNORECASE)
+
+
+def _safe_url(url):
+    url = (url or "").strip()
+    return url if SAFE_URL.match(url) else "#"
+
+
+def _render_html(node):
+    node_type = node.get("type")
+    if node_type == "text":
+        text = escape(node.get("text") or "")
+        text_format = node.get("format") or 0
+        if isinstance(text_format, int):
+            for flag, tag in TEXT_FORMATS:
+                if text_format & flag:
+                    text = f"<{tag}>{text}</{tag}>"
+        return text
+    if node_type == "linebreak":
+        return "<br>"
+
+    children = "".join(_render_html(child) for child in node.get("children") or [] if isinstance(child, dict))
+    if node_type == "paragraph":
+        return f'<p class="mb-4">{children}</p>'
+    if node_type == "heading":
+        tag = node.get("tag") if node.get("tag") in HEADING_TAGS else "h2"
+        return f'<{tag} class="font-bold my-4 {HEADING_CLASSES.get(tag, "text-xl")}">{children}</{tag}>'
+    if node_type == "quote":
+        return f'<blockquote class="border-l-4 border-gray-300 pl-4 italic my-4">{children}</blockquote>'
+    if node_type == "code":
+        return f'<pre class="bg-gray-900 text-white p-4 rounded my-4 overflow-x-auto"><code>{children}</code></pre>'
+    if node_type == "list":
+        tag, list_class = ("ol", "list-decimal") if node.get("listType") == "number" else ("ul", "list-disc")
+        return f'<{tag} class="{list_class} list-inside my-4 ml-4">{children}</{tag}>'
+    if node_type == "listitem":
+        return f'<li class="mb-1">{children}</li>'
+    if node_type == "link":
+        url = escape(_safe_url(node.get("url")), quote=True)
+        return (
+            f'<a href="{url}" class="text-blue-600 hover:underline" target="_blank" '
+            f'rel="noopener noreferrer">{children}</a>'
+        )
+    return children
+
+
+def _plain_text(node, blocks):
+    """Append the text of ``node`` to ``blocks``, one entry per block-level node."""
+    node_type = node.get("type")
+    if node_type == "text":
+        blocks[-1] += node.get("text") or ""
+        return
+    if node_type == "linebreak":
+        blocks[-1] += "\n"
+        return
+    is_block = node_type in BLOCK_TYPES
+    if is_block:
+        blocks.append("")
+    for child in node.get("children") or []:
+        if isinstance(child, dict):
+            _plain_text(child, blocks)
+    if is_block:
+        blocks.append("")
+
+
+def render_content(content):
+    """The RenderedContent of a Lexical JSON state (legacy HTML or plain text is accepted too)."""
+    try:
+        state = json.loads(content or "")
+    except (TypeError, ValueError):
+        state = None
+
+    if isinstance(state, dict) and isinstance(state.get("root"), dict):
+        html = _render_html(state["root"])
+        blocks = [""]
+        _plain_text(state["root"], blocks)
+        plain_text = "\n".join(block.strip() for block in blocks if block.strip())
+    else:
+        plain_text = strip_tags(content or "").strip()
+        html = "".join(f'<p class="mb-4">{escape(line)}</p>' for line in plain_text.splitlines() if line.strip())
+
+    excerpt = Truncator(" ".join(plain_text.split())).chars(EXCERPT_LENGTH)
+    return RenderedContent(html, plain_text, excerpt, len(plain_text.split()))
+
+
+def read_time_minutes(word_count):
+    return max(1, word_count // WORDS_PER_MINUTE)  # Minimum 1 minute
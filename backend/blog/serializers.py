@@ -2,6 +2,7 @@ from rest_framework import serializers
 from .models import Blog, BlogCategory, BlogTag, BlogImage
 from users.serializers import UserSerializer
 from django.conf import settings
+from backend.images import image_srcset
 
 
 class BlogCategorySerializer(serializers.ModelSerializer):
@@ -13,6 +14,8 @@ class BlogCategorySerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'created_at', 'updated_at']
     
     def get_blog_count(self, obj):
+        if hasattr(obj, 'published_blog_count'):
+            return obj.published_blog_count
         return obj.blogs.filter(is_published=True).count()
 
 
@@ -25,45 +28,55 @@ class BlogTagSerializer(serializers.ModelSerializer):
         read_only_fields = ['slug', 'created_at', 'updated_at']
     
     def get_blog_count(self, obj):
+        if hasattr(obj, 'published_blog_count'):
+            return obj.published_blog_count
         return obj.blogs.filter(is_published=True).count()
 
 
 class BlogImageSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = BlogImage
-        fields = ['id', 'image', 'alt_text', 'created_at', 'updated_at', 'is_active']
+        fields = ['id', 'image', 'srcset', 'variants_status', 'alt_text', 'created_at', 'updated_at', 'is_active']
         read_only_fields = ['created_at', 'updated_at']
 
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
+
 
 class BlogImageViewSerializer(serializers.ModelSerializer):
     image_url = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     
     class Meta:
         model = BlogImage
-        fields = ['id', 'image_url', 'alt_text', 'created_at', 'updated_at', 'is_active']
+        fields = ['id', 'image_url', 'srcset', 'alt_text', 'created_at', 'updated_at', 'is_active']
     
     def get_image_url(self, obj):
         if obj.image:
             return f"{settings.WEBSITE_URL}{settings.MEDIA_URL}{obj.image}"
         return None
 
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
+
 
 class BlogListSerializer(serializers.ModelSerializer):
-    """Serializer for blog list view with minimal data"""
+    """Serializer for blog list view with minimal data (no content, only its precomputed excerpt)"""
     author = UserSerializer(read_only=True)
     category = BlogCategorySerializer(read_only=True)
     tags = BlogTagSerializer(many=True, read_only=True)
     featured_image = BlogImageViewSerializer(read_only=True)
-    images = BlogImageViewSerializer(many=True, read_only=True)
     read_time = serializers.IntegerField(read_only=True)
     
     class Meta:
         model = Blog
         fields = [
-            'id', 'title', 'slug', 'author', 'featured_image', 'images',
+            'id', 'title', 'slug', 'author', 'featured_image', 'excerpt',
             'category', 'tags', 'is_highlighted', 'is_published',
             'published_at', 'views_count', 'created_at', 'updated_at',
-            'read_time', 'content'
+            'read_time'
         ]
 
 
@@ -80,7 +93,7 @@ class BlogDetailSerializer(serializers.ModelSerializer):
         model = Blog
         fields = [
             'id', 'title', 'slug', 'author', 'featured_image', 'images', 'content',
-            'category', 'tags', 'is_highlighted', 'is_published',
+            'content_html', 'excerpt', 'category', 'tags', 'is_highlighted', 'is_published',
             'published_at', 'views_count', 'created_at', 'updated_at',
             'read_time'
         ]
@@ -0,0 +1,46 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from backend.images import queue_replaced_image
+from .models import Blog, BlogCategory, BlogImage, BlogTag
+from .related import refresh_related_blogs
+
+# A replaced image file needs new variants (backend.images)
+pre_save.connect(queue_replaced_image, sender=BlogImage, dispatch_uid="image-variants-blog.blogimage")
+
+
+def _refresh_related_on_commit(blog_ids):
+    blog_ids = set(blog_ids)
+    if blog_ids:
+        transaction.on_commit(lambda: refresh_related_blogs(blog_ids))
+
+
+@receiver(post_save, sender=Blog)
+def blog_saved(sender, instance, **kwargs):
+    _refresh_related_on_commit([instance.id])
+
+
+@receiver(pre_delete, sender=Blog)
+def blog_deleting(sender, instance, **kwargs):
+    # Its own rows cascade; the lists it appears in need a replacement
+    _refresh_related_on_commit(instance.related_from.values_list("source_id", flat=True))
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def blog_tags_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # tag.blogs.<add/remove/clear>(): instance is the BlogTag
+        if action == "pre_clear":
+            _refresh_related_on_commit(instance.blogs.values_list("id", flat=True))
+        elif action in ("post_add", "post_remove"):
+            _refresh_related_on_commit(pk_set)
+    elif action in ("post_add", "post_remove", "post_clear"):
+        _refresh_related_on_commit([instance.id])
+
+
+@receiver(pre_delete, sender=BlogTag)
+@receiver(pre_delete, sender=BlogCategory)
+def blog_grouping_deleting(sender, instance, **kwargs):
+    # Deleting a tag or category detaches its blogs without saving them
+    _refresh_related_on_commit(instance.blogs.values_list("id", flat=True))
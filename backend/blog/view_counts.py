@@ -0,0 +1,111 @@
+"""
+Buffered blog view counters.
+
+A page view is an atomic ``INCR`` of the blog's counter in the shared cache
+instead of a write to its row. The ``flush_blog_views`` command moves the
+counted views into ``Blog.views_count`` with one
+``UPDATE ... SET views_count = views_count + CASE id ...`` per batch of
+blogs. Responses show the stored count plus the views still buffered.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from .models import Blog
+
+logger = logging.getLogger("blog")
+
+VIEW_COUNT_KEY_PREFIX = "blog-views:"
+FLUSH_LOCK_KEY = "blog-views-flush-lock"
+# Longer than any flush; released early when the flush finishes
+FLUSH_LOCK_TIMEOUT = 300
+FLUSH_BATCH_SIZE = 500
+
+
+def _key(blog_id):
+    return f"{VIEW_COUNT_KEY_PREFIX}{blog_id}"
+
+
+def record_view(blog_id):
+    """Count one view of the blog; returns its views not yet in the database."""
+    key = _key(blog_id)
+    try:
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.add(key, 0, timeout=None)
+            return cache.incr(key)
+    except Exception as e:
+        # Without the cache, fall back to an atomic row update
+        logger.warning(f"Could not buffer view of blog {blog_id}: {str(e)}")
+        Blog.objects.filter(id=blog_id).update(views_count=F('views_count') + 1)
+        return 0
+
+
+def pending_views(blog_ids):
+    """``{blog_id: views buffered but not yet flushed}`` for the given blogs."""
+    blog_ids = list(blog_ids)
+    if not blog_ids:
+        return {}
+    try:
+        found = cache.get_many([_key(blog_id) for blog_id in blog_ids])
+    except Exception as e:
+        logger.warning(f"Could not read buffered blog views: {str(e)}")
+        return {}
+    return {blog_id: found.get(_key(blog_id)) or 0 for blog_id in blog_ids}
+
+
+def with_pending_views(blogs):
+    """Add the buffered views to ``views_count`` of the given blog instances (in memory)."""
+    blogs = list(blogs)
+    pending = pending_views(blog.id for blog in blogs)
+    for blog in blogs:
+        blog.views_count += pending.get(blog.id, 0)
+    return blogs
+
+
+def _flush_batch(blog_ids):
+    pending = {blog_id: views for blog_id, views in pending_views(blog_ids).items() if views > 0}
+    if not pending:
+        return 0, 0
+    # Take the views out of the buffer first: views counted meanwhile stay
+    # buffered for the next flush
+    for blog_id, views in pending.items():
+        cache.decr(_key(blog_id), views)
+    try:
+        with transaction.atomic():
+            Blog.objects.filter(id__in=pending).update(
+                views_count=F('views_count') + Case(
+                    *(When(id=blog_id, then=Value(views)) for blog_id, views in pending.items()),
+                    default=Value(0),
+                    output_field=IntegerField(),
+                )
+            )
+    except Exception:
+        for blog_id, views in pending.items():
+            cache.incr(_key(blog_id), views)
+        raise
+    return len(pending), sum(pending.values())
+
+
+def flush_view_counts(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Move buffered views into Blog.views_count. Returns (blogs, views)
+    flushed, or None when another flush holds the lock.
+    """
+    if not cache.add(FLUSH_LOCK_KEY, 1, timeout=FLUSH_LOCK_TIMEOUT):
+        return None
+    try:
+        blogs = views = 0
+        blog_ids = list(Blog.objects.order_by('id').values_list('id', flat=True))
+        for start in range(0, len(blog_ids), batch_size):
+            flushed_blogs, flushed_views = _flush_batch(blog_ids[start:start + batch_size])
+            blogs += flushed_blogs
+            views += flushed_views
+        if views:
+            logger.info(f"Flushed {views} buffered views of {blogs} blogs")
+        return blogs, views
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
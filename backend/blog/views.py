@@ -17,6 +17,8 @@ from .serializers import (
     BlogImageSerializer,
     BlogImageViewSerializer
 )
+from .queries import blog_list_queryset
+from .view_counts import record_view, with_pending_views
 
 logger = logging.getLogger("blog")
 
@@ -58,8 +60,7 @@ def blog_list(request):
         if search:
             blogs = blogs.filter(
                 Q(title__icontains=search) |
-                Q(excerpt__icontains=search) |
-                Q(content__icontains=search)
+                Q(plain_text__icontains=search)
             )
         
         if is_highlighted and is_highlighted.lower() == 'true':
@@ -68,7 +69,7 @@ def blog_list(request):
         # Remove duplicates and order
         blogs = blogs.distinct().order_by('-published_at', '-created_at')
         
-        serializer = BlogListSerializer(blogs, many=True)
+        serializer = BlogListSerializer(with_pending_views(blog_list_queryset(blogs)), many=True)
         logger.info(f"Retrieved {len(serializer.data)} blogs", extra={"request_method": request.method, "count": len(serializer.data), "category": request.GET.get('category'), "tag": request.GET.get('tag'), "search": request.GET.get('search')})
         return Response(serializer.data)
     
@@ -93,8 +94,8 @@ def blog_list(request):
 def highlighted_blogs(request):
     """Get highlighted blogs (public)"""
     logger.info("highlighted_blogs called", extra={"request_method": request.method})
-    blogs = Blog.objects.filter(is_published=True, is_highlighted=True)[:3]
-    serializer = BlogListSerializer(blogs, many=True)
+    blogs = blog_list_queryset(Blog.objects.filter(is_published=True, is_highlighted=True))[:3]
+    serializer = BlogListSerializer(with_pending_views(blogs), many=True)
     logger.info(f"Retrieved {len(serializer.data)} highlighted blogs", extra={"request_method": request.method, "count": len(serializer.data)})
     return Response(serializer.data)
 
@@ -121,9 +122,8 @@ def blog_detail(request, slug):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Increment view count
-        blog.views_count += 1
-        blog.save(update_fields=['views_count'])
+        # Count the view in the cache; flush_blog_views writes it to the row later
+        blog.views_count += record_view(blog.id)
         
         serializer = BlogDetailSerializer(blog)
         logger.info(f"Retrieved blog {slug}, view count: {blog.views_count}", extra={"request_method": request.method, "slug": slug, "views_count": blog.views_count})
@@ -155,23 +155,13 @@ def blog_detail(request, slug):
     exempt_get_views=[r'^/api/blog/blogs/[a-zA-Z0-9-]+/related/$']
 )
 def related_blogs(request, slug):
-    """Get related blogs based on category and tags"""
+    """Get related blogs, best first, from the precomputed RelatedBlog table (blog.related)"""
     logger.info(f"related_blogs called for blog {slug}", extra={"request_method": request.method, "slug": slug})
     blog = get_object_or_404(Blog, slug=slug, is_published=True)
     
-    # Get blogs with same category or tags, excluding current blog
-    related = Blog.objects.filter(is_published=True).exclude(id=blog.id)
+    related = Blog.objects.filter(related_from__source=blog, is_published=True).order_by('-related_from__score')[:3]
     
-    if blog.category:
-        related = related.filter(
-            Q(category=blog.category) | Q(tags__in=blog.tags.all())
-        )
-    else:
-        related = related.filter(tags__in=blog.tags.all())
-    
-    related = related.distinct().order_by('-published_at')[:3]
-    
-    serializer = BlogListSerializer(related, many=True)
+    serializer = BlogListSerializer(with_pending_views(blog_list_queryset(related)), many=True)
     logger.info(f"Retrieved {len(serializer.data)} related blogs for blog {slug}", extra={"request_method": request.method, "slug": slug, "count": len(serializer.data)})
     return Response(serializer.data)
 
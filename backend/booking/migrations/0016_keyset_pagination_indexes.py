@@ -0,0 +1,21 @@
+# Generated by Django 4.2.27 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0015_add_booking_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['created_at', 'id'], name='booking_boo_created_c12e1b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hostelvisit',
+            index=models.Index(fields=['created_at', 'id'], name='booking_hos_created_1b0d70_idx'),
+        ),
+    ]
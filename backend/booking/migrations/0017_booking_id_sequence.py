@@ -0,0 +1,20 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('booking', '0016_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookingIdSequence',
+            fields=[
+                ('minute', models.CharField(max_length=12, primary_key=True, serialize=False)),
+                ('last_seq', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+    ]
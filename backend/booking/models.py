@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.utils import timezone
 from users.models import HsUser
 from property.models import Property, Room
@@ -6,6 +6,7 @@ from decimal import Decimal
 from django.core.exceptions import ValidationError
 from datetime import datetime
 from property.models import Review, ReviewImage
+from property.inventory import CLAIM_FIELDS as INVENTORY_CLAIM_FIELDS, booking_claim, move_claim
 
 
 class Booking(models.Model):
@@ -67,6 +68,11 @@ class Booking(models.Model):
     review_id = models.CharField(max_length=255, null=True, blank=True)
     booking_id = models.CharField(max_length=20, unique=True, null=True, blank=True, db_index=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
+
     def clean(self):
         if self.booking_type == 'hourly' and not self.room.hourly_rate:
             raise ValidationError("This room does not support hourly bookings.")
@@ -75,56 +81,59 @@ class Booking(models.Model):
 
     def generate_booking_id(self):
         """Generate booking ID in format: DDMMYYYYHHMM + 3-digit sequence"""
-        from django.utils import timezone
-        from django.db.models import Max
-        
-        now = timezone.now()
-        # Format: DDMMYYYYHHMM
-        date_time_str = now.strftime('%d%m%Y%H%M')
-        
-        # Get the last booking_id created in the same minute
-        last_booking = Booking.objects.filter(
-            booking_id__startswith=date_time_str
-        ).aggregate(Max('booking_id'))
-        
-        if last_booking['booking_id__max']:
-            # Extract sequence number and increment
-            last_seq = int(last_booking['booking_id__max'][-3:])
-            new_seq = last_seq + 1
-        else:
-            new_seq = 1
-        
-        # Format sequence as 3 digits (001, 002, etc.)
-        sequence = f"{new_seq:03d}"
-        
-        return f"{date_time_str}{sequence}"
+        from .sequences import next_booking_id
+        return next_booking_id()
+
+    def inventory_claim(self):
+        """This booking's current claim on the RoomInventory ledger, or None."""
+        return booking_claim(*(getattr(self, field) for field in INVENTORY_CLAIM_FIELDS))
 
     def save(self, *args, **kwargs):
-        # Generate booking_id only on creation (when pk is None) and if booking_id is not already set
-        if not self.pk and not self.booking_id:
-            # Keep trying to generate a unique booking_id
-            max_attempts = 10
-            for attempt in range(max_attempts):
-                try:
-                    self.booking_id = self.generate_booking_id()
-                    # Check if this booking_id already exists
-                    if not Booking.objects.filter(booking_id=self.booking_id).exclude(pk=self.pk if self.pk else None).exists():
-                        break
-                except Exception:
-                    # If generation fails, use a fallback
-                    from django.utils import timezone
-                    import random
-                    now = timezone.now()
-                    date_time_str = now.strftime('%d%m%Y%H%M')
-                    sequence = f"{random.randint(1, 999):03d}"
-                    self.booking_id = f"{date_time_str}{sequence}"
-                    break
-        super().save(*args, **kwargs)
+        # Generate booking_id only on creation (when pk is None) and if booking_id is not already set.
+        # It is allocated before the transaction opens: seeding a minute's
+        # counter reads the bookings table, and a transaction that reads
+        # before it writes can deadlock with concurrent writers on SQLite
+        allocate_id = not self.pk and not self.booking_id
+        if allocate_id:
+            self.booking_id = self.generate_booking_id()
+        # The RoomInventory ledger moves in the same transaction as the booking row
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                values = Booking.objects.select_for_update().filter(pk=self.pk).values_list(*INVENTORY_CLAIM_FIELDS).first()
+                previous = booking_claim(*values) if values else None
+            self._save_booking(allocate_id, *args, **kwargs)
+            move_claim(previous, self.inventory_claim())
+
+    def _save_booking(self, allocate_id, *args, **kwargs):
+        if not allocate_id:
+            return super().save(*args, **kwargs)
+        # The allocator hands out unique ids; the savepoint retry only covers
+        # ids taken while the cache and database counters disagreed
+        max_attempts = 3
+        for attempt in range(max_attempts):
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                self.pk = None
+                if attempt == max_attempts - 1 or not Booking.objects.filter(booking_id=self.booking_id).exists():
+                    raise
+                self.booking_id = self.generate_booking_id()
 
     def __str__(self):
         return f"Booking {self.id} by {self.user.mobile}"
 
 
+class BookingIdSequence(models.Model):
+    """Last booking_id sequence number handed out per DDMMYYYYHHMM minute, used when the cache is down."""
+    minute = models.CharField(max_length=12, primary_key=True)
+    last_seq = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.minute}: {self.last_seq}"
+
+
 class BookingDocument(models.Model):
     id = models.AutoField(primary_key=True)
     booking = models.ForeignKey(Booking, on_delete=models.CASCADE)
@@ -176,6 +185,7 @@ class HostelVisit(models.Model):
         indexes = [
             models.Index(fields=['-visit_date']),
             models.Index(fields=['status']),
+            models.Index(fields=['created_at', 'id']),
         ]
 
     def __str__(self):
@@ -0,0 +1,74 @@
+"""
+Booking id allocation.
+
+Booking ids are ``DDMMYYYYHHMM`` followed by a sequence number that restarts
+every minute (at least 3 digits). Sequence numbers come from an atomic
+``incr`` on a per-minute counter in the shared cache. A counter is seeded
+from the highest id already allocated for its minute, so a cache flush
+never hands out an id twice. When the cache is unavailable the
+BookingIdSequence row for the minute is incremented under a row lock
+instead.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.db.models.functions import Length
+from django.utils import timezone
+
+logger = logging.getLogger("booking")
+
+BOOKING_SEQUENCE_KEY_PREFIX = "booking-seq:"
+# Counters outlive their minute a little, for clock skew between workers
+BOOKING_SEQUENCE_TIMEOUT = 180
+
+
+def _allocated_max(minute):
+    """Highest sequence number already used for ``minute`` by bookings or the fallback counter."""
+    from .models import Booking, BookingIdSequence
+
+    # Sequences past 999 are longer, so the longest id sorts first
+    latest = Booking.objects.filter(booking_id__startswith=minute).order_by(
+        Length('booking_id').desc(), '-booking_id'
+    ).values_list('booking_id', flat=True).first()
+    used = int(latest[len(minute):]) if latest else 0
+    fallback = BookingIdSequence.objects.filter(minute=minute).values_list('last_seq', flat=True).first() or 0
+    return max(used, fallback)
+
+
+def _cache_next(minute):
+    key = f"{BOOKING_SEQUENCE_KEY_PREFIX}{minute}"
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # First booking of the minute (or the counter was lost): seed it,
+        # letting a concurrent seeder win
+        cache.add(key, _allocated_max(minute), timeout=BOOKING_SEQUENCE_TIMEOUT)
+        return cache.incr(key)
+
+
+def _db_next(minute):
+    from .models import BookingIdSequence
+
+    with transaction.atomic():
+        updated = BookingIdSequence.objects.filter(minute=minute).update(last_seq=F('last_seq') + 1)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    BookingIdSequence.objects.create(minute=minute, last_seq=_allocated_max(minute) + 1)
+            except IntegrityError:
+                # Another worker created the row first
+                BookingIdSequence.objects.filter(minute=minute).update(last_seq=F('last_seq') + 1)
+        return BookingIdSequence.objects.filter(minute=minute).values_list('last_seq', flat=True).get()
+
+
+def next_booking_id(now=None):
+    """Allocate the next booking id for the minute of ``now`` (default: the current time)."""
+    minute = (now or timezone.now()).strftime('%d%m%Y%H%M')
+    try:
+        seq = _cache_next(minute)
+    except Exception as e:
+        logger.warning(f"Booking id cache unavailable, using database sequence: {str(e)}")
+        seq = _db_next(minute)
+    return f"{minute}{seq:03d}"
@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from property.inventory import move_claim
+from .models import Booking
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    # Sent inside the deletion's transaction, so the rooms are released atomically with it
+    move_claim(instance.inventory_claim(), None)
@@ -1,3 +1,111 @@
-from django.test import TestCase
+import threading
+from datetime import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from users.models import HsUser
+from .models import Booking, BookingIdSequence
+from .sequences import BOOKING_SEQUENCE_KEY_PREFIX, next_booking_id
+
+NOW = timezone.make_aware(datetime(2026, 10, 18, 9, 30))
+MINUTE = "181020260930"
+
+
+def cache_down():
+    # Replaces the module's cache proxy, which every thread resolves to its own backend instance
+    return mock.patch("booking.sequences.cache", **{"incr.side_effect": ConnectionError("down")})
+
+
+class BookingIdSequenceTests(TransactionTestCase):
+    THREADS = 8
+    IDS_PER_THREAD = 25
+    BOOKINGS_PER_THREAD = 250
+
+    def setUp(self):
+        cache.clear()
+
+    def allocate_concurrently(self, allocate=lambda: next_booking_id(NOW), per_thread=IDS_PER_THREAD):
+        """Call ``allocate`` ``per_thread`` times in each of THREADS threads at once; returns every id handed out."""
+        allocated, errors = [], []
+        lock = threading.Lock()
+        start = threading.Barrier(self.THREADS)
+
+        def worker():
+            try:
+                start.wait()
+                ids = [allocate() for _ in range(per_thread)]
+                with lock:
+                    allocated.extend(ids)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return allocated
+
+    def create_bookings_concurrently(self):
+        """Create BOOKINGS_PER_THREAD bookings through Booking.save in each of THREADS threads at once."""
+        user = HsUser.objects.create(mobile="9999999999", name="Guest")
+        with mock.patch("booking.sequences.timezone.now", return_value=NOW):
+            ids = self.allocate_concurrently(
+                lambda: Booking.objects.create(user=user).booking_id, per_thread=self.BOOKINGS_PER_THREAD
+            )
+        self.assertCountEqual(Booking.objects.values_list("booking_id", flat=True), ids)
+        return ids
+
+    def assertContiguous(self, ids, per_thread=IDS_PER_THREAD):
+        total = self.THREADS * per_thread
+        self.assertEqual(len(set(ids)), total)
+        self.assertTrue(all(booking_id.startswith(MINUTE) for booking_id in ids))
+        self.assertEqual(sorted(int(booking_id[len(MINUTE):]) for booking_id in ids), list(range(1, total + 1)))
+
+    def test_cache_counter_ids_are_unique_and_contiguous(self):
+        self.assertContiguous(self.allocate_concurrently())
+
+    def test_database_fallback_ids_are_unique_and_contiguous(self):
+        with cache_down():
+            ids = self.allocate_concurrently()
+        self.assertContiguous(ids)
+        self.assertEqual(BookingIdSequence.objects.get(minute=MINUTE).last_seq, self.THREADS * self.IDS_PER_THREAD)
+
+    def test_concurrent_bookings_get_unique_ids(self):
+        self.assertContiguous(self.create_bookings_concurrently(), per_thread=self.BOOKINGS_PER_THREAD)
+
+    def test_concurrent_bookings_get_unique_ids_from_the_database_fallback(self):
+        with cache_down():
+            ids = self.create_bookings_concurrently()
+        self.assertContiguous(ids, per_thread=self.BOOKINGS_PER_THREAD)
+
+    def test_database_fallback_ids_are_contiguous(self):
+        with cache_down():
+            ids = [next_booking_id(NOW) for _ in range(self.THREADS * self.IDS_PER_THREAD)]
+        self.assertContiguous(ids)
+
+    def test_counters_continue_after_allocated_ids(self):
+        user = HsUser.objects.create(mobile="9999999999", name="Guest")
+        Booking.objects.create(user=user, booking_id=f"{MINUTE}005")
+        # A flushed cache counter is seeded from the bookings of the minute
+        with mock.patch("booking.sequences.timezone.now", return_value=NOW):
+            self.assertEqual(Booking.objects.create(user=user).booking_id, f"{MINUTE}006")
+        # The database fallback starts after the saved bookings
+        with cache_down():
+            self.assertEqual(next_booking_id(NOW), f"{MINUTE}007")
+        self.assertEqual(BookingIdSequence.objects.get(minute=MINUTE).last_seq, 7)
+
+    def test_taken_id_is_retried(self):
+        user = HsUser.objects.create(mobile="9999999999", name="Guest")
+        Booking.objects.create(user=user, booking_id=f"{MINUTE}001")
+        # A counter behind the saved bookings hands out a taken id first
+        cache.set(f"{BOOKING_SEQUENCE_KEY_PREFIX}{MINUTE}", 0, timeout=None)
+        with mock.patch("booking.sequences.timezone.now", return_value=NOW):
+            self.assertEqual(Booking.objects.create(user=user).booking_id, f"{MINUTE}002")
@@ -7,8 +7,9 @@ from .serializers import BookingSerializer, BookingUserViewSerializer, BookingVi
 from users.decorators import custom_authentication_and_permissions
 from django.shortcuts import get_object_or_404
 from property.serializers import PropertyViewSerializer
-from users.models import HsUser, UserHsPermission
-from property.models import UserProperty
+from property.queries import property_view_prefetches
+from backend.pagination import KeysetPagination, apply_sparse_fieldset
+from users.principal import get_principal
 import requests
 from urllib.parse import quote as urlquote
 
@@ -18,10 +19,14 @@ logger = logging.getLogger("booking")
 def booking_list(request):
     logger.info(f"booking_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == 'GET':
-        bookings = Booking.objects.all().order_by('-created_at')
-        serializer = BookingViewSerializer(bookings, many=True)
+        bookings = Booking.objects.select_related(
+            'user', 'property__city', 'property__state', 'property__country'
+        ).prefetch_related(*property_view_prefetches('property__'))
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(bookings, request)
+        serializer = apply_sparse_fieldset(BookingViewSerializer(page, many=True), request)
         logger.info(f"Retrieved {len(serializer.data)} bookings", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
     elif request.method == 'POST':
         serializer = BookingSerializer(data=request.data)
         if serializer.is_valid():
@@ -102,24 +107,25 @@ def booking_list_by_user(request):
     """
     user_id = request.query_params.get("user_id")
     logger.info(f"booking_list_by_user called for user_id {user_id}", extra={"request_method": request.method, "user_id": user_id})
-    if user_id:
-        user = get_object_or_404(HsUser, id=user_id)
-    else:
-        user = request.user
+    principal = get_principal(user_id) if user_id else request.principal
+    if principal is None:
+        return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+    user = principal.user
 
-    is_admin = UserHsPermission.objects.filter(user=user, permission_group__name="admin").exists()
-    is_customer = UserHsPermission.objects.filter(user=user, permission_group__name="customer").exists()
-
-    if is_admin:
-        bookings = Booking.objects.all().order_by('-created_at')
-    elif is_customer:
-        bookings = Booking.objects.filter(user=user).order_by('-created_at')
+    if principal.is_admin:
+        bookings = Booking.objects.all()
+    elif principal.is_customer:
+        bookings = Booking.objects.filter(user=user)
     else:
-        user_properties = UserProperty.objects.filter(user=user, is_active=True).values_list('property_id', flat=True)
-        bookings = Booking.objects.filter(property__in=user_properties).order_by('-created_at')
-    serializer = BookingUserViewSerializer(bookings, many=True)
+        bookings = Booking.objects.filter(property__in=principal.property_ids)
+    bookings = bookings.select_related(
+        'user', 'property__city', 'property__state', 'property__country'
+    ).prefetch_related(*property_view_prefetches('property__'))
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(bookings, request)
+    serializer = apply_sparse_fieldset(BookingUserViewSerializer(page, many=True), request)
     logger.info(f"Retrieved {len(serializer.data)} bookings for user {user.id}", extra={"request_method": request.method, "user_id": user.id, "count": len(serializer.data)})
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['PUT'])
@@ -288,10 +294,14 @@ Please confirm this visit booking."""
 def hostel_visit_list_get(request):
     """Helper function for GET request that requires authentication"""
     logger.info("hostel_visit_list_get called", extra={"request_method": request.method})
-    visits = HostelVisit.objects.all().order_by('-visit_date', '-visit_time')
-    serializer = HostelVisitViewSerializer(visits, many=True)
+    visits = HostelVisit.objects.select_related(
+        'user', 'property__city', 'property__state', 'property__country'
+    ).prefetch_related(*property_view_prefetches('property__'))
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(visits, request)
+    serializer = apply_sparse_fieldset(HostelVisitViewSerializer(page, many=True), request)
     logger.info(f"Retrieved {len(serializer.data)} hostel visits", extra={"request_method": request.method, "count": len(serializer.data)})
-    return Response(serializer.data)
+    return paginator.get_paginated_response(serializer.data)
 
 
 @api_view(['GET', 'PUT', 'DELETE'])
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expenses', '0003_expense_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='expense',
+            index=models.Index(fields=['created_at', 'id'], name='expenses_ex_created_44c65d_idx'),
+        ),
+    ]
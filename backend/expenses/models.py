@@ -33,6 +33,11 @@ class Expense(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
+
     def __str__(self):
         return f"{self.user.mobile} - {self.amount} - {self.date}"
 
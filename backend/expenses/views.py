@@ -11,7 +11,8 @@ from django.conf import settings
 from users.decorators import custom_authentication_and_permissions
 from django.shortcuts import get_object_or_404
 from property.models import Property
-from users.models import HsUser, UserHsPermission
+from backend.pagination import KeysetPagination, apply_sparse_fieldset
+from users.principal import get_principal
 
 logger = logging.getLogger("expenses")
 
@@ -22,19 +23,26 @@ def expense(request):
     logger.info(f"expense called with method {request.method}", extra={"request_method": request.method})
     if request.method == 'GET':
         user_id = request.query_params.get("user_id")
-        if user_id:
-            user = get_object_or_404(HsUser, id=user_id)
-        else:
-            user = request.user
+        principal = get_principal(user_id) if user_id else request.principal
+        if principal is None:
+            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+        user = principal.user
 
-        is_admin = UserHsPermission.objects.filter(user=user, permission_group__name="admin").exists()
-        if is_admin:
+        if principal.is_admin:
             expenses = Expense.objects.all()
         else:
             expenses = Expense.objects.filter(user=user)
-        serializer = ExpenseViewSerializer(expenses, many=True)
+        expenses = expenses.select_related(
+            'category', 'property__city', 'property__state', 'property__country'
+        ).prefetch_related(
+            'property__amenities', 'property__rules', 'property__documentation', 'property__images',
+            'property__rooms__amenities', 'property__rooms__images', 'property__nearby_places',
+        )
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(expenses, request)
+        serializer = apply_sparse_fieldset(ExpenseViewSerializer(page, many=True), request)
         logger.info(f"Retrieved {len(serializer.data)} expenses for user {user.id}", extra={"request_method": request.method, "user_id": user.id, "count": len(serializer.data)})
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return paginator.get_paginated_response(serializer.data)
 
     elif request.method == 'POST':
         serializer = ExpenseSerializer(data=request.data)
@@ -0,0 +1,52 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs.reports import claim_next_job, purge_expired_results, requeue_stale_jobs, run_report_job
+
+# How often an idle worker requeues orphaned jobs and purges expired results
+MAINTENANCE_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = "Process queued report jobs, rendering each report into the result store."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for new jobs.",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=None,
+            help="Seconds to wait between polls of an empty queue (default REPORT_JOB_POLL_INTERVAL).",
+        )
+
+    def maintain(self):
+        requeued, failed = requeue_stale_jobs()
+        purged = purge_expired_results()
+        if requeued or failed or purged:
+            self.stdout.write(f"Requeued {requeued} stale jobs, failed {failed}, expired {purged} results")
+
+    def handle(self, *args, **options):
+        sleep = options["sleep"] if options["sleep"] is not None else settings.REPORT_JOB_POLL_INTERVAL
+        processed = 0
+        self.maintain()
+        last_maintenance = time.monotonic()
+        while True:
+            job = claim_next_job()
+            if job is not None:
+                job = run_report_job(job)
+                processed += 1
+                self.stdout.write(f"Report job {job.id}: {job.status}")
+                continue
+            if options["once"]:
+                break
+            if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                self.maintain()
+                last_maintenance = time.monotonic()
+            time.sleep(sleep)
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} report jobs"))
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.27 on 2026-10-18 18:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+import jobs.models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('users', '0011_refreshtoken'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportJob',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('report_type', models.CharField(max_length=50)),
+                ('file_type', models.CharField(choices=[('xlsx', 'Excel'), ('csv', 'CSV'), ('pdf', 'PDF')], default='xlsx', max_length=10)),
+                ('params', models.JSONField(default=dict)),
+                ('cache_key', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed'), ('expired', 'Expired')], default='pending', max_length=20)),
+                ('result_file', models.FileField(blank=True, max_length=255, null=True, upload_to=jobs.models.report_result_upload_to)),
+                ('result_name', models.CharField(blank=True, default='', max_length=255)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('expires_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='report_jobs', to='users.hsuser')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='jobs_report_status_bda89f_idx'), models.Index(fields=['cache_key', 'status'], name='jobs_report_cache_k_c5ac17_idx'), models.Index(fields=['created_at', 'id'], name='jobs_report_created_c4f638_idx')],
+            },
+        ),
+    ]
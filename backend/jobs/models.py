@@ -1,3 +1,56 @@
+import uuid
+
 from django.db import models
+from django.utils import timezone
+
+from users.models import HsUser
+
+
+def report_result_upload_to(instance, filename):
+    # A random directory keeps result files unguessable under MEDIA_ROOT
+    return f"report_jobs/{uuid.uuid4().hex}/{filename}"
+
+
+class ReportJob(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('expired', 'Expired'),
+    ]
+
+    FILE_TYPE_CHOICES = [
+        ('xlsx', 'Excel'),
+        ('csv', 'CSV'),
+        ('pdf', 'PDF'),
+    ]
+
+    id = models.AutoField(primary_key=True)
+    user = models.ForeignKey(HsUser, on_delete=models.CASCADE, related_name='report_jobs')
+    report_type = models.CharField(max_length=50)
+    file_type = models.CharField(max_length=10, choices=FILE_TYPE_CHOICES, default='xlsx')
+    # Resolved inputs: start_date, end_date and the property_ids in the user's scope
+    params = models.JSONField(default=dict)
+    # Hash of (report type, file type, params, report data version); equal keys share a result file
+    cache_key = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    result_file = models.FileField(upload_to=report_result_upload_to, max_length=255, blank=True, null=True)
+    result_name = models.CharField(max_length=255, blank=True, default='')
+    error = models.TextField(blank=True, null=True)
+    attempts = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['cache_key', 'status']),
+            models.Index(fields=['created_at', 'id']),
+        ]
 
-# Create your models here.
+    def __str__(self):
+        return f"{self.report_type} report job {self.id} ({self.status})"
@@ -0,0 +1,183 @@
+"""
+Report jobs: queueing, rendering and the finished-file result store.
+
+Requests enqueue a ReportJob and return immediately; the ``run_report_jobs``
+worker claims pending jobs from the database and renders them with the
+stats report builders. Finished files are reused by every later job with
+the same cache key, i.e. the same report type, file type, params and
+report data version, until they expire.
+"""
+import hashlib
+import io
+import json
+import logging
+import tempfile
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.db.models import F
+from django.utils import timezone
+
+from backend.cache_versions import get_version
+from stats.exports import write_csv, write_pdf, write_workbook
+from stats.report_builders import REPORT_BUILDERS, REPORT_DATA_VERSION, NoReportData
+from .models import ReportJob
+
+logger = logging.getLogger("jobs")
+
+# A job still "running" this long after it started is assumed to have lost its worker
+REPORT_JOB_TIMEOUT = timedelta(hours=1)
+MAX_ATTEMPTS = 3
+
+
+def report_cache_key(report_type, file_type, params):
+    payload = json.dumps(
+        {
+            'report_type': report_type,
+            'file_type': file_type,
+            'params': params,
+            'data_version': get_version(REPORT_DATA_VERSION),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def find_cached_result(cache_key):
+    """Latest unexpired completed job holding a result for ``cache_key``, if any."""
+    return ReportJob.objects.filter(
+        cache_key=cache_key,
+        status='completed',
+        expires_at__gt=timezone.now(),
+    ).exclude(result_file='').exclude(result_file__isnull=True).order_by('-finished_at').first()
+
+
+def _complete_from_cache(job, cached):
+    now = timezone.now()
+    job.result_file = cached.result_file.name
+    job.result_name = cached.result_name
+    job.expires_at = cached.expires_at
+    job.status = 'completed'
+    job.error = None
+    job.started_at = job.started_at or now
+    job.finished_at = now
+
+
+def submit_report_job(user, report_type, file_type, start_date, end_date, property_ids):
+    """
+    Queue a ``report_type`` job for ``user``. Returns ``(job, cached)``;
+    when a matching result already exists the job is completed at once and
+    ``cached`` is True.
+    """
+    params = {
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'property_ids': sorted(set(property_ids)),
+    }
+    job = ReportJob(
+        user=user,
+        report_type=report_type,
+        file_type=file_type,
+        params=params,
+        cache_key=report_cache_key(report_type, file_type, params),
+    )
+    cached = find_cached_result(job.cache_key)
+    if cached:
+        _complete_from_cache(job, cached)
+    job.save()
+    return job, cached is not None
+
+
+def claim_next_job():
+    """Atomically move the oldest pending job to running and return it, or None."""
+    candidates = ReportJob.objects.filter(status='pending').order_by('created_at', 'id').values_list('id', flat=True)[:10]
+    for job_id in candidates:
+        claimed = ReportJob.objects.filter(id=job_id, status='pending').update(
+            status='running',
+            started_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ReportJob.objects.get(id=job_id)
+    return None
+
+
+def _render(job, report_name, sheets):
+    """Write the report to a temporary file and store it as the job's result."""
+    with tempfile.TemporaryFile() as output:
+        if job.file_type == 'csv':
+            text = io.TextIOWrapper(output, encoding='utf-8', newline='')
+            write_csv(text, sheets[0])
+            text.flush()
+            text.detach()
+        elif job.file_type == 'pdf':
+            write_pdf(output, report_name, sheets)
+        else:
+            write_workbook(output, sheets)
+        output.seek(0)
+        filename = f"{report_name}.{job.file_type}"
+        job.result_file.save(filename, File(output), save=False)
+        job.result_name = filename
+
+
+def run_report_job(job):
+    """Render ``job`` (or reuse a matching result) and record the outcome."""
+    logger.info(f"Running report job {job.id}", extra={"job_id": job.id, "report_type": job.report_type, "user_id": job.user_id})
+    try:
+        cached = find_cached_result(job.cache_key)
+        if cached:
+            _complete_from_cache(job, cached)
+        else:
+            params = job.params
+            report_name, sheets = REPORT_BUILDERS[job.report_type](
+                params['property_ids'],
+                date.fromisoformat(params['start_date']),
+                date.fromisoformat(params['end_date']),
+            )
+            _render(job, report_name, sheets)
+            job.status = 'completed'
+            job.error = None
+            job.finished_at = timezone.now()
+            job.expires_at = job.finished_at + timedelta(seconds=settings.REPORT_JOB_RESULT_TTL)
+        logger.info(f"Report job {job.id} completed{' from cache' if cached else ''}", extra={"job_id": job.id, "report_type": job.report_type})
+    except NoReportData as e:
+        job.status = 'failed'
+        job.error = e.message
+        job.finished_at = timezone.now()
+        logger.warning(f"Report job {job.id} found no data", extra={"job_id": job.id, "report_type": job.report_type})
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+        job.finished_at = timezone.now()
+        logger.exception(f"Error in report job {job.id}: {str(e)}", extra={"job_id": job.id, "report_type": job.report_type})
+    job.save()
+    return job
+
+
+def requeue_stale_jobs():
+    """Return jobs orphaned by a dead worker to the queue, or fail them after MAX_ATTEMPTS."""
+    stale = ReportJob.objects.filter(status='running', started_at__lt=timezone.now() - REPORT_JOB_TIMEOUT)
+    failed = stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status='failed', error='Report generation timed out', finished_at=timezone.now()
+    )
+    requeued = stale.update(status='pending')
+    return requeued, failed
+
+
+def purge_expired_results():
+    """Mark jobs past ``expires_at`` as expired and delete result files no live job still uses."""
+    now = timezone.now()
+    expired = ReportJob.objects.filter(status='completed', expires_at__lte=now)
+    names = set(expired.exclude(result_file='').exclude(result_file__isnull=True).values_list('result_file', flat=True))
+    count = expired.update(status='expired', result_file='')
+    live = set(
+        ReportJob.objects.filter(result_file__in=names, status='completed').values_list('result_file', flat=True)
+    )
+    storage = ReportJob._meta.get_field('result_file').storage
+    for name in names - live:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning(f"Could not delete expired report file {name}: {str(e)}")
+    return count
@@ -0,0 +1,22 @@
+from rest_framework import serializers
+from django.urls import reverse
+
+from .models import ReportJob
+
+
+class ReportJobSerializer(serializers.ModelSerializer):
+    download_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReportJob
+        fields = [
+            'id', 'report_type', 'file_type', 'params', 'status', 'error', 'result_name',
+            'download_url', 'created_at', 'started_at', 'finished_at', 'expires_at',
+        ]
+
+    def get_download_url(self, obj):
+        if obj.status != 'completed' or not obj.result_file:
+            return None
+        url = reverse('report_job_download', args=[obj.id])
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
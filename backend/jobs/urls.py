@@ -0,0 +1,8 @@
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('reports/', views.report_job_list, name='report_job_list'),
+    path('reports/<int:job_id>/', views.report_job_detail, name='report_job_detail'),
+    path('reports/<int:job_id>/download/', views.report_job_download, name='report_job_download'),
+]
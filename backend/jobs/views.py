@@ -1,3 +1,107 @@
-from django.shortcuts import render
+from rest_framework.decorators import api_view
+from rest_framework.response import Response
+from rest_framework import status
+import logging
+from django.http import FileResponse
+from users.decorators import custom_authentication_and_permissions
+from backend.pagination import KeysetPagination, apply_sparse_fieldset
+from stats.report_builders import REPORT_BUILDERS, report_date_range, report_property_ids
+from .models import ReportJob
+from .reports import submit_report_job
+from .serializers import ReportJobSerializer
 
-# Create your views here.
+logger = logging.getLogger("jobs")
+
+FILE_TYPES = [file_type for file_type, _ in ReportJob.FILE_TYPE_CHOICES]
+
+
+@api_view(['GET', 'POST'])
+@custom_authentication_and_permissions()
+def report_job_list(request):
+    """
+    GET lists the requesting user's report jobs, newest first.
+    POST queues a report: ``report_type``, optional ``file_type`` (xlsx, csv
+    or pdf), ``start_date``, ``end_date`` and ``property_id``. Answers 202
+    with the queued job, or 200 when a matching result is already stored.
+    """
+    logger.info(f"report_job_list called with method {request.method}", extra={"request_method": request.method, "user_id": request.user.id})
+    if request.method == 'GET':
+        jobs = ReportJob.objects.filter(user=request.user)
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(jobs, request)
+        serializer = apply_sparse_fieldset(ReportJobSerializer(page, many=True, context={'request': request}), request)
+        logger.info(f"Retrieved {len(serializer.data)} report jobs for user {request.user.id}", extra={"request_method": request.method, "user_id": request.user.id, "count": len(serializer.data)})
+        return paginator.get_paginated_response(serializer.data)
+
+    report_type = request.data.get('report_type')
+    file_type = request.data.get('file_type') or 'xlsx'
+    if report_type not in REPORT_BUILDERS:
+        logger.warning(f"Unknown report type: {report_type}", extra={"request_method": request.method, "user_id": request.user.id})
+        return Response(
+            {"error": f"report_type must be one of: {', '.join(REPORT_BUILDERS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if file_type not in FILE_TYPES:
+        logger.warning(f"Unknown report file type: {file_type}", extra={"request_method": request.method, "user_id": request.user.id})
+        return Response(
+            {"error": f"file_type must be one of: {', '.join(FILE_TYPES)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        start_date, end_date = report_date_range(request.data)
+    except ValueError:
+        return Response(
+            {"error": "Invalid date format. Use YYYY-MM-DD"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    if start_date > end_date:
+        return Response(
+            {"error": "start_date must not be after end_date"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    try:
+        property_ids = report_property_ids(request.principal, request.data.get('property_id'))
+    except ValueError as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        job, cached = submit_report_job(request.user, report_type, file_type, start_date, end_date, property_ids)
+        logger.info(f"Report job {job.id} {'served from cache' if cached else 'queued'}", extra={"request_method": request.method, "user_id": request.user.id, "job_id": job.id, "report_type": report_type})
+        serializer = ReportJobSerializer(job, context={'request': request})
+        return Response(serializer.data, status=status.HTTP_200_OK if cached else status.HTTP_202_ACCEPTED)
+    except Exception as e:
+        logger.exception(f"Error in report_job_list: {str(e)}", extra={"request_method": request.method, "user_id": request.user.id})
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+@custom_authentication_and_permissions()
+def report_job_detail(request, job_id):
+    """Status of one of the requesting user's report jobs, polled until it is completed or failed."""
+    logger.info(f"report_job_detail called for job {job_id}", extra={"request_method": request.method, "user_id": request.user.id, "job_id": job_id})
+    job = ReportJob.objects.filter(id=job_id, user=request.user).first()
+    if not job:
+        return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+    serializer = ReportJobSerializer(job, context={'request': request})
+    return Response(serializer.data, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@custom_authentication_and_permissions()
+def report_job_download(request, job_id):
+    """Stream the finished report file of a completed job."""
+    logger.info(f"report_job_download called for job {job_id}", extra={"request_method": request.method, "user_id": request.user.id, "job_id": job_id})
+    job = ReportJob.objects.filter(id=job_id, user=request.user).first()
+    if not job:
+        return Response({"error": "Report job not found"}, status=status.HTTP_404_NOT_FOUND)
+    if job.status == 'expired':
+        return Response({"error": "Report has expired, please request it again"}, status=status.HTTP_410_GONE)
+    if job.status != 'completed':
+        return Response({"error": f"Report is not ready (status: {job.status})"}, status=status.HTTP_409_CONFLICT)
+    try:
+        result = job.result_file.open('rb')
+    except (ValueError, FileNotFoundError):
+        logger.warning(f"Result file missing for report job {job.id}", extra={"request_method": request.method, "user_id": request.user.id, "job_id": job.id})
+        return Response({"error": "Report has expired, please request it again"}, status=status.HTTP_410_GONE)
+    return FileResponse(result, as_attachment=True, filename=job.result_name)
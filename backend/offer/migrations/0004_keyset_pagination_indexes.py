@@ -0,0 +1,17 @@
+# Generated by Django 4.2.27 on 2026-10-18 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer', '0003_offer_code_propertyoffer'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['created_at', 'id'], name='offer_offer_created_34f63a_idx'),
+        ),
+    ]
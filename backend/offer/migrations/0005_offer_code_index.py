@@ -0,0 +1,18 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offer', '0004_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offer',
+            name='code',
+            field=models.CharField(blank=True, db_index=True, max_length=255, null=True),
+        ),
+    ]
@@ -11,11 +11,16 @@ class Offer(models.Model):
     discount_percentage = models.DecimalField(max_digits=10, decimal_places=2)
     offer_start_date = models.DateTimeField()
     offer_end_date = models.DateTimeField()
-    code = models.CharField(max_length=255, null=True, blank=True)
+    code = models.CharField(max_length=255, null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
+
     def __str__(self):
         return f"{self.title}"
 
@@ -0,0 +1,155 @@
+"""
+In-process resolution of the offers applicable to a property.
+
+An offer applies to a property it is assigned to (PropertyOffer) from
+``offer_start_date`` until ``offer_end_date``. Each worker keeps an
+OfferIndex of the active offers that have not ended yet. For every
+property, and for every property and code, the offer windows are cut at
+each start and end into consecutive segments with a fixed set of
+applicable offers, ranked best first (largest discount, then oldest
+offer). "Offers for property P at time T" is then a bisect over the
+segment boundaries, O(log n), and never touches the database.
+
+Changes to offers and assignments bump ``OFFER_INDEX_VERSION``; a worker
+checks it at most every ``OFFER_INDEX_VERSION_CHECK_INTERVAL`` seconds and
+rebuilds when it moved, or once the first indexed offer has ended, so
+expired windows do not pile up.
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from django.conf import settings
+from django.utils import timezone
+
+from backend.cache_versions import get_version
+from .models import PropertyOffer
+
+logger = logging.getLogger("offer")
+
+OFFER_INDEX_VERSION = "offer-index"
+
+# ``data`` is the serialized PropertyOffer (PropertyOfferSerializer); treat it as read-only
+OfferWindow = namedtuple("OfferWindow", "starts_at ends_at discount offer_id code data")
+
+
+def normalize_code(code):
+    return (code or "").strip().lower()
+
+
+def _rank(window):
+    return -window.discount, window.offer_id
+
+
+class OfferTimeline:
+    """The windows of one property (or one property and code), cut into segments."""
+
+    def __init__(self, windows):
+        windows = [window for window in windows if window.starts_at < window.ends_at]
+        self.bounds = sorted({window.starts_at for window in windows} | {window.ends_at for window in windows})
+        starting, ending = defaultdict(list), defaultdict(list)
+        for position, window in enumerate(windows):
+            starting[window.starts_at].append(position)
+            ending[window.ends_at].append(position)
+        # segments[i]: windows applicable from bounds[i] until bounds[i + 1], best first
+        self.segments = []
+        applicable = set()
+        for bound in self.bounds:
+            applicable.difference_update(ending[bound])
+            applicable.update(starting[bound])
+            self.segments.append(tuple(sorted((windows[position] for position in applicable), key=_rank)))
+
+    def at(self, moment):
+        position = bisect.bisect_right(self.bounds, moment) - 1
+        return self.segments[position] if position >= 0 else ()
+
+
+class OfferIndex:
+    def __init__(self, windows):
+        by_property, by_code = defaultdict(list), defaultdict(list)
+        for property_id, window in windows:
+            by_property[property_id].append(window)
+            if window.code:
+                by_code[(property_id, window.code)].append(window)
+        self.timelines = {property_id: OfferTimeline(found) for property_id, found in by_property.items()}
+        self.code_timelines = {key: OfferTimeline(found) for key, found in by_code.items()}
+        # The first indexed offer to end; rebuilding then drops it
+        self.expires_at = min((window.ends_at for _, window in windows), default=None)
+
+    def applicable(self, property_id, at=None, code=None):
+        """The offers applying to the property at ``at`` (default now), best first."""
+        at = at or timezone.now()
+        if code is not None:
+            timeline = self.code_timelines.get((property_id, normalize_code(code)))
+        else:
+            timeline = self.timelines.get(property_id)
+        return timeline.at(at) if timeline else ()
+
+    def best(self, property_id, at=None, code=None):
+        """The best offer applying to the property at ``at`` (with ``code`` if given), or None."""
+        found = self.applicable(property_id, at, code)
+        return found[0] if found else None
+
+
+def build_offer_index(now=None):
+    from property.serializers import PropertyOfferSerializer
+
+    now = now or timezone.now()
+    rows = PropertyOffer.objects.filter(
+        property__isnull=False,
+        offer__is_active=True,
+        offer__offer_end_date__gt=now,
+    ).select_related("offer").order_by("id")
+    windows = []
+    for property_offer in rows:
+        offer = property_offer.offer
+        windows.append((property_offer.property_id, OfferWindow(
+            offer.offer_start_date,
+            offer.offer_end_date,
+            offer.discount_percentage,
+            offer.id,
+            normalize_code(offer.code),
+            PropertyOfferSerializer(property_offer).data,
+        )))
+    logger.info(f"Built offer index with {len(windows)} offer windows")
+    return OfferIndex(windows)
+
+
+_lock = threading.Lock()
+_index = None
+_index_version = None
+_checked_at = 0.0
+
+
+def _expired(index):
+    return index.expires_at is not None and index.expires_at <= timezone.now()
+
+
+def get_offer_index():
+    """This worker's index, rebuilt when OFFER_INDEX_VERSION has moved or an indexed offer has ended."""
+    global _index, _index_version, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < settings.OFFER_INDEX_VERSION_CHECK_INTERVAL and not _expired(_index):
+        return _index
+    try:
+        version = get_version(OFFER_INDEX_VERSION)
+    except Exception as e:
+        logger.warning(f"Offer index version unavailable, keeping the current index: {str(e)}")
+        version = _index_version
+    with _lock:
+        if _index is None or version != _index_version or _expired(_index):
+            _index = build_offer_index()
+            _index_version = version
+        _checked_at = now
+    return _index
+
+
+def property_offer_fields(property_id, at=None):
+    """``offers`` (applicable now, best first) and ``best_offer`` of a serialized property."""
+    applicable = get_offer_index().applicable(property_id, at)
+    return {
+        "offers": [window.data for window in applicable],
+        "best_offer": applicable[0].data if applicable else None,
+    }
@@ -29,6 +29,6 @@ class OfferViewSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_images(self, obj):
-        offer_images = OfferImage.objects.filter(offer=obj)
+        offer_images = obj.offerimage_set.all()
         serializer = OfferImageSerializer(offer_images, many=True)
         return serializer.data
@@ -0,0 +1,15 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from backend.cache_versions import bump_version
+from .models import Offer, PropertyOffer
+from .resolution import OFFER_INDEX_VERSION
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+@receiver(post_save, sender=PropertyOffer)
+@receiver(post_delete, sender=PropertyOffer)
+def offer_index_source_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(OFFER_INDEX_VERSION))
@@ -6,4 +6,5 @@ urlpatterns = [
     path('offers/<int:pk>/', views.offer_detail, name='offer_detail'),
     path('offer-images/<int:pk>/', views.offer_image_list, name='offer_image_list'),
     path('assign/', views.assign_offers, name='assign_offers'),
+    path('resolve/', views.resolve_offer, name='resolve_offer'),
 ]
\ No newline at end of file
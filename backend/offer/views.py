@@ -8,6 +8,10 @@ from .serializers import OfferViewSerializer, OfferSerializer, OfferImageSeriali
 from users.decorators import custom_authentication_and_permissions
 from property.models import Property
 from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils import timezone
+from .resolution import get_offer_index
+from backend.pagination import KeysetPagination, apply_sparse_fieldset
 
 logger = logging.getLogger("offer")
 
@@ -17,10 +21,12 @@ logger = logging.getLogger("offer")
 def offer_list(request):
     logger.info(f"offer_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == 'GET':
-        offers = Offer.objects.all()
-        serializer = OfferViewSerializer(offers, many=True)
+        offers = Offer.objects.prefetch_related('offerimage_set')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(offers, request)
+        serializer = apply_sparse_fieldset(OfferViewSerializer(page, many=True), request)
         logger.info(f"Retrieved {len(serializer.data)} offers", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
     elif request.method == 'POST':
         serializer = OfferSerializer(data=request.data)
         if serializer.is_valid():
@@ -31,6 +37,39 @@ def offer_list(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['GET'])
+@custom_authentication_and_permissions(exempt_get_views=[r"^/api/offers/resolve/?$"])
+def resolve_offer(request):
+    """
+    GET: The best offer applying to a property, from the in-memory offer index.
+      Query: ?property=<id>[&code=<code>][&at=<ISO datetime, default now>]
+      Returns the PropertyOffer with its offer, or 404 when none applies.
+    """
+    property_id = request.query_params.get('property')
+    code = request.query_params.get('code')
+    at = request.query_params.get('at')
+    logger.info(f"resolve_offer called for property {property_id} with code {code}", extra={"request_method": request.method, "property_id": property_id, "code": code})
+    try:
+        property_id = int(property_id)
+    except (TypeError, ValueError):
+        return Response({'error': 'property must be a property id'}, status=status.HTTP_400_BAD_REQUEST)
+    if at:
+        try:
+            at = parse_datetime(at)
+        except ValueError:
+            at = None
+        if at is None:
+            return Response({'error': 'at must be an ISO 8601 datetime'}, status=status.HTTP_400_BAD_REQUEST)
+        if timezone.is_naive(at):
+            at = timezone.make_aware(at)
+
+    best = get_offer_index().best(property_id, at, code)
+    if best is None:
+        logger.info(f"No offer applies to property {property_id}", extra={"request_method": request.method, "property_id": property_id, "code": code})
+        return Response({'error': 'No applicable offer found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response(best.data)
+
+
 @api_view(['POST', 'DELETE'])
 @custom_authentication_and_permissions(required_permissions=['admin:offer:update'])
 def assign_offers(request):
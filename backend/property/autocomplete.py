@@ -0,0 +1,151 @@
+"""
+In-process typeahead over cities, states, areas and property names.
+
+Each worker keeps an AutocompleteIndex: every suggestion is listed once per
+word it contains, as a sorted array of the label from that word on, so any
+word prefix is a bisect plus a short scan. Suggestions rank by how many
+properties they cover. Changes to cities, states and properties bump the
+``AUTOCOMPLETE_VERSION`` cache version; a worker compares it with the
+version its index was built from at most every
+``AUTOCOMPLETE_VERSION_CHECK_INTERVAL`` seconds and rebuilds when it moved,
+so lookups never touch the database.
+"""
+import bisect
+import heapq
+import logging
+import threading
+import time
+from collections import Counter, defaultdict, namedtuple
+
+from django.conf import settings
+from django.db.models import Count
+
+from backend.cache_versions import get_version
+from .models import City, Property, State
+from .search import normalize_text, tokenize
+
+logger = logging.getLogger("property")
+
+AUTOCOMPLETE_VERSION = "property-autocomplete"
+
+KINDS = ("city", "state", "area", "property")
+# Among equally popular suggestions, places come before property names
+KIND_ORDER = {kind: order for order, kind in enumerate(KINDS)}
+
+# ``data`` is the serialized City for city suggestions, else None
+Suggestion = namedtuple("Suggestion", "kind id label city_id listings data")
+
+
+class AutocompleteIndex:
+    def __init__(self, suggestions):
+        self.suggestions = suggestions
+        keys = []
+        for position, suggestion in enumerate(suggestions):
+            words = tokenize(suggestion.label)
+            for start in range(len(words)):
+                keys.append((" ".join(words[start:]), position))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._positions = [position for _, position in keys]
+
+        self.city_names = {}
+        self.cities_by_name = {}
+        self.areas_by_city = {}
+        for suggestion in suggestions:
+            if suggestion.kind == "city":
+                self.city_names[suggestion.id] = suggestion.label
+                self.cities_by_name.setdefault(suggestion.label.lower(), suggestion)
+            elif suggestion.kind == "area":
+                self.areas_by_city.setdefault(suggestion.city_id, []).append(suggestion)
+        for areas in self.areas_by_city.values():
+            areas.sort(key=_rank)
+
+    def complete(self, text, kinds=None, limit=8):
+        """The ``limit`` most popular suggestions with a word starting with ``text``."""
+        prefix = normalize_text(text)
+        if prefix:
+            start = bisect.bisect_left(self._keys, prefix)
+            end = bisect.bisect_left(self._keys, prefix + "\uffff", start)
+            positions = set(self._positions[start:end])
+            candidates = (self.suggestions[position] for position in positions)
+        else:
+            candidates = iter(self.suggestions)
+        if kinds:
+            candidates = (suggestion for suggestion in candidates if suggestion.kind in kinds)
+        return heapq.nsmallest(limit, candidates, key=_rank)
+
+    def areas(self, city_name):
+        """Area names of the city called ``city_name``, most listings first; None for an unknown city."""
+        city = self.cities_by_name.get(city_name.strip().lower())
+        if city is None:
+            return None
+        return [area.label for area in self.areas_by_city.get(city.id, [])]
+
+    def as_dict(self, suggestion):
+        return {
+            "type": suggestion.kind,
+            "id": suggestion.id,
+            "label": suggestion.label,
+            "city": self.city_names.get(suggestion.city_id),
+            "listings": suggestion.listings,
+        }
+
+
+def _rank(suggestion):
+    return -suggestion.listings, KIND_ORDER[suggestion.kind], suggestion.label.lower(), suggestion.id or 0
+
+
+def build_autocomplete_index():
+    from .serializers import CitySerializer
+
+    suggestions = []
+    cities = City.objects.annotate(listings=Count("property")).order_by("id")
+    for city in cities:
+        suggestions.append(
+            Suggestion("city", city.id, city.name, city.id, city.listings, CitySerializer(city).data)
+        )
+    for state in State.objects.annotate(listings=Count("property")).order_by("id"):
+        suggestions.append(Suggestion("state", state.id, state.name, None, state.listings, None))
+
+    # Areas are free text: spellings differing only in case and spacing are
+    # one area, labelled with its most common spelling
+    areas = defaultdict(Counter)
+    rows = Property.objects.exclude(area__isnull=True).exclude(area="").values_list("city_id", "area")
+    for city_id, area in rows:
+        key = normalize_text(area)
+        if key:
+            areas[(city_id, key)][area.strip()] += 1
+    for (city_id, _), spellings in areas.items():
+        label = spellings.most_common(1)[0][0]
+        suggestions.append(Suggestion("area", None, label, city_id, sum(spellings.values()), None))
+
+    for property_id, name, city_id in Property.objects.filter(is_active=True).values_list("id", "name", "city_id"):
+        suggestions.append(Suggestion("property", property_id, name, city_id, 1, None))
+
+    logger.info(f"Built autocomplete index with {len(suggestions)} suggestions")
+    return AutocompleteIndex(suggestions)
+
+
+_lock = threading.Lock()
+_index = None
+_index_version = None
+_checked_at = 0.0
+
+
+def get_autocomplete_index():
+    """This worker's index, rebuilt when AUTOCOMPLETE_VERSION has moved since it was built."""
+    global _index, _index_version, _checked_at
+    now = time.monotonic()
+    if _index is not None and now - _checked_at < settings.AUTOCOMPLETE_VERSION_CHECK_INTERVAL:
+        return _index
+    try:
+        version = get_version(AUTOCOMPLETE_VERSION)
+    except Exception as e:
+        logger.warning(f"Autocomplete version unavailable, keeping the current index: {str(e)}")
+        version = _index_version
+    with _lock:
+        if _index is None or version != _index_version:
+            _index = build_autocomplete_index()
+            _index_version = version
+        _checked_at = now
+    return _index
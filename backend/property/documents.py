@@ -0,0 +1,138 @@
+"""
+Cached property_detail documents.
+
+The PropertyViewSerializer output of a property (images, rooms, amenities,
+rules, latest reviews, rating summary, nearby places, ...) is cached per property under
+its own cache version, ``property-document:<id>``. PROPERTY_DOCUMENT_
+DEPENDENCIES maps every model the document is rendered from to the ids of
+the properties a row of it appears in; signals bump those versions on
+commit, so a document is rebuilt exactly when something it shows changed.
+The cached document is the same for every user: ``is_favorite`` is
+overlaid per request, and so are ``offers`` and ``best_offer``, which
+change with time and come from the offer index (offer.resolution).
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+
+from backend.cache_versions import bump_version, get_version
+from offer.resolution import property_offer_fields
+from users.models import HsUser
+from users.serializers import UserSerializer
+from .models import (
+    Amenity,
+    City,
+    Country,
+    Documentation,
+    FavoriteProperty,
+    ImageCategory,
+    NearbyPlace,
+    Property,
+    PropertyImage,
+    PropertyReviewSummary,
+    Review,
+    ReviewImage,
+    Room,
+    RoomImage,
+    Rule,
+    State,
+)
+from .queries import property_view_queryset
+
+logger = logging.getLogger("property")
+
+PROPERTY_DOCUMENT_KEY_PREFIX = "property-document:"
+
+
+def _ids(queryset):
+    return set(queryset.values_list("id", flat=True))
+
+
+# Model -> function of one of its rows returning the ids of the properties
+# whose document shows that row
+PROPERTY_DOCUMENT_DEPENDENCIES = {
+    Property: lambda prop: {prop.pk},
+    Room: lambda room: _ids(room.property_set.all()),
+    RoomImage: lambda image: _ids(Property.objects.filter(rooms__images=image)),
+    PropertyImage: lambda image: _ids(image.properties.all()),
+    ImageCategory: lambda category: _ids(Property.objects.filter(images__category=category)),
+    Amenity: lambda amenity: _ids(Property.objects.filter(Q(amenities=amenity) | Q(rooms__amenities=amenity))),
+    Rule: lambda rule: _ids(rule.property_set.all()),
+    Documentation: lambda documentation: _ids(documentation.property_set.all()),
+    Review: lambda review: {review.property_id},
+    PropertyReviewSummary: lambda summary: {summary.property_id},
+    ReviewImage: lambda image: _ids(Property.objects.filter(reviews__images=image)),
+    HsUser: lambda user: _ids(Property.objects.filter(reviews__user=user)),
+    NearbyPlace: lambda place: {place.property_id},
+    City: lambda city: _ids(Property.objects.filter(city=city)),
+    State: lambda state: _ids(Property.objects.filter(state=state)),
+    Country: lambda country: _ids(Property.objects.filter(country=country)),
+}
+
+
+def dependent_property_ids(instance):
+    """Ids of the properties whose cached document shows ``instance``."""
+    ids = PROPERTY_DOCUMENT_DEPENDENCIES[type(instance)](instance)
+    return {pk for pk in ids if pk}
+
+
+# The fields documents show of dependencies that have others as well: users
+# only appear as review authors, rendered by UserSerializer, so saving e.g.
+# their last_login leaves every document valid
+PROPERTY_DOCUMENT_FIELDS = {
+    HsUser: tuple(UserSerializer.Meta.fields),
+}
+
+
+def document_fields_changed(instance, update_fields=None):
+    """
+    Whether saving ``instance`` changes what documents show of it; call it
+    before the save. True for new rows and models without
+    PROPERTY_DOCUMENT_FIELDS.
+    """
+    fields = PROPERTY_DOCUMENT_FIELDS.get(type(instance))
+    if fields is None or instance.pk is None:
+        return True
+    # Deferred fields were not loaded, so the save leaves them as they are
+    deferred = instance.get_deferred_fields()
+    fields = [field for field in fields if field not in deferred and (update_fields is None or field in update_fields)]
+    if not fields:
+        return False
+    previous = type(instance).objects.filter(pk=instance.pk).values(*fields).first()
+    return previous is None or any(previous[field] != getattr(instance, field) for field in fields)
+
+
+def _version_name(property_id):
+    return f"{PROPERTY_DOCUMENT_KEY_PREFIX}{property_id}"
+
+
+def invalidate_property_documents(property_ids):
+    for property_id in property_ids:
+        bump_version(_version_name(property_id))
+
+
+def get_property_document(property_id):
+    """The serialized property, ``is_favorite`` unset, or None if it does not exist."""
+    from .serializers import PropertyViewSerializer
+
+    version = get_version(_version_name(property_id))
+    key = f"{PROPERTY_DOCUMENT_KEY_PREFIX}{property_id}:{version}"
+    document = cache.get(key)
+    if document is None:
+        prop = property_view_queryset(Property.objects.filter(pk=property_id)).first()
+        if prop is None:
+            return None
+        # No user's favourites: is_favorite stays False until overlaid
+        document = dict(PropertyViewSerializer(prop, context={"user_favorites": set()}).data)
+        cache.set(key, document, timeout=settings.PROPERTY_DOCUMENT_CACHE_TIMEOUT)
+        logger.debug(f"Cached property document {property_id} at version {version}")
+    document.update(property_offer_fields(property_id))
+    return document
+
+
+def user_has_favorite(user, property_id):
+    if not getattr(user, "id", None):
+        return False
+    return FavoriteProperty.objects.filter(user_id=user.id, property_id=property_id, is_active=True).exists()
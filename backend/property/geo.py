@@ -0,0 +1,132 @@
+"""
+Geohash cells and distance search over PropertySearchIndex.
+
+Every indexed property with coordinates stores a ``GEOHASH_PRECISION``
+geohash. A radius or bounding-box search covers the box with a handful of
+coarser geohash cells; each cell is a prefix, i.e. a ``>= cell AND < next
+cell`` range on the indexed ``geohash`` column, which both SQLite and
+Postgres answer with an index range scan (the geohash alphabet sorts the
+same in every collation, unlike LIKE prefixes). The exact haversine distance is only
+computed in Python for the rows inside those cells.
+"""
+import math
+
+from django.db.models import Q
+
+GEOHASH_PRECISION = 9
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+DEFAULT_RADIUS_KM = 10
+MAX_RADIUS_KM = 500
+# Upper bound on the prefix ranges OR-ed into one candidate query
+MAX_COVER_CELLS = 16
+
+
+def encode_geohash(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Geohash of the point, ``precision`` characters long."""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bit, value, even = 0, 0, True
+    while len(chars) < precision:
+        span, coordinate = (lng_range, longitude) if even else (lat_range, latitude)
+        middle = (span[0] + span[1]) / 2
+        if coordinate >= middle:
+            value = (value << 1) | 1
+            span[0] = middle
+        else:
+            value <<= 1
+            span[1] = middle
+        even = not even
+        bit += 1
+        if bit == 5:
+            chars.append(BASE32[value])
+            bit, value = 0, 0
+    return "".join(chars)
+
+
+def cell_size(precision):
+    """(height, width) in degrees of a geohash cell of ``precision`` characters."""
+    bits = 5 * precision
+    return 180.0 / 2 ** (bits // 2), 360.0 / 2 ** ((bits + 1) // 2)
+
+
+def _cell_centers(low, high, size, origin):
+    first = math.floor((low - origin) / size)
+    last = math.floor((min(high, -origin - 1e-9) - origin) / size)
+    return [origin + (i + 0.5) * size for i in range(first, last + 1)]
+
+
+def covering_cells(south, west, north, east):
+    """
+    The fewest geohash prefixes (at most MAX_COVER_CELLS, as fine as
+    possible) whose cells together cover the box.
+    """
+    south, north = max(south, -90.0), min(north, 90.0)
+    west, east = max(west, -180.0), min(east, 180.0)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = cell_size(precision)
+        rows = _cell_centers(south, north, height, -90.0)
+        columns = _cell_centers(west, east, width, -180.0)
+        if len(rows) * len(columns) <= MAX_COVER_CELLS or precision == 1:
+            return sorted({encode_geohash(lat, lng, precision) for lat in rows for lng in columns})
+    return []
+
+
+def next_prefix(prefix, alphabet=BASE32):
+    """
+    The smallest string over ``alphabet`` sorting after every string that
+    starts with ``prefix``, or None if there is none.
+    """
+    prefix = prefix.rstrip(alphabet[-1])
+    if not prefix:
+        return None
+    return prefix[:-1] + alphabet[alphabet.index(prefix[-1]) + 1]
+
+
+def radius_box(latitude, longitude, radius_km):
+    """(south, west, north, east) of the box enclosing the circle."""
+    delta_lat = radius_km / KM_PER_DEGREE_LAT
+    delta_lng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(latitude)), 0.01))
+    return latitude - delta_lat, longitude - delta_lng, latitude + delta_lat, longitude + delta_lng
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def nearest_property_ids(index, origin, radius_km=None, box=None):
+    """
+    ``[(distance_km, property_id)]`` nearest first, for the rows of the
+    PropertySearchIndex queryset ``index`` within ``radius_km`` of
+    ``origin`` (lat, lng) or, when ``box`` (south, west, north, east) is
+    given, inside the box.
+    """
+    if box is None:
+        box = radius_box(origin[0], origin[1], radius_km)
+    south, west, north, east = box
+    in_cells = Q()
+    for cell in covering_cells(south, west, north, east):
+        upper = next_prefix(cell)
+        in_cells |= Q(geohash__gte=cell, geohash__lt=upper) if upper else Q(geohash__gte=cell)
+    rows = index.filter(
+        in_cells,
+        latitude__gte=south,
+        latitude__lte=north,
+        longitude__gte=west,
+        longitude__lte=east,
+    ).values_list("property_id", "latitude", "longitude")
+
+    results = []
+    for property_id, latitude, longitude in rows:
+        distance = haversine_km(origin[0], origin[1], latitude, longitude)
+        if radius_km is None or distance <= radius_km:
+            results.append((distance, property_id))
+    results.sort()
+    return results
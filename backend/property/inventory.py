@@ -0,0 +1,142 @@
+"""
+Maintenance and queries of the RoomInventory ledger.
+
+A booking claims ``number_of_rooms`` rooms of its room type on every night
+d with checkin_date <= d < checkout_date: as ``sold`` while it is confirmed
+or checked in, as ``held`` while it is pending. Booking.save() moves claims
+with F() arithmetic inside the booking's own transaction, so the ledger
+never disagrees with committed bookings; ``rebuild_room_inventory``
+recomputes everything.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+
+from .models import Room, RoomInventory
+
+logger = logging.getLogger("property")
+
+SOLD_STATUSES = ('confirmed', 'checked_in')
+HELD_STATUSES = ('pending',)
+
+# Booking fields that decide its claim, in booking_claim() argument order
+CLAIM_FIELDS = ('room_id', 'checkin_date', 'checkout_date', 'status', 'number_of_rooms', 'is_active')
+
+# What a booking takes from the ledger: ``count`` rooms of ``room_id`` for the
+# nights [checkin, checkout), booked against the ``column`` ('sold' or 'held')
+Claim = namedtuple('Claim', 'room_id checkin checkout column count')
+
+
+def _as_date(value):
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def booking_claim(room_id, checkin_date, checkout_date, status, number_of_rooms, is_active=True):
+    """The Claim of a booking with these field values, or None if it claims nothing."""
+    if not is_active:
+        return None
+    if status in SOLD_STATUSES:
+        column = 'sold'
+    elif status in HELD_STATUSES:
+        column = 'held'
+    else:
+        return None
+    checkin, checkout = _as_date(checkin_date), _as_date(checkout_date)
+    count = int(number_of_rooms or 0)
+    if not room_id or not checkin or not checkout or checkout <= checkin or count <= 0:
+        return None
+    return Claim(int(room_id), checkin, checkout, column, count)
+
+
+def nights(checkin, checkout):
+    return [checkin + timedelta(days=i) for i in range((checkout - checkin).days)]
+
+
+def _ensure_rows(room_id, checkin, checkout):
+    total = Room.objects.filter(id=room_id).values_list('number_of_rooms', flat=True).first()
+    if total is None:
+        return False
+    RoomInventory.objects.bulk_create(
+        [RoomInventory(room_id=room_id, date=night, total=total) for night in nights(checkin, checkout)],
+        ignore_conflicts=True,
+    )
+    return True
+
+
+def _apply(claim, sign):
+    if claim.column == 'sold':
+        change = {'sold': F('sold') + sign * claim.count}
+    else:
+        change = {'held': F('held') + sign * claim.count}
+    RoomInventory.objects.filter(
+        room_id=claim.room_id, date__gte=claim.checkin, date__lt=claim.checkout
+    ).update(**change)
+
+
+def move_claim(previous, current):
+    """
+    Release ``previous`` and take ``current`` (either may be None). Must run
+    in the transaction that saves the booking.
+    """
+    if previous == current:
+        return
+    with transaction.atomic():
+        if previous:
+            _apply(previous, -1)
+        if current and _ensure_rows(current.room_id, current.checkin, current.checkout):
+            _apply(current, 1)
+
+
+def rooms_with_free_inventory(checkin, checkout, count=1):
+    """Rooms with at least ``count`` rooms free on every night of [checkin, checkout)."""
+    short_night = RoomInventory.objects.filter(
+        room=OuterRef('pk'),
+        date__gte=checkin,
+        date__lt=checkout,
+    ).annotate(free=F('total') - F('sold') - F('held')).filter(free__lt=count)
+    return Room.objects.filter(number_of_rooms__gte=count).exclude(Exists(short_night))
+
+
+def sync_room_total(room):
+    """Carry a changed ``number_of_rooms`` into today's and future ledger rows."""
+    RoomInventory.objects.filter(room=room, date__gte=timezone.now().date()).exclude(
+        total=room.number_of_rooms
+    ).update(total=room.number_of_rooms)
+
+
+def rebuild_room_inventory(room_ids=None):
+    """Drop and recompute the RoomInventory rows (optionally for some rooms) from bookings."""
+    from booking.models import Booking
+
+    rooms = Room.objects.all()
+    if room_ids:
+        rooms = rooms.filter(id__in=room_ids)
+    totals = dict(rooms.values_list('id', 'number_of_rooms'))
+
+    counts = defaultdict(lambda: {'sold': 0, 'held': 0})
+    bookings = Booking.objects.filter(
+        room_id__in=list(totals), status__in=SOLD_STATUSES + HELD_STATUSES, is_active=True
+    ).values_list('room_id', 'checkin_date', 'checkout_date', 'status', 'number_of_rooms')
+    for values in bookings.iterator(chunk_size=2000):
+        claim = booking_claim(*values)
+        if claim:
+            for night in nights(claim.checkin, claim.checkout):
+                counts[(claim.room_id, night)][claim.column] += claim.count
+
+    with transaction.atomic():
+        RoomInventory.objects.filter(room_id__in=list(totals)).delete()
+        RoomInventory.objects.bulk_create(
+            [
+                RoomInventory(room_id=room_id, date=night, total=totals[room_id], **values)
+                for (room_id, night), values in counts.items()
+            ],
+            batch_size=1000,
+        )
+    logger.info(f"Rebuilt {len(counts)} room inventory rows for {len(totals)} rooms")
+    return len(counts)
@@ -0,0 +1,64 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from backend.images import IMAGE_VARIANT_MODELS, claim_next_image, process_image, requeue_images, requeue_stale_images
+
+# How often an idle worker requeues images claimed by a dead worker
+MAINTENANCE_INTERVAL = 600
+
+
+class Command(BaseCommand):
+    help = "Render the resized WebP/JPEG variants of uploaded images, as they are queued."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for new uploads (backfills).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=None,
+            help="Seconds to wait between polls of an empty queue (default IMAGE_VARIANT_POLL_INTERVAL).",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Queue every image again first, e.g. after changing IMAGE_VARIANT_WIDTHS.",
+        )
+        parser.add_argument(
+            "--model",
+            action="append",
+            choices=IMAGE_VARIANT_MODELS,
+            help="With --force, only requeue images of this model (may be repeated).",
+        )
+
+    def maintain(self):
+        requeued = requeue_stale_images()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale images")
+
+    def handle(self, *args, **options):
+        sleep = options["sleep"] if options["sleep"] is not None else settings.IMAGE_VARIANT_POLL_INTERVAL
+        if options["force"]:
+            self.stdout.write(f"Queued {requeue_images(options['model'])} images")
+        processed = 0
+        self.maintain()
+        last_maintenance = time.monotonic()
+        while True:
+            image = claim_next_image()
+            if image is not None:
+                image = process_image(image)
+                processed += 1
+                self.stdout.write(f"{image._meta.label} {image.pk}: {image.variants_status}")
+                continue
+            if options["once"]:
+                break
+            if time.monotonic() - last_maintenance >= MAINTENANCE_INTERVAL:
+                self.maintain()
+                last_maintenance = time.monotonic()
+            time.sleep(sleep)
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} images"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from property.reviews import refresh_review_summaries
+
+
+class Command(BaseCommand):
+    help = "Recompute the rating count, average and histogram of every property from its active reviews."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--property",
+            type=int,
+            action="append",
+            dest="property_ids",
+            help="Only rebuild the given property id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_review_summaries(options.get("property_ids"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} review summaries"))
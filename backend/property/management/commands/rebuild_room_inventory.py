@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from property.inventory import rebuild_room_inventory
+
+
+class Command(BaseCommand):
+    help = "Rebuild the RoomInventory ledger from the active pending, confirmed and checked-in bookings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--room",
+            type=int,
+            action="append",
+            dest="room_ids",
+            help="Only rebuild the given room id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_room_inventory(options.get("room_ids"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} room inventory rows"))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from property.search import refresh_property_search_index
+
+
+class Command(BaseCommand):
+    help = "Rebuild the PropertySearchIndex table used by the public property search."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--property",
+            type=int,
+            action="append",
+            dest="property_ids",
+            help="Only rebuild the given property id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        count = refresh_property_search_index(options.get("property_ids"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search index for {count} properties"))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.27 on 2026-10-18 18:38
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0029_sitepageimage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertySearchIndex',
+            fields=[
+                ('property', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_index', serialize=False, to='property.property')),
+                ('property_type', models.CharField(db_index=True, max_length=20)),
+                ('area_key', models.CharField(blank=True, db_index=True, default='', max_length=255)),
+                ('min_daily_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('min_monthly_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('min_yearly_rate', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_occupancy', models.IntegerField(default=0)),
+                ('max_rooms_per_type', models.IntegerField(default=0)),
+                ('total_rooms', models.IntegerField(default=0)),
+                ('has_daily', models.BooleanField(default=False)),
+                ('has_monthly', models.BooleanField(default=False)),
+                ('has_yearly', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PropertySearchToken',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('token', models.CharField(db_index=True, max_length=64)),
+                ('index', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tokens', to='property.propertysearchindex')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='propertysearchindex',
+            index=models.Index(fields=['property_type', 'max_occupancy'], name='property_pr_propert_88d4c2_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertysearchindex',
+            index=models.Index(fields=['has_monthly'], name='property_pr_has_mon_1eb5b6_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertysearchindex',
+            index=models.Index(fields=['has_yearly'], name='property_pr_has_yea_553a28_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='propertysearchindex',
+            index=models.Index(fields=['min_daily_rate'], name='property_pr_min_dai_f90f94_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='propertysearchtoken',
+            unique_together={('index', 'token')},
+        ),
+    ]
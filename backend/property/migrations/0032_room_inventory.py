@@ -0,0 +1,58 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:07
+
+from django.db import migrations, models
+import django.db.models.deletion
+from collections import defaultdict
+
+from property.inventory import booking_claim, nights
+
+
+def backfill_room_inventory(apps, schema_editor):
+    """Claim the nights of the active pending, confirmed and checked-in bookings."""
+    Room = apps.get_model('property', 'Room')
+    Booking = apps.get_model('booking', 'Booking')
+    RoomInventory = apps.get_model('property', 'RoomInventory')
+    totals = dict(Room.objects.values_list('id', 'number_of_rooms'))
+    counts = defaultdict(lambda: {'sold': 0, 'held': 0})
+    bookings = Booking.objects.filter(
+        room_id__in=list(totals), status__in=['pending', 'confirmed', 'checked_in'], is_active=True
+    ).values_list('room_id', 'checkin_date', 'checkout_date', 'status', 'number_of_rooms')
+    for values in bookings.iterator(chunk_size=2000):
+        claim = booking_claim(*values)
+        if claim:
+            for night in nights(claim.checkin, claim.checkout):
+                counts[(claim.room_id, night)][claim.column] += claim.count
+    RoomInventory.objects.bulk_create(
+        [
+            RoomInventory(room_id=room_id, date=night, total=totals[room_id], **values)
+            for (room_id, night), values in counts.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0031_keyset_pagination_indexes'),
+        ('booking', '0017_booking_id_sequence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoomInventory',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('total', models.IntegerField()),
+                ('sold', models.IntegerField(default=0)),
+                ('held', models.IntegerField(default=0)),
+                ('room', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory', to='property.room')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='roominventory',
+            constraint=models.UniqueConstraint(fields=('room', 'date'), name='unique_room_inventory_date'),
+        ),
+        migrations.RunPython(backfill_room_inventory, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0032_room_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='propertysearchindex',
+            name='geohash',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=12),
+        ),
+        migrations.AddField(
+            model_name='propertysearchindex',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='propertysearchindex',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
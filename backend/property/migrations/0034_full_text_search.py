@@ -0,0 +1,37 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0033_search_index_geohash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('trigram', models.CharField(db_index=True, max_length=3)),
+                ('term', models.CharField(max_length=64)),
+            ],
+            options={
+                'unique_together': {('trigram', 'term')},
+            },
+        ),
+        migrations.CreateModel(
+            name='PropertySearchTerm',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('term', models.CharField(db_index=True, max_length=64)),
+                ('weight', models.PositiveSmallIntegerField()),
+                ('index', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='property.propertysearchindex')),
+            ],
+            options={
+                'unique_together': {('index', 'term')},
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+# Generated by Django 4.2.27 on 2026-10-18 19:30
+
+from django.db import migrations, models
+import django.db.models.deletion
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def backfill_review_summaries(apps, schema_editor):
+    Review = apps.get_model('property', 'Review')
+    PropertyReviewSummary = apps.get_model('property', 'PropertyReviewSummary')
+    summaries = {}
+    reviews = Review.objects.filter(is_active=True, rating__in=range(1, 6)).values_list('property_id', 'rating')
+    for property_id, rating in reviews.iterator():
+        summary = summaries.setdefault(property_id, PropertyReviewSummary(property_id=property_id))
+        summary.rating_count += 1
+        summary.rating_sum += rating
+        setattr(summary, f"rating_{rating}", getattr(summary, f"rating_{rating}") + 1)
+    for summary in summaries.values():
+        summary.rating_avg = (Decimal(summary.rating_sum) / summary.rating_count).quantize(Decimal('0.01'), ROUND_HALF_UP)
+    PropertyReviewSummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('property', '0035_image_variants'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PropertyReviewSummary',
+            fields=[
+                ('property', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='review_summary', serialize=False, to='property.property')),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_avg', models.DecimalField(blank=True, decimal_places=2, max_digits=3, null=True)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['is_active', '-rating', '-created_at'], name='property_re_is_acti_e4a793_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['property', 'is_active', 'created_at', 'id'], name='property_re_propert_f87d47_idx'),
+        ),
+        migrations.RunPython(backfill_review_summaries, migrations.RunPython.noop),
+    ]
@@ -2,6 +2,7 @@ from decimal import Decimal, InvalidOperation
 from django.db import models
 from django.utils import timezone
 from django.utils.text import slugify
+from backend.images import VARIANT_STATUS_CHOICES
 from users.models import HsUser
 
 BED_TYPE_CHOICES = [
@@ -98,6 +99,10 @@ class ImageCategory(models.Model):
 
 class PropertyImage(models.Model):
     image = models.ImageField(upload_to='property_images/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    variants_status = models.CharField(
+        max_length=12, choices=VARIANT_STATUS_CHOICES, default='pending', db_index=True, editable=False
+    )
     category = models.ForeignKey(
         ImageCategory,
         on_delete=models.SET_NULL,
@@ -116,6 +121,10 @@ class PropertyImage(models.Model):
 class RoomImage(models.Model):
     id = models.AutoField(primary_key=True)
     image = models.ImageField(upload_to='room_images/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    variants_status = models.CharField(
+        max_length=12, choices=VARIANT_STATUS_CHOICES, default='pending', db_index=True, editable=False
+    )
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -138,6 +147,7 @@ class Room(models.Model):
     size = models.CharField(max_length=50, null=True, blank=True)
     maxoccupancy = models.IntegerField(default=2)
     number_of_rooms = models.IntegerField(default=1)
+    # Not maintained; availability per date lives in RoomInventory
     used_number_of_rooms = models.IntegerField(default=0)
     left_number_of_rooms = models.IntegerField(default=1)
     amenities = models.ManyToManyField(Amenity, blank=True)
@@ -149,6 +159,33 @@ class Room(models.Model):
     def __str__(self):
         return self.name
 
+class RoomInventory(models.Model):
+    """
+    Rooms of one Room type per night: ``total`` rooms, ``sold`` to confirmed
+    or checked-in bookings and ``held`` by pending ones. Rows exist only for
+    nights that have (or had) bookings; a missing row means all
+    ``room.number_of_rooms`` rooms are free. Maintained by property.inventory.
+    """
+    id = models.BigAutoField(primary_key=True)
+    room = models.ForeignKey(Room, on_delete=models.CASCADE, related_name='inventory')
+    date = models.DateField()
+    total = models.IntegerField()
+    sold = models.IntegerField(default=0)
+    held = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['room', 'date'], name='unique_room_inventory_date'),
+        ]
+
+    @property
+    def free(self):
+        return self.total - self.sold - self.held
+
+    def __str__(self):
+        return f"{self.room_id} on {self.date}: {self.sold} sold, {self.held} held of {self.total}"
+
+
 class Property(models.Model):
     GENDER_TYPE_CHOICES = [
         ('unisex', 'Unisex'),
@@ -182,6 +219,11 @@ class Property(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -240,6 +282,10 @@ class SitePageImage(models.Model):
         blank=True,
     )
     image = models.ImageField(upload_to='site_pages/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    variants_status = models.CharField(
+        max_length=12, choices=VARIANT_STATUS_CHOICES, default='pending', db_index=True, editable=False
+    )
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -257,6 +303,11 @@ class Setting(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
     
+    # GST slabs: TAX_RATE_LOW below TAX_SLAB_THRESHOLD, TAX_RATE_HIGH from it on
+    TAX_SLAB_THRESHOLD = Decimal('7500')
+    TAX_RATE_LOW = Decimal('0.05')
+    TAX_RATE_HIGH = Decimal('0.18')
+
     class Meta:
         ordering = ['key']
         
@@ -277,8 +328,8 @@ class Setting(models.Model):
         if amount_decimal <= 0:
             return Decimal('0')
 
-        threshold = Decimal('7500')
-        return Decimal('0.05') if amount_decimal < threshold else Decimal('0.18')
+        threshold = Setting.TAX_SLAB_THRESHOLD
+        return Setting.TAX_RATE_LOW if amount_decimal < threshold else Setting.TAX_RATE_HIGH
 
 class UserProperty(models.Model):
     id = models.AutoField(primary_key=True)
@@ -294,6 +345,10 @@ class UserProperty(models.Model):
 class ReviewImage(models.Model):
     id = models.AutoField(primary_key=True)
     image = models.ImageField(upload_to='review_images/')
+    variants = models.JSONField(default=dict, blank=True, editable=False)
+    variants_status = models.CharField(
+        max_length=12, choices=VARIANT_STATUS_CHOICES, default='pending', db_index=True, editable=False
+    )
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
@@ -313,9 +368,47 @@ class Review(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            # top_reviews_by_property_type walks this in order until it has enough
+            models.Index(fields=['is_active', '-rating', '-created_at']),
+            # Per-property pages of /properties/<id>/reviews/ and summary refreshes
+            models.Index(fields=['property', 'is_active', 'created_at', 'id']),
+        ]
+
     def __str__(self):
         return f"Review by {self.user.mobile} on {self.property.name}"
 
+
+class PropertyReviewSummary(models.Model):
+    """
+    Rating aggregates of a property's active 1-5 star reviews, recomputed by
+    property.reviews whenever one of its reviews is saved or deleted.
+    """
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='review_summary'
+    )
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_avg = models.DecimalField(max_digits=3, decimal_places=2, null=True, blank=True)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def histogram(self):
+        """``{"1": count, ..., "5": count}``"""
+        return {str(stars): getattr(self, f"rating_{stars}") for stars in range(1, 6)}
+
+    def __str__(self):
+        return f"Review summary for property {self.property_id}"
+
 class Reply(models.Model):
     id = models.AutoField(primary_key=True)
     user = models.ForeignKey(HsUser, on_delete=models.CASCADE)
@@ -339,3 +432,96 @@ class FavoriteProperty(models.Model):
 
     def __str__(self):
         return f"{self.user.mobile} - {self.property.name}"
+
+
+class PropertySearchIndex(models.Model):
+    """
+    Denormalized, one-row-per-property projection used by the public search.
+    Rebuilt by property.search whenever a property, its rooms or its
+    city/state/country change.
+    """
+    property = models.OneToOneField(
+        Property,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_index'
+    )
+    property_type = models.CharField(max_length=20, db_index=True)
+    area_key = models.CharField(max_length=255, blank=True, default='', db_index=True)
+    min_daily_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_monthly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    min_yearly_rate = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    max_occupancy = models.IntegerField(default=0)
+    max_rooms_per_type = models.IntegerField(default=0)
+    total_rooms = models.IntegerField(default=0)
+    has_daily = models.BooleanField(default=False)
+    has_monthly = models.BooleanField(default=False)
+    has_yearly = models.BooleanField(default=False)
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+    # Empty when the property has no coordinates; see property.geo
+    geohash = models.CharField(max_length=12, blank=True, default='', db_index=True)
+    is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['property_type', 'max_occupancy']),
+            models.Index(fields=['has_monthly']),
+            models.Index(fields=['has_yearly']),
+            models.Index(fields=['min_daily_rate']),
+        ]
+
+    def __str__(self):
+        return f"Search index for property {self.property_id}"
+
+
+class PropertySearchToken(models.Model):
+    """Normalized location token (city, state, country, location, area words)."""
+    id = models.AutoField(primary_key=True)
+    index = models.ForeignKey(
+        PropertySearchIndex,
+        on_delete=models.CASCADE,
+        related_name='tokens'
+    )
+    token = models.CharField(max_length=64, db_index=True)
+
+    class Meta:
+        unique_together = ('index', 'token')
+
+    def __str__(self):
+        return f"{self.token} ({self.index_id})"
+
+
+class PropertySearchTerm(models.Model):
+    """
+    Full-text term of a property (name, location, amenity or description
+    word) with the weight of the most important field it occurs in.
+    """
+    id = models.BigAutoField(primary_key=True)
+    index = models.ForeignKey(
+        PropertySearchIndex,
+        on_delete=models.CASCADE,
+        related_name='terms'
+    )
+    term = models.CharField(max_length=64, db_index=True)
+    weight = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ('index', 'term')
+
+    def __str__(self):
+        return f"{self.term} ({self.index_id}, {self.weight})"
+
+
+class SearchTrigram(models.Model):
+    """Trigram of a location term, for matching misspelt city and area names."""
+    id = models.BigAutoField(primary_key=True)
+    trigram = models.CharField(max_length=3, db_index=True)
+    term = models.CharField(max_length=64)
+
+    class Meta:
+        unique_together = ('trigram', 'term')
+
+    def __str__(self):
+        return f"{self.trigram} -> {self.term}"
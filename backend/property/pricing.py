@@ -0,0 +1,152 @@
+"""
+Stay pricing behind ``POST /api/property/quote/``.
+
+``quote_stays`` prices a batch of stays (room, check-in/check-out,
+booking_time, rooms, guests, offer code) in one pass: the rooms and their
+properties are loaded with two queries for the whole batch and offers come
+from the in-memory offer index, so the cost per extra stay is arithmetic.
+All amounts are Decimals, rounded half up to the paisa:
+
+    base            = rate for booking_time * units * rooms
+    discount        = base * (room discount, else property discount) %
+    offer_discount  = (base - discount) * offer %
+    taxable         = base - discount - offer_discount
+    tax             = taxable * Setting.get_dynamic_tax_rate(taxable per room per unit)
+    total           = taxable + tax
+
+Units are started hours, nights (24h), months (30 days) or years (365
+days) of the stay, at least one. The tax slab follows the tariff of one
+room for one unit, as GST does, not the size of the whole booking.
+
+Stays are priced one by one rather than as numpy arrays: money has to stay
+exact Decimal arithmetic with paisa rounding, which float arrays would lose,
+and the database round trips, not the arithmetic, dominate a batch.
+"""
+import logging
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db.models import Prefetch
+
+from offer.resolution import get_offer_index
+from .models import Property, Room, Setting
+
+logger = logging.getLogger("property")
+
+CENT = Decimal("0.01")
+HUNDRED = Decimal("100")
+
+RATE_FIELDS = {
+    "hourly": "hourly_rate",
+    "daily": "daily_rate",
+    "monthly": "monthly_rate",
+    "yearly": "yearly_rate",
+}
+UNIT_SECONDS = {
+    "hourly": 3600,
+    "daily": 86400,
+    "monthly": 30 * 86400,
+    "yearly": 365 * 86400,
+}
+
+# One stay to price; ``checkout`` may be None for a single unit
+Stay = namedtuple("Stay", "room_id property_id checkin checkout booking_time rooms guests code")
+
+
+class QuoteError(Exception):
+    """A stay that cannot be priced; the message is returned for that stay."""
+
+
+def _money(amount):
+    return amount.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+def stay_units(booking_time, checkin, checkout):
+    """Started hours/nights/months/years between check-in and check-out, at least 1."""
+    if checkout is None:
+        return 1
+    seconds = int((checkout - checkin).total_seconds())
+    return max(1, -(-seconds // UNIT_SECONDS[booking_time]))
+
+
+def _load_rooms(stays):
+    room_ids = {stay.room_id for stay in stays}
+    return Room.objects.filter(id__in=room_ids, is_active=True).prefetch_related(
+        Prefetch(
+            "property_set",
+            queryset=Property.objects.filter(is_active=True).only("id", "discount").order_by("id"),
+        )
+    ).in_bulk()
+
+
+def _price(stay, room, offer_index):
+    properties = {prop.id: prop for prop in room.property_set.all()}
+    if stay.property_id is None:
+        prop = next(iter(properties.values()), None)
+    else:
+        prop = properties.get(stay.property_id)
+    if prop is None:
+        raise QuoteError(f"Room {room.id} is not listed in an active property")
+
+    rate = getattr(room, RATE_FIELDS[stay.booking_time])
+    if not rate or rate <= 0:
+        raise QuoteError(f"Room {room.id} has no {stay.booking_time} rate")
+    if stay.guests and stay.guests > room.maxoccupancy * stay.rooms:
+        raise QuoteError(f"Room {room.id} sleeps at most {room.maxoccupancy} guests per room")
+
+    units = stay_units(stay.booking_time, stay.checkin, stay.checkout)
+    base = _money(rate * units * stay.rooms)
+
+    discount_percentage = room.discount or prop.discount or Decimal("0")
+    discount_percentage = min(max(discount_percentage, Decimal("0")), HUNDRED)
+    discount = _money(base * discount_percentage / HUNDRED)
+
+    offer, offer_discount = None, Decimal("0.00")
+    if stay.code:
+        window = offer_index.best(prop.id, stay.checkin, stay.code)
+        if window is None:
+            raise QuoteError(f"Offer code {stay.code} does not apply to this stay")
+        offer = window.data["offer"]
+        offer_percentage = min(max(window.discount, Decimal("0")), HUNDRED)
+        offer_discount = _money((base - discount) * offer_percentage / HUNDRED)
+
+    taxable = max(base - discount - offer_discount, Decimal("0.00"))
+    tax_rate = Setting.get_dynamic_tax_rate(taxable / (units * stay.rooms))
+    tax = _money(taxable * tax_rate)
+    return {
+        "room": room.id,
+        "property": prop.id,
+        "booking_time": stay.booking_time,
+        "units": units,
+        "rooms": stay.rooms,
+        "rate": str(rate),
+        "base": str(base),
+        "discount_percentage": str(discount_percentage),
+        "discount": str(discount),
+        "offer": offer,
+        "offer_discount": str(offer_discount),
+        "taxable": str(taxable),
+        "tax_rate": str(tax_rate),
+        "tax": str(tax),
+        "total": str(taxable + tax),
+    }
+
+
+def quote_stays(stays):
+    """
+    Price every stay; returns one dict per stay, in order: the breakdown, or
+    ``{"error": message}`` when that stay cannot be priced.
+    """
+    rooms = _load_rooms(stays)
+    offer_index = get_offer_index() if any(stay.code for stay in stays) else None
+    quotes = []
+    for stay in stays:
+        room = rooms.get(stay.room_id)
+        try:
+            if room is None:
+                raise QuoteError(f"Room {stay.room_id} not found")
+            quotes.append(_price(stay, room, offer_index))
+        except QuoteError as e:
+            quotes.append({"room": stay.room_id, "error": str(e)})
+    logger.debug(f"Priced {len(stays)} stays over {len(rooms)} rooms")
+    return quotes
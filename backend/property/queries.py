@@ -0,0 +1,81 @@
+from django.db.models import Prefetch
+
+from .models import (
+    Property,
+    PropertyImage,
+    Room,
+    RoomImage,
+    Amenity,
+    Rule,
+    Documentation,
+    Review,
+    NearbyPlace,
+    FavoriteProperty,
+)
+from .reviews import REVIEW_PREVIEW_LIMIT
+
+
+def property_view_prefetches(prefix="", reviews=True):
+    """
+    Prefetch objects covering every relation PropertyViewSerializer walks.
+
+    ``prefix`` lets querysets of models pointing at Property (e.g.
+    FavoriteProperty with ``"property__"``) reuse the same plan. Only the
+    latest REVIEW_PREVIEW_LIMIT active reviews are fetched, into
+    ``latest_reviews``; ``reviews=False`` skips them for serializers without
+    the ``reviews`` field.
+    """
+    prefetches = [
+        Prefetch(
+            f"{prefix}images",
+            queryset=PropertyImage.objects.select_related("category").order_by("id"),
+        ),
+        Prefetch(
+            f"{prefix}rooms",
+            queryset=Room.objects.prefetch_related(
+                Prefetch("images", queryset=RoomImage.objects.order_by("id")),
+                Prefetch("amenities", queryset=Amenity.objects.order_by("id")),
+            ).order_by("id"),
+        ),
+        Prefetch(f"{prefix}amenities", queryset=Amenity.objects.order_by("id")),
+        Prefetch(f"{prefix}rules", queryset=Rule.objects.order_by("id")),
+        Prefetch(f"{prefix}documentation", queryset=Documentation.objects.order_by("id")),
+        Prefetch(
+            f"{prefix}nearby_places",
+            queryset=NearbyPlace.objects.order_by("sort_order", "name"),
+        ),
+    ]
+    if reviews:
+        prefetches.append(Prefetch(
+            f"{prefix}reviews",
+            queryset=Review.objects.filter(is_active=True).select_related("user").prefetch_related("images")
+            .order_by("-created_at", "-id")[:REVIEW_PREVIEW_LIMIT],
+            to_attr="latest_reviews",
+        ))
+    return prefetches
+
+
+def property_view_queryset(queryset=None, reviews=True):
+    """
+    Return ``queryset`` (default: all properties) with the joins and prefetches
+    needed to serialize it with PropertyViewSerializer in a fixed number of
+    queries, independent of the number of properties.
+    """
+    if queryset is None:
+        queryset = Property.objects.all()
+    return queryset.select_related("city", "state", "country", "review_summary").prefetch_related(
+        *property_view_prefetches(reviews=reviews)
+    )
+
+
+def favorite_property_ids(user_id):
+    """
+    Set of property ids the given user has marked as favourite.
+    """
+    if not user_id:
+        return set()
+    return set(
+        FavoriteProperty.objects.filter(user_id=user_id, is_active=True).values_list(
+            "property_id", flat=True
+        )
+    )
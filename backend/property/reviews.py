@@ -0,0 +1,67 @@
+"""
+Per-property review aggregates (PropertyReviewSummary).
+
+Signals call ``refresh_review_summaries`` inside the transaction that
+saves or deletes a review. It locks the property's summary row and
+recomputes it with one aggregate over the property's active reviews. A
+concurrent review of the same property waits for that lock, and its own
+aggregate then includes the first review's row, so no update is lost and
+a summary never drifts from the reviews it counts.
+"""
+import logging
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+
+from .models import Property, PropertyReviewSummary, Review
+
+logger = logging.getLogger("property")
+
+RATINGS = range(1, 6)
+# Latest reviews embedded in property documents; the rest are paged from
+# /properties/<id>/reviews/
+REVIEW_PREVIEW_LIMIT = 5
+
+
+def _aggregate(property_id):
+    return Review.objects.filter(property_id=property_id, is_active=True, rating__in=RATINGS).aggregate(
+        count=Count('id'),
+        total=Sum('rating'),
+        **{f"rating_{stars}": Count('id', filter=Q(rating=stars)) for stars in RATINGS},
+    )
+
+
+def refresh_review_summaries(property_ids=None):
+    """
+    Recompute the summaries of the given properties (all when None).
+    Returns how many were written.
+    """
+    if property_ids is None:
+        property_ids = Property.objects.values_list('id', flat=True)
+    refreshed = 0
+    # A fixed lock order keeps concurrent multi-property refreshes from deadlocking
+    for property_id in sorted({pk for pk in property_ids if pk}):
+        with transaction.atomic():
+            summary, _ = PropertyReviewSummary.objects.select_for_update().get_or_create(property_id=property_id)
+            totals = _aggregate(property_id)
+            summary.rating_count = totals['count']
+            summary.rating_sum = totals['total'] or 0
+            summary.rating_avg = (
+                (Decimal(summary.rating_sum) / summary.rating_count).quantize(Decimal('0.01'), ROUND_HALF_UP)
+                if summary.rating_count else None
+            )
+            for stars in RATINGS:
+                setattr(summary, f"rating_{stars}", totals[f"rating_{stars}"])
+            summary.save()
+        refreshed += 1
+    logger.debug(f"Refreshed {refreshed} review summaries")
+    return refreshed
+
+
+def review_summary(prop):
+    """The property's summary, or None when it has no reviews yet (no query when select_related)."""
+    try:
+        return prop.review_summary
+    except PropertyReviewSummary.DoesNotExist:
+        return None
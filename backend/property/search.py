@@ -0,0 +1,289 @@
+import logging
+import re
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+
+from .geo import encode_geohash, next_prefix
+from .inventory import rooms_with_free_inventory
+from .models import Property, PropertySearchIndex, PropertySearchTerm, PropertySearchToken, SearchTrigram
+
+logger = logging.getLogger("property")
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+TOKEN_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+MAX_TOKEN_LENGTH = 64
+
+# Full-text weight of a term by the most important field it occurs in
+NAME_WEIGHT = 8
+LOCATION_WEIGHT = 4
+AMENITY_WEIGHT = 2
+DESCRIPTION_WEIGHT = 1
+
+MAX_QUERY_TOKENS = 8
+# A term that merely starts with the query word counts this much of an exact match
+PREFIX_FACTOR = 0.5
+# Least trigram similarity (shared / all trigrams) for a misspelt location word
+MIN_TRIGRAM_SIMILARITY = 0.3
+
+
+def normalize_text(value):
+    """Lowercase ``value`` and collapse it to single-space separated words."""
+    return " ".join(tokenize(value))
+
+
+def tokenize(value):
+    """Split free text into lowercase alphanumeric tokens."""
+    if not value:
+        return []
+    return [token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall(str(value).lower())]
+
+
+def _location_tokens(prop):
+    tokens = set()
+    for value in (
+        prop.city.name if prop.city_id else None,
+        prop.state.name if prop.state_id else None,
+        prop.country.name if prop.country_id else None,
+        prop.location,
+        prop.area,
+    ):
+        tokens.update(tokenize(value))
+    return tokens
+
+
+def _weighted_terms(prop, location_tokens):
+    """{term: weight} for the full-text index of ``prop``."""
+    weights = {}
+    for weight, tokens in (
+        (DESCRIPTION_WEIGHT, tokenize(prop.description)),
+        (AMENITY_WEIGHT, [token for amenity in prop.amenities.all() for token in tokenize(amenity.name)]),
+        (LOCATION_WEIGHT, location_tokens),
+        (NAME_WEIGHT, tokenize(prop.name)),
+    ):
+        for token in tokens:
+            weights[token] = max(weights.get(token, 0), weight)
+    return weights
+
+
+def trigrams(term):
+    """Trigrams of ``term`` padded like pg_trgm, so word starts weigh more."""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _add_trigrams(terms):
+    SearchTrigram.objects.bulk_create(
+        [
+            SearchTrigram(trigram=trigram, term=term)
+            for term in sorted(terms)
+            if len(term) >= 3 and not term.isdigit()
+            for trigram in sorted(trigrams(term))
+        ],
+        batch_size=1000,
+        ignore_conflicts=True,
+    )
+
+
+def refresh_property_search_index(property_ids=None):
+    """
+    Recompute PropertySearchIndex rows (with their location tokens and
+    full-text terms) for the given property ids, or for every property when
+    ``property_ids`` is None. Location trigrams are only added here; a full
+    rebuild drops the ones no property uses any more.
+    """
+    properties = Property.objects.select_related("city", "state", "country")
+    if property_ids is not None:
+        property_ids = set(property_ids)
+        if not property_ids:
+            return 0
+        properties = properties.filter(id__in=property_ids)
+
+    properties = properties.annotate(
+        room_min_daily=Min("rooms__daily_rate", filter=Q(rooms__daily_rate__gt=0)),
+        room_min_monthly=Min("rooms__monthly_rate", filter=Q(rooms__monthly_rate__gt=0)),
+        room_min_yearly=Min("rooms__yearly_rate", filter=Q(rooms__yearly_rate__gt=0)),
+        room_max_occupancy=Max("rooms__maxoccupancy"),
+        room_max_count=Max("rooms__number_of_rooms"),
+        room_total=Sum("rooms__number_of_rooms"),
+    ).prefetch_related("amenities")
+
+    refreshed = 0
+    all_location_tokens = set()
+    with transaction.atomic():
+        if property_ids is None:
+            SearchTrigram.objects.all().delete()
+        for prop in properties:
+            has_coordinates = prop.latitude is not None and prop.longitude is not None
+            latitude = float(prop.latitude) if has_coordinates else None
+            longitude = float(prop.longitude) if has_coordinates else None
+            index, _ = PropertySearchIndex.objects.update_or_create(
+                property=prop,
+                defaults={
+                    "property_type": (prop.property_type or "").lower(),
+                    "area_key": normalize_text(prop.area),
+                    "min_daily_rate": prop.room_min_daily,
+                    "min_monthly_rate": prop.room_min_monthly,
+                    "min_yearly_rate": prop.room_min_yearly,
+                    "max_occupancy": prop.room_max_occupancy or 0,
+                    "max_rooms_per_type": prop.room_max_count or 0,
+                    "total_rooms": prop.room_total or 0,
+                    "has_daily": prop.room_min_daily is not None,
+                    "has_monthly": prop.room_min_monthly is not None,
+                    "has_yearly": prop.room_min_yearly is not None,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "geohash": encode_geohash(latitude, longitude) if has_coordinates else "",
+                    "is_active": prop.is_active,
+                },
+            )
+            location_tokens = _location_tokens(prop)
+            index.tokens.all().delete()
+            PropertySearchToken.objects.bulk_create(
+                [PropertySearchToken(index=index, token=token) for token in sorted(location_tokens)]
+            )
+            index.terms.all().delete()
+            PropertySearchTerm.objects.bulk_create(
+                [
+                    PropertySearchTerm(index=index, term=term, weight=weight)
+                    for term, weight in sorted(_weighted_terms(prop, location_tokens).items())
+                ]
+            )
+            all_location_tokens |= location_tokens
+            refreshed += 1
+        _add_trigrams(all_location_tokens)
+
+    logger.debug(f"Refreshed search index for {refreshed} properties")
+    return refreshed
+
+
+def search_property_ids(**filters):
+    """Return a queryset of the ids of the properties matching search_index(**filters)."""
+    return search_index(**filters).order_by("property_id").values_list("property_id", flat=True)
+
+
+def search_index(
+    property_type=None,
+    rooms=None,
+    guests_per_room=None,
+    location=None,
+    area=None,
+    price=None,
+    booking_type=None,
+    checkin=None,
+    checkout=None,
+):
+    """
+    Return the PropertySearchIndex rows matching the public search filters.
+
+    Every predicate is an equality, range or prefix lookup on an indexed
+    column of PropertySearchIndex / PropertySearchToken. With ``checkin``
+    and ``checkout`` only properties having a room type with ``rooms``
+    (default 1) rooms free on every night, read from RoomInventory, remain.
+    """
+    index = PropertySearchIndex.objects.all()
+
+    if property_type and property_type != "all":
+        index = index.filter(property_type=property_type.lower())
+
+    if rooms is not None:
+        index = index.filter(max_rooms_per_type__gte=rooms)
+
+    if guests_per_room is not None:
+        index = index.filter(max_occupancy__gte=guests_per_room)
+
+    for token in tokenize(location):
+        index = index.filter(
+            property_id__in=PropertySearchToken.objects.filter(token__startswith=token).values("index_id")
+        )
+
+    if area:
+        index = index.filter(area_key=normalize_text(area))
+
+    if price is not None:
+        index = index.filter(min_daily_rate__lte=price)
+
+    if booking_type == "monthly":
+        index = index.filter(has_monthly=True)
+    elif booking_type == "yearly":
+        index = index.filter(has_yearly=True)
+    elif booking_type:
+        index = index.filter(Q(has_daily=True) | Q(has_monthly=True))
+
+    if checkin and checkout:
+        free = rooms_with_free_inventory(checkin, checkout, rooms or 1).filter(is_active=True)
+        if guests_per_room is not None:
+            free = free.filter(maxoccupancy__gte=guests_per_room)
+        index = index.filter(
+            property_id__in=Property.rooms.through.objects.filter(room__in=free).values("property_id")
+        )
+
+    return index
+
+
+def _term_scores(terms, candidates):
+    """{property_id: best weight * factor} over PropertySearchTerm rows; ``terms`` maps term -> factor."""
+    scores = {}
+    rows = PropertySearchTerm.objects.filter(term__in=list(terms), index_id__in=candidates)
+    for property_id, term, weight in rows.values_list("index_id", "term", "weight"):
+        scores[property_id] = max(scores.get(property_id, 0), weight * terms[term])
+    return scores
+
+
+def _prefix_scores(token, candidates):
+    """{property_id: score} for terms equal to or (from two letters) starting with ``token``."""
+    if len(token) < 2:
+        return _term_scores({token: 1.0}, candidates)
+    upper = next_prefix(token, TOKEN_ALPHABET)
+    in_range = Q(term__gte=token, term__lt=upper) if upper else Q(term__gte=token)
+    scores = {}
+    rows = PropertySearchTerm.objects.filter(in_range, index_id__in=candidates)
+    for property_id, term, weight in rows.values_list("index_id", "term", "weight"):
+        score = weight if term == token else weight * PREFIX_FACTOR
+        scores[property_id] = max(scores.get(property_id, 0), score)
+    return scores
+
+
+def similar_terms(token):
+    """{location term: trigram similarity} for terms close enough to a misspelt ``token``."""
+    grams = trigrams(token)
+    shared = SearchTrigram.objects.filter(trigram__in=grams).values("term").annotate(shared=Count("id"))
+    similar = {}
+    for term, count in shared.values_list("term", "shared"):
+        similarity = count / (len(grams) + len(trigrams(term)) - count)
+        if similarity >= MIN_TRIGRAM_SIMILARITY:
+            similar[term] = similarity
+    return similar
+
+
+def rank_property_ids(text, index):
+    """
+    ``[(-score, property_id)]`` best first for the rows of the
+    PropertySearchIndex queryset ``index`` matching every word of ``text``,
+    or None when ``text`` has no words.
+
+    A word matches a term exactly, as a prefix or, when neither matches any
+    candidate, through location trigrams; it scores the field weight of its
+    best term, scaled down for prefix and fuzzy matches.
+    """
+    tokens = list(dict.fromkeys(tokenize(text)))[:MAX_QUERY_TOKENS]
+    if not tokens:
+        return None
+    candidates = index.values("property_id")
+    scores = None
+    for token in tokens:
+        token_scores = _prefix_scores(token, candidates)
+        if not token_scores and len(token) >= 3:
+            similar = similar_terms(token)
+            if similar:
+                token_scores = _term_scores(
+                    {term: similarity * PREFIX_FACTOR for term, similarity in similar.items()},
+                    candidates,
+                )
+        if scores is None:
+            scores = token_scores
+        else:
+            scores = {pk: scores[pk] + score for pk, score in token_scores.items() if pk in scores}
+        if not scores:
+            return []
+    return sorted((-score, pk) for pk, score in scores.items())
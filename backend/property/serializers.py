@@ -25,10 +25,30 @@ from .models import (
 from offer.models import PropertyOffer
 from offer.serializers import OfferSerializer
 from django.conf import settings
+from backend.images import image_srcset
 from users.serializers import UserSerializer
+from .queries import favorite_property_ids
+from .reviews import REVIEW_PREVIEW_LIMIT, review_summary
+from offer.resolution import get_offer_index
+from .pricing import RATE_FIELDS, Stay
+
+class ReviewImageViewSerializer(serializers.ModelSerializer):
+    image = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ReviewImage
+        fields = ['id', 'image', 'srcset', 'created_at', 'updated_at']
+
+    def get_image(self, obj):
+        return f"{settings.WEBSITE_URL}{settings.MEDIA_URL}{obj.image}"
+
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
 
 class ReviewSerializer(serializers.ModelSerializer):
     user = UserSerializer(required=False)
+    image_details = ReviewImageViewSerializer(source='images', many=True, read_only=True)
     class Meta:
         model = Review
         fields = "__all__"
@@ -39,9 +59,14 @@ class ReplySerializer(serializers.ModelSerializer):
         fields = "__all__"
 
 class RoomImageSerializer(serializers.ModelSerializer):
+    srcset = serializers.SerializerMethodField()
+
     class Meta:
         model = RoomImage
-        fields = "__all__"
+        exclude = ['variants']
+
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
 
 class ImageCategorySerializer(serializers.ModelSerializer):
     code = serializers.SlugField(required=False, allow_blank=True, max_length=50)
@@ -84,12 +109,16 @@ class PropertyImageSerializer(serializers.ModelSerializer):
         allow_null=True
     )
     category_detail = ImageCategorySerializer(source='category', read_only=True)
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PropertyImage
-        fields = ['id', 'image', 'category', 'category_detail', 'created_at', 'updated_at', 'is_active']
+        fields = ['id', 'image', 'srcset', 'variants_status', 'category', 'category_detail', 'created_at', 'updated_at', 'is_active']
         read_only_fields = ['created_at', 'updated_at']
 
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
+
 
 class NearbyPlaceSerializer(serializers.ModelSerializer):
     class Meta:
@@ -124,21 +153,29 @@ class SitePageImageSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True,
     )
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = SitePageImage
-        fields = ['id', 'image', 'page_slug', 'created_at', 'updated_at']
+        fields = ['id', 'image', 'srcset', 'page_slug', 'created_at', 'updated_at']
         read_only_fields = ['id', 'created_at', 'updated_at']
 
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
+
 
 class RoomImageViewSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
+    srcset = serializers.SerializerMethodField()
     class Meta:
         model = RoomImage
-        fields = "__all__"
+        exclude = ['variants']
 
     def get_image(self, obj):
         return f"{settings.WEBSITE_URL}{settings.MEDIA_URL}{obj.image}"
+
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
     
 class PropertyImageViewSerializer(serializers.ModelSerializer):
     image = serializers.SerializerMethodField()
@@ -146,14 +183,18 @@ class PropertyImageViewSerializer(serializers.ModelSerializer):
     category_id = serializers.IntegerField(source='category.id', read_only=True)
     category_name = serializers.CharField(source='category.name', read_only=True)
     category_code = serializers.CharField(source='category.code', read_only=True)
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = PropertyImage
-        fields = ['id', 'image', 'category', 'category_id', 'category_name', 'category_code', 'created_at', 'updated_at', 'is_active']
+        fields = ['id', 'image', 'srcset', 'category', 'category_id', 'category_name', 'category_code', 'created_at', 'updated_at', 'is_active']
 
     def get_image(self, obj):
         return f"{settings.WEBSITE_URL}{settings.MEDIA_URL}{obj.image}"
 
+    def get_srcset(self, obj):
+        return image_srcset(obj.variants)
+
 class AmenitySerializer(serializers.ModelSerializer):
     class Meta:
         model = Amenity
@@ -420,17 +461,21 @@ class PropertyOfferSerializer(serializers.ModelSerializer):
     
 class PropertyViewSerializer(serializers.ModelSerializer):
     images = PropertyImageViewSerializer(many=True, required=False)
-    reviews = ReviewSerializer(many=True, required=False)
+    reviews = serializers.SerializerMethodField()
     city = CitySerializer(required=False)
     state = StateSerializer(required=False)
     country = CountrySerializer(required=False)
     amenities = AmenitySerializer(many=True, required=False)
     rules = RuleSerializer(many=True, required=False)
     documentation = DocumentationSerializer(many=True, required=False)
-    offers = PropertyOfferSerializer(many=True, required=False)
+    offers = serializers.SerializerMethodField()
+    best_offer = serializers.SerializerMethodField()
     rooms = RoomViewSerializer(many=True, required=False)
     is_favorite = serializers.SerializerMethodField()
     nearby_places = NearbyPlaceSerializer(many=True, required=False)
+    rating = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+    rating_histogram = serializers.SerializerMethodField()
 
     class Meta:
         model = Property
@@ -439,26 +484,48 @@ class PropertyViewSerializer(serializers.ModelSerializer):
             'city', 'country', 'state', 'area', 'longitude', 'latitude',
             'images', 'discount', 'amenities', 'rooms', 'rules',
             'documentation', 'created_at', 'updated_at', 'is_active',
-            'reviews', 'offers', 'is_favorite', 'gender_type',
-            'nearby_places'
+            'reviews', 'offers', 'best_offer', 'is_favorite', 'gender_type',
+            'nearby_places', 'rating', 'review_count', 'rating_histogram'
         ]
 
-    def get_is_favorite(self, obj):
-        # Check if user is authenticated and property is in user favorites
-        if 'user_favorites' in self.context:
-            return obj.id in self.context['user_favorites']
+    def get_offers(self, obj):
+        # Only the offers applying now, best first (offer.resolution)
+        return [window.data for window in get_offer_index().applicable(obj.id)]
+
+    def get_best_offer(self, obj):
+        best = get_offer_index().best(obj.id)
+        return best.data if best else None
+
+    def get_reviews(self, obj):
+        # Only the latest few; the full list is paged from /properties/<id>/reviews/
+        if hasattr(obj, 'latest_reviews'):
+            reviews = obj.latest_reviews
         else:
+            reviews = obj.reviews.filter(is_active=True).select_related('user').prefetch_related('images').order_by('-created_at', '-id')[:REVIEW_PREVIEW_LIMIT]
+        return ReviewSerializer(reviews, many=True).data
+
+    def get_rating(self, obj):
+        summary = review_summary(obj)
+        return float(summary.rating_avg) if summary and summary.rating_avg is not None else None
+
+    def get_review_count(self, obj):
+        summary = review_summary(obj)
+        return summary.rating_count if summary else 0
+
+    def get_rating_histogram(self, obj):
+        summary = review_summary(obj)
+        return summary.histogram() if summary else {str(stars): 0 for stars in range(1, 6)}
+
+    def get_is_favorite(self, obj):
+        # Check if user is authenticated and property is in user favorites.
+        # The favourites set is resolved once and shared by every row of a list.
+        if 'user_favorites' not in self.context:
             request = self.context.get('request')
             if request and hasattr(request, 'user'):
-                user_favorites = FavoriteProperty.objects.filter(user=request.user.id, property=obj, is_active=True).values_list('property_id', flat=True)
-                return obj.id in user_favorites
-            return False
-
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data['offers'] = PropertyOfferSerializer(instance.propertyoffer_set.all(), many=True).data
-        data['reviews'] = ReviewSerializer(instance.reviews.all(), many=True).data
-        return data
+                self.context['user_favorites'] = favorite_property_ids(getattr(request.user, 'id', None))
+            else:
+                return False
+        return obj.id in self.context['user_favorites']
 
 class FavoritePropertySerializer(serializers.ModelSerializer):
     property = PropertyViewSerializer(required=False)
@@ -503,4 +570,35 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 class SettingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Setting
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+
+class QuoteStaySerializer(serializers.Serializer):
+    """One stay of a /quote/ request (property.pricing)."""
+    room = serializers.IntegerField()
+    property = serializers.IntegerField(required=False, allow_null=True)
+    checkin = serializers.DateTimeField()
+    checkout = serializers.DateTimeField(required=False, allow_null=True)
+    booking_time = serializers.ChoiceField(choices=list(RATE_FIELDS), default='daily')
+    rooms = serializers.IntegerField(min_value=1, default=1)
+    guests = serializers.IntegerField(min_value=1, required=False, allow_null=True)
+    code = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+    def validate(self, attrs):
+        checkout = attrs.get('checkout')
+        if checkout is not None and checkout <= attrs['checkin']:
+            raise serializers.ValidationError({'checkout': 'checkout must be after checkin'})
+        return attrs
+
+    def to_stay(self):
+        data = self.validated_data
+        return Stay(
+            room_id=data['room'],
+            property_id=data.get('property'),
+            checkin=data['checkin'],
+            checkout=data.get('checkout'),
+            booking_time=data['booking_time'],
+            rooms=data['rooms'],
+            guests=data.get('guests'),
+            code=(data.get('code') or '').strip() or None,
+        )
@@ -0,0 +1,62 @@
+"""
+Process-local registry of the active ``Setting`` rows.
+
+``settings_registry`` loads every active setting with one query and serves
+them from memory. Saving or deleting a setting bumps its model cache
+version (``backend.response_cache.model_version``) on commit; each worker
+compares that shared version with the one its copy was loaded at, at most
+every ``SETTINGS_VERSION_CHECK_INTERVAL`` seconds, and reloads when it
+moved, so a read may see the previous value for that long after a change.
+"""
+import logging
+import threading
+import time
+
+from django.conf import settings
+
+from backend.cache_versions import get_version
+from backend.response_cache import model_version
+from .models import Setting
+
+logger = logging.getLogger("property")
+
+
+class SettingsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = None
+        self._descriptions = {}
+        self._version = None
+        self._checked_at = 0.0
+
+    def _load(self):
+        rows = list(Setting.objects.filter(is_active=True).values_list("key", "value", "description"))
+        self._values = {key: value for key, value, _ in rows}
+        self._descriptions = {key: description for key, _, description in rows}
+        logger.debug(f"Loaded {len(rows)} settings")
+
+    def _current(self):
+        now = time.monotonic()
+        if self._values is not None and now - self._checked_at < settings.SETTINGS_VERSION_CHECK_INTERVAL:
+            return self._values
+        try:
+            version = get_version(model_version(Setting))
+        except Exception as e:
+            logger.warning(f"Settings version unavailable, keeping the loaded settings: {str(e)}")
+            version = self._version
+        with self._lock:
+            if self._values is None or version != self._version:
+                self._load()
+                self._version = version
+            self._checked_at = now
+        return self._values
+
+    def get(self, key, default=None):
+        return self._current().get(key, default)
+
+    def get_description(self, key):
+        self._current()
+        return self._descriptions.get(key)
+
+
+settings_registry = SettingsRegistry()
@@ -0,0 +1,218 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from backend.cache_versions import bump_version
+from backend.images import queue_replaced_image
+from backend.response_cache import model_version
+from .autocomplete import AUTOCOMPLETE_VERSION
+from .documents import (
+    PROPERTY_DOCUMENT_DEPENDENCIES,
+    PROPERTY_DOCUMENT_FIELDS,
+    dependent_property_ids,
+    document_fields_changed,
+    invalidate_property_documents,
+)
+
+from .models import (
+    Amenity,
+    City,
+    Country,
+    Documentation,
+    ImageCategory,
+    Property,
+    PropertyImage,
+    Review,
+    ReviewImage,
+    Room,
+    RoomImage,
+    Rule,
+    Setting,
+    SitePageImage,
+    State,
+)
+from .inventory import sync_room_total
+from .reviews import refresh_review_summaries
+from .search import refresh_property_search_index
+
+
+@receiver(post_save, sender=Property)
+def property_saved(sender, instance, **kwargs):
+    refresh_property_search_index([instance.id])
+
+
+@receiver(m2m_changed, sender=Property.rooms.through)
+def property_rooms_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # room.property_set.<add/remove/clear>(): instance is the Room
+        if action == "pre_clear":
+            instance._search_index_property_ids = list(instance.property_set.values_list("id", flat=True))
+        elif action in ("post_add", "post_remove"):
+            refresh_property_search_index(pk_set)
+        elif action == "post_clear":
+            refresh_property_search_index(getattr(instance, "_search_index_property_ids", []))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        refresh_property_search_index([instance.pk])
+
+
+@receiver(m2m_changed, sender=Property.amenities.through)
+def property_amenities_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if reverse:
+        # amenity.property_set.<add/remove/clear>(): instance is the Amenity
+        if action == "pre_clear":
+            instance._search_index_property_ids = list(instance.property_set.values_list("id", flat=True))
+        elif action in ("post_add", "post_remove"):
+            refresh_property_search_index(pk_set)
+        elif action == "post_clear":
+            refresh_property_search_index(getattr(instance, "_search_index_property_ids", []))
+    elif action in ("post_add", "post_remove", "post_clear"):
+        refresh_property_search_index([instance.pk])
+
+
+@receiver(pre_save, sender=Review)
+def review_saving(sender, instance, **kwargs):
+    # A review moved to another property changes both summaries
+    instance._summary_property_id = (
+        Review.objects.filter(pk=instance.pk).values_list("property_id", flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, **kwargs):
+    refresh_review_summaries([instance.property_id, getattr(instance, "_summary_property_id", None)])
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, origin=None, **kwargs):
+    # Deleting the property itself removes its summary as well
+    if isinstance(origin, Property) or (isinstance(origin, QuerySet) and origin.model is Property):
+        return
+    refresh_review_summaries([instance.property_id])
+
+
+@receiver(post_save, sender=Amenity)
+def amenity_saved(sender, instance, created, **kwargs):
+    if not created:
+        refresh_property_search_index(instance.property_set.values_list("id", flat=True))
+
+
+@receiver(post_save, sender=Room)
+def room_saved(sender, instance, **kwargs):
+    refresh_property_search_index(instance.property_set.values_list("id", flat=True))
+    if not kwargs.get("created"):
+        sync_room_total(instance)
+
+
+@receiver(pre_delete, sender=Room)
+def room_deleting(sender, instance, **kwargs):
+    instance._search_index_property_ids = list(instance.property_set.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Room)
+def room_deleted(sender, instance, **kwargs):
+    refresh_property_search_index(getattr(instance, "_search_index_property_ids", []))
+
+
+@receiver(post_save, sender=City)
+@receiver(post_save, sender=State)
+@receiver(post_save, sender=Country)
+def location_saved(sender, instance, created, **kwargs):
+    if created:
+        return
+    field = sender.__name__.lower()
+    refresh_property_search_index(
+        Property.objects.filter(**{field: instance}).values_list("id", flat=True)
+    )
+
+
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+def autocomplete_source_changed(sender, **kwargs):
+    transaction.on_commit(lambda: bump_version(AUTOCOMPLETE_VERSION))
+
+
+@receiver(post_save, sender=Amenity)
+@receiver(post_delete, sender=Amenity)
+@receiver(post_save, sender=Rule)
+@receiver(post_delete, sender=Rule)
+@receiver(post_save, sender=Documentation)
+@receiver(post_delete, sender=Documentation)
+@receiver(post_save, sender=ImageCategory)
+@receiver(post_delete, sender=ImageCategory)
+@receiver(post_save, sender=City)
+@receiver(post_delete, sender=City)
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+@receiver(post_save, sender=Setting)
+@receiver(post_delete, sender=Setting)
+def reference_data_changed(sender, **kwargs):
+    # Invalidates the cached reference-data responses (backend.response_cache)
+    transaction.on_commit(lambda: bump_version(model_version(sender)))
+
+
+def _invalidate_documents_on_commit(property_ids):
+    property_ids = set(property_ids)
+    if property_ids:
+        transaction.on_commit(lambda: invalidate_property_documents(property_ids))
+
+
+def document_source_saving(sender, instance, update_fields=None, **kwargs):
+    instance._document_fields_changed = document_fields_changed(instance, update_fields)
+
+
+def document_source_saved(sender, instance, **kwargs):
+    if getattr(instance, "_document_fields_changed", True):
+        _invalidate_documents_on_commit(dependent_property_ids(instance))
+
+
+def document_source_deleting(sender, instance, **kwargs):
+    # Resolved before the delete cascades through the relations it is found by
+    _invalidate_documents_on_commit(dependent_property_ids(instance))
+
+
+def document_relation_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action in ("pre_add", "pre_remove"):
+        return
+    if action == "pre_clear":
+        # Clearing from the far side: the rows it was linked to are only known now
+        if reverse:
+            _invalidate_documents_on_commit(dependent_property_ids(instance))
+        return
+    if reverse and action != "post_clear":
+        property_ids = set()
+        for owner in model.objects.filter(pk__in=pk_set):
+            property_ids |= dependent_property_ids(owner)
+        _invalidate_documents_on_commit(property_ids)
+    elif not reverse:
+        _invalidate_documents_on_commit(dependent_property_ids(instance))
+
+
+for _model in PROPERTY_DOCUMENT_DEPENDENCIES:
+    post_save.connect(document_source_saved, sender=_model, dispatch_uid=f"property-document-save-{_model._meta.label_lower}")
+    pre_delete.connect(document_source_deleting, sender=_model, dispatch_uid=f"property-document-delete-{_model._meta.label_lower}")
+
+for _model in PROPERTY_DOCUMENT_FIELDS:
+    pre_save.connect(document_source_saving, sender=_model, dispatch_uid=f"property-document-saving-{_model._meta.label_lower}")
+
+for _through in (
+    Property.images.through,
+    Property.amenities.through,
+    Property.rooms.through,
+    Property.rules.through,
+    Property.documentation.through,
+    Room.images.through,
+    Room.amenities.through,
+    Review.images.through,
+):
+    m2m_changed.connect(document_relation_changed, sender=_through, dispatch_uid=f"property-document-m2m-{_through._meta.label_lower}")
+
+for _model in (PropertyImage, RoomImage, ReviewImage, SitePageImage):
+    # A replaced image file needs new variants (backend.images)
+    pre_save.connect(queue_replaced_image, sender=_model, dispatch_uid=f"image-variants-{_model._meta.label_lower}")
@@ -1,3 +1,122 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from backend.cache_versions import get_version
+
+from users.models import HsUser
+from .models import (
+    Amenity,
+    City,
+    Country,
+    ImageCategory,
+    NearbyPlace,
+    Property,
+    PropertyImage,
+    Review,
+    Room,
+    RoomImage,
+    Setting,
+    State,
+)
+from .documents import PROPERTY_DOCUMENT_KEY_PREFIX
+from .queries import property_view_queryset
+from .serializers import PropertyViewSerializer
+
+
+class PropertyViewQuerysetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = HsUser.objects.create(mobile="9999999999", name="Guest")
+        cls.city = City.objects.create(name="Mumbai")
+        cls.state = State.objects.create(name="Maharashtra")
+        cls.country = Country.objects.create(name="India")
+        cls.category, _ = ImageCategory.objects.get_or_create(name="Room", defaults={"code": "room"})
+        cls.amenity = Amenity.objects.create(name="Wifi")
+
+    def create_property(self, name):
+        prop = Property.objects.create(
+            name=name, location="Andheri", area="Andheri",
+            city=self.city, state=self.state, country=self.country,
+        )
+        room = Room.objects.create(name="Deluxe", daily_rate=Decimal("1000"), monthly_rate=Decimal("20000"))
+        room.amenities.add(self.amenity)
+        room.images.add(RoomImage.objects.create(image="room.jpg"))
+        prop.rooms.add(room)
+        prop.amenities.add(self.amenity)
+        prop.images.add(PropertyImage.objects.create(image="property.jpg", category=self.category))
+        NearbyPlace.objects.create(property=prop, name="Station", category="transport", distance="1 km")
+        Review.objects.create(user=self.user, property=prop, rating=4, review="Clean rooms")
+        return prop
+
+    def serialize(self):
+        return PropertyViewSerializer(property_view_queryset(), many=True).data
+
+    def test_query_count_does_not_grow_with_properties(self):
+        self.create_property("First")
+        # The first pass may warm process-level caches; count a warm pass
+        self.serialize()
+        with CaptureQueriesContext(connection) as queries:
+            data = self.serialize()
+        self.assertEqual(len(data), 1)
+
+        for i in range(4):
+            self.create_property(f"More {i}")
+        self.serialize()
+        with self.assertNumQueries(len(queries)):
+            data = self.serialize()
+        self.assertEqual(len(data), 5)
+        self.assertTrue(all(len(item["reviews"]) == 1 and len(item["rooms"]) == 1 for item in data))
+
+
+class PropertyDocumentUserInvalidationTests(TestCase):
+    def setUp(self):
+        self.user = HsUser.objects.create(mobile="9999999999", name="Guest")
+        self.prop = Property.objects.create(name="Stay", location="Andheri")
+        Review.objects.create(user=self.user, property=self.prop, rating=5, review="Great")
+
+    def document_version(self):
+        return get_version(f"{PROPERTY_DOCUMENT_KEY_PREFIX}{self.prop.id}")
+
+    def save_user(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save(**kwargs)
+
+    def test_saves_not_changing_the_review_author_keep_documents(self):
+        version = self.document_version()
+        self.user.last_login = timezone.now()
+        self.save_user(update_fields=["last_login"])
+        self.save_user()
+        self.assertEqual(self.document_version(), version)
+
+    def test_renaming_the_review_author_invalidates_documents(self):
+        version = self.document_version()
+        self.user.name = "Renamed"
+        self.save_user()
+        self.assertNotEqual(self.document_version(), version)
+
+
+class SettingsListTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.setting = Setting.objects.create(key="support_phone", value="1800-000")
+
+    def test_saved_setting_is_listed_at_once(self):
+        self.assertEqual(self.client.get("/api/property/settings/").json(), {"support_phone": "1800-000"})
+        self.setting.value = "1800-111"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.setting.save()
+        # Within SETTINGS_VERSION_CHECK_INTERVAL of the first read
+        self.assertEqual(self.client.get("/api/property/settings/").json(), {"support_phone": "1800-111"})
 
-# Create your tests here.
+    def test_settings_are_served_while_the_cache_is_down(self):
+        with mock.patch("backend.cache_versions.cache.get_many", side_effect=ConnectionError("down")):
+            response = self.client.get("/api/property/settings/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"support_phone": "1800-000"})
+        self.assertNotIn("ETag", response)
@@ -14,6 +14,7 @@ urlpatterns = [
     path('rooms/<int:pk>/', views.room_detail, name='room-detail'),
     path('properties/', views.property_list, name='property-list'),
     path('properties/<int:pk>/', views.property_detail, name='property-detail'),
+    path('properties/<int:pk>/reviews/', views.property_reviews, name='property-reviews'),
     path('reviews/', views.review_list, name='review-list'),
     path('reviews/top/', views.top_reviews_by_property_type, name='top-reviews-by-property-type'),
     path('reviews/<int:pk>/', views.review_detail, name='review-detail'),
@@ -23,7 +24,9 @@ urlpatterns = [
     path('images/<int:pk>/', views.image_detail, name='image-detail'),
     path('room/images/upload/', views.room_image_upload, name='room-image-upload'),
     path('search/<str:location>/', views.search_properties_by_location, name='search-properties-by-location'),
+    path('autocomplete/', views.autocomplete, name='autocomplete'),
     path('public/search/', views.public_search_properties, name='public-search-properties'),
+    path('quote/', views.quote, name='quote'),
     path('city/', views.list_cities, name='list-cities'),
     path('country/', views.list_countries, name='list-countries'),
     path('state/', views.list_states, name='list-states'),
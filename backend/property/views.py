@@ -2,7 +2,11 @@ from rest_framework.decorators import api_view, parser_classes, permission_class
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 import logging
+from decimal import Decimal, InvalidOperation
+from datetime import date, timedelta
+from django.utils import timezone
 from .models import (
     Property,
     Amenity,
@@ -23,6 +27,16 @@ from .models import (
     SitePage,
     SitePageImage,
 )
+from .inventory import rooms_with_free_inventory
+from .documents import get_property_document, user_has_favorite
+from .autocomplete import KINDS as AUTOCOMPLETE_KINDS, get_autocomplete_index
+from .geo import DEFAULT_RADIUS_KM, MAX_RADIUS_KM, nearest_property_ids
+from .search import rank_property_ids, search_index, search_property_ids
+from .pricing import quote_stays
+from .settings_registry import settings_registry
+from backend.response_cache import cached_json_response
+from backend.pagination import KeysetPagination, RankedPagination, apply_sparse_fieldset
+from .queries import property_view_queryset, property_view_prefetches, favorite_property_ids
 from .serializers import (
     PropertySerializer,
     AmenitySerializer,
@@ -44,6 +58,7 @@ from .serializers import (
     ImageCategorySerializer,
     SitePageSerializer,
     SitePageImageSerializer,
+    QuoteStaySerializer,
 )
 
 from users.models import HsUser
@@ -63,10 +78,10 @@ logger = logging.getLogger("property")
 def amenity_list(request):
     logger.info(f"amenity_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == "GET":
-        amenities = Amenity.objects.all()
-        serializer = AmenitySerializer(amenities, many=True)
-        logger.info(f"Retrieved {len(serializer.data)} amenities", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return cached_json_response(
+            request, "amenities", [Amenity],
+            lambda: AmenitySerializer(Amenity.objects.all(), many=True).data,
+        )
     elif request.method == "POST":
         serializer = AmenitySerializer(data=request.data)
         if serializer.is_valid():
@@ -111,10 +126,10 @@ def amenity_detail(request, pk):
 def rule_list(request):
     logger.info(f"rule_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == "GET":
-        rules = Rule.objects.all()
-        serializer = RuleSerializer(rules, many=True)
-        logger.info(f"Retrieved {len(serializer.data)} rules", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return cached_json_response(
+            request, "rules", [Rule],
+            lambda: RuleSerializer(Rule.objects.all(), many=True).data,
+        )
     elif request.method == "POST":
         serializer = RuleSerializer(data=request.data)
         if serializer.is_valid():
@@ -155,10 +170,10 @@ def rule_detail(request, pk):
 def documentation_list(request):
     logger.info(f"documentation_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == "GET":
-        documentations = Documentation.objects.all()
-        serializer = DocumentationSerializer(documentations, many=True)
-        logger.info(f"Retrieved {len(serializer.data)} documentations", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return cached_json_response(
+            request, "documentations", [Documentation],
+            lambda: DocumentationSerializer(Documentation.objects.all(), many=True).data,
+        )
     elif request.method == "POST":
         serializer = DocumentationSerializer(data=request.data)
         if serializer.is_valid():
@@ -201,10 +216,10 @@ def documentation_detail(request, pk):
 def image_category_list(request):
     logger.info(f"image_category_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == "GET":
-        categories = ImageCategory.objects.all()
-        serializer = ImageCategorySerializer(categories, many=True)
-        logger.info(f"Retrieved {len(serializer.data)} image categories", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return cached_json_response(
+            request, "image-categories", [ImageCategory],
+            lambda: ImageCategorySerializer(ImageCategory.objects.all(), many=True).data,
+        )
     elif request.method == "POST":
         serializer = ImageCategorySerializer(data=request.data)
         if serializer.is_valid():
@@ -321,9 +336,10 @@ def property_list(request):
         if rooms:
             try:
                 rooms = int(rooms)
-                # Filter properties with rooms that have enough available rooms
+                # Filter properties with rooms that have enough rooms free tonight
+                today = timezone.localdate()
                 properties = properties.filter(
-                    rooms__left_number_of_rooms__gte=rooms
+                    rooms__in=rooms_with_free_inventory(today, today + timedelta(days=1), rooms)
                 )
             except ValueError:
                 pass
@@ -362,7 +378,7 @@ def property_list(request):
                 pass
 
         serializer = PropertyViewSerializer(
-            properties, 
+            property_view_queryset(properties),
             many=True, 
             context={"request": request}
         )
@@ -387,7 +403,7 @@ def get_all_properties(request):
     """
     logger.info("get_all_properties called", extra={"request_method": request.method})
     try:
-        properties = Property.objects.all().distinct()
+        properties = property_view_queryset(Property.objects.all().distinct())
         serializer = PropertyViewSerializer(properties, many=True, context={"request": request})
         logger.info(f"Retrieved {len(serializer.data)} properties", extra={"request_method": request.method, "count": len(serializer.data)})
         return Response(serializer.data)
@@ -407,8 +423,7 @@ def get_user_properties(request):
     logger.info("get_user_properties called", extra={"request_method": request.method, "user_id": request.user.id if hasattr(request.user, 'id') else None})
     try:
         user = request.user
-        user_properties = UserProperty.objects.filter(user=user, is_active=True).values_list('property_id', flat=True)
-        properties = Property.objects.filter(id__in=user_properties)
+        properties = property_view_queryset(Property.objects.filter(id__in=request.principal.property_ids))
         serializer = PropertyViewSerializer(properties, many=True)
         logger.info(f"Retrieved {len(serializer.data)} properties for user {user.id}", extra={"request_method": request.method, "user_id": user.id, "count": len(serializer.data)})
         return Response(serializer.data)
@@ -525,12 +540,16 @@ def add_properties_to_user(request):
 )
 def property_detail(request, pk):
     logger.info(f"property_detail called with method {request.method} for pk {pk}", extra={"request_method": request.method, "pk": pk})
-    property = get_object_or_404(Property, pk=pk)
     if request.method == "GET":
-        serializer = PropertyViewSerializer(property, context={"request": request})
+        # Shared cached document (property.documents) with the caller's favourite flag on top
+        document = get_property_document(pk)
+        if document is None:
+            return Response({"detail": "No Property matches the given query."}, status=status.HTTP_404_NOT_FOUND)
+        document["is_favorite"] = user_has_favorite(request.user, pk)
         logger.info(f"Retrieved property {pk}", extra={"request_method": request.method, "pk": pk})
-        return Response(serializer.data)
-    elif request.method == "PUT":
+        return Response(document)
+    property = get_object_or_404(Property, pk=pk)
+    if request.method == "PUT":
         serializer = PropertySerializer(property, data=request.data)
         if serializer.is_valid():
             serializer.save()
@@ -549,10 +568,12 @@ def property_detail(request, pk):
 def review_list(request):
     logger.info(f"review_list called with method {request.method}", extra={"request_method": request.method})
     if request.method == "GET":
-        reviews = Review.objects.all()
-        serializer = ReviewSerializer(reviews, many=True)
+        reviews = Review.objects.select_related('user').prefetch_related('images')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(reviews, request)
+        serializer = apply_sparse_fieldset(ReviewSerializer(page, many=True), request)
         logger.info(f"Retrieved {len(serializer.data)} reviews", extra={"request_method": request.method, "count": len(serializer.data)})
-        return Response(serializer.data)
+        return paginator.get_paginated_response(serializer.data)
     elif request.method == "POST":
         serializer = ReviewSerializer(data=request.data)
         if serializer.is_valid():
@@ -563,6 +584,26 @@ def review_list(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["GET"])
+@custom_authentication_and_permissions(
+    exempt_get_views=[r"^/api/property/properties/\d+/reviews/?$"]
+)
+def property_reviews(request, pk):
+    """
+    Active reviews of one property, newest first, keyset paginated. Property
+    documents only embed the latest few; ratings come from its review summary.
+    """
+    logger.info(f"property_reviews called for property {pk}", extra={"request_method": request.method, "pk": pk})
+    if not Property.objects.filter(pk=pk).exists():
+        return Response({"detail": "No Property matches the given query."}, status=status.HTTP_404_NOT_FOUND)
+    reviews = Review.objects.filter(property_id=pk, is_active=True).select_related('user').prefetch_related('images')
+    paginator = KeysetPagination()
+    page = paginator.paginate_queryset(reviews, request)
+    serializer = apply_sparse_fieldset(ReviewSerializer(page, many=True), request)
+    logger.info(f"Retrieved {len(page)} reviews of property {pk}", extra={"request_method": request.method, "pk": pk, "count": len(page)})
+    return paginator.get_paginated_response(serializer.data)
+
+
 @api_view(["GET"])
 @custom_authentication_and_permissions(
     exempt_get_views=[r"^/api/property/reviews/top/?$"]
@@ -598,6 +639,7 @@ def top_reviews_by_property_type(request):
             property__property_type__iexact=normalized_type, is_active=True
         )
         .select_related("property", "user")
+        .prefetch_related("images")
         .order_by("-rating", "-created_at")[:limit_param]
     )
 
@@ -760,16 +802,32 @@ def search_properties_by_location(request, location):
     Returns a maximum of 5 properties matching the location.
     """
     logger.info(f"search_properties_by_location called with location: {location}", extra={"request_method": request.method, "location": location})
-    # Filter properties by location, limit to 5 results
-    if not location:
-        cities = City.objects.all().order_by('name')[:4]
-    else:
-        cities = City.objects.filter(name__icontains=location).order_by('name')[:4]
+    # Cities with a word starting with location, most listings first, from the in-memory index
+    cities = get_autocomplete_index().complete(location, kinds=("city",), limit=4)
+    data = [city.data for city in cities]
+    logger.info(f"Found {len(data)} cities for location: {location}", extra={"request_method": request.method, "location": location, "count": len(data)})
+    return Response(data, status=status.HTTP_200_OK)
 
-    # Serialize the results
-    serializer = CitySerializer(cities, many=True)
-    logger.info(f"Found {len(serializer.data)} cities for location: {location}", extra={"request_method": request.method, "location": location, "count": len(serializer.data)})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+
+@api_view(["GET"])
+@custom_authentication_and_permissions(exempt_get_views=[r"^/api/property/autocomplete/?$"])
+def autocomplete(request):
+    """
+    Typeahead suggestions for ``?q=``: cities, states, areas and property
+    names with a word starting with q, most listings first. ``?types=`` (a
+    comma separated subset of city,state,area,property) and ``?limit=``
+    (at most 20, default 8) narrow the answer.
+    """
+    text = request.query_params.get("q", "")
+    kinds = [kind for kind in request.query_params.get("types", "").split(",") if kind in AUTOCOMPLETE_KINDS]
+    try:
+        limit = min(max(int(request.query_params.get("limit", 8)), 1), 20)
+    except ValueError:
+        return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+    index = get_autocomplete_index()
+    suggestions = [index.as_dict(suggestion) for suggestion in index.complete(text, kinds=kinds, limit=limit)]
+    logger.debug(f"autocomplete found {len(suggestions)} suggestions for {text!r}", extra={"request_method": request.method, "count": len(suggestions)})
+    return Response(suggestions, status=status.HTTP_200_OK)
 
 
 @api_view(["GET"])
@@ -781,59 +839,107 @@ def list_cities(request):
     Returns a maximum of 5 properties matching the location.
     """
     logger.info("list_cities called", extra={"request_method": request.method})
-    cities = City.objects.all().order_by('name')
-    # Serialize the results
-    serializer = CitySerializer(cities, many=True)
-    logger.info(f"Retrieved {len(serializer.data)} cities", extra={"request_method": request.method, "count": len(serializer.data)})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return cached_json_response(
+        request, "cities", [City],
+        lambda: CitySerializer(City.objects.all().order_by('name'), many=True).data,
+    )
 
 
 @api_view(["GET"])
 @custom_authentication_and_permissions(exempt_get_views=[r"^/api/property/countries/$"])
 def list_countries(request):
     logger.info("list_countries called", extra={"request_method": request.method})
-    countries = Country.objects.all().order_by('name')
-    serializer = CountrySerializer(countries, many=True)
-    logger.info(f"Retrieved {len(serializer.data)} countries", extra={"request_method": request.method, "count": len(serializer.data)})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return cached_json_response(
+        request, "countries", [Country],
+        lambda: CountrySerializer(Country.objects.all().order_by('name'), many=True).data,
+    )
 
 
 @api_view(["GET"])
 @custom_authentication_and_permissions(exempt_get_views=[r"^/api/property/states/$"])
 def list_states(request):
     logger.info("list_states called", extra={"request_method": request.method})
-    states = State.objects.all().order_by('name')
-    serializer = StateSerializer(states, many=True)
-    logger.info(f"Retrieved {len(serializer.data)} states", extra={"request_method": request.method, "count": len(serializer.data)})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    return cached_json_response(
+        request, "states", [State],
+        lambda: StateSerializer(State.objects.all().order_by('name'), many=True).data,
+    )
 
 
 @api_view(["GET"])
 @custom_authentication_and_permissions(exempt_get_views=[r"^/api/property/areas/[a-zA-Z0-9_-]+/?$"])
 def unique_areas_by_city(request, city_name):
     logger.info(f"unique_areas_by_city called for city: {city_name}", extra={"request_method": request.method, "city_name": city_name})
-    # Get the city object or return a 404 if it doesn't exist
-    city = get_object_or_404(City, name__iexact=city_name)
-
-    # Query for unique areas associated with properties in the specified city
-    unique_areas = Property.objects.filter(city=city).values_list('area', flat=True).distinct()
-    areas_list = list(unique_areas)
+    # Areas of the city from the in-memory autocomplete index, most listings first
+    areas_list = get_autocomplete_index().areas(city_name)
+    if areas_list is None:
+        return Response({"detail": "No City matches the given query."}, status=status.HTTP_404_NOT_FOUND)
     logger.info(f"Found {len(areas_list)} unique areas for city: {city_name}", extra={"request_method": request.method, "city_name": city_name, "count": len(areas_list)})
     # Return the unique areas as a JSON response
     return Response({"unique_areas": areas_list}, status=status.HTTP_200_OK)
 
 
+def _stay_dates(checkin, checkout):
+    """Parse the search stay dates; raises ValidationError (400) on bad input."""
+    if not checkin:
+        if checkout:
+            raise ValidationError({"checkin": "checkin is required with checkout"})
+        return None, None
+    try:
+        checkin = date.fromisoformat(checkin)
+        checkout = date.fromisoformat(checkout) if checkout else checkin + timedelta(days=1)
+    except ValueError:
+        raise ValidationError({"error": "Invalid date format. Use YYYY-MM-DD"})
+    if checkout <= checkin:
+        raise ValidationError({"checkout": "checkout must be after checkin"})
+    return checkin, checkout
+
+
+def _geo_area(query_params):
+    """
+    ``(origin, radius_km, box)`` for nearest_property_ids from the lat/lng,
+    radius_km and bbox parameters, or None without them.
+    """
+    lat, lng, radius_km, bbox = (query_params.get(name) for name in ("lat", "lng", "radius_km", "bbox"))
+    if not (lat or lng or bbox):
+        return None
+    try:
+        box = None
+        if bbox:
+            south, west, north, east = (float(value) for value in bbox.split(","))
+            if south > north or west > east:
+                raise ValueError
+            box = (south, west, north, east)
+        if lat or lng:
+            origin = (float(lat), float(lng))
+        else:
+            origin = ((box[0] + box[2]) / 2, (box[1] + box[3]) / 2)
+        radius_km = float(radius_km) if radius_km else (None if box else DEFAULT_RADIUS_KM)
+    except (TypeError, ValueError):
+        raise ValidationError({"error": "lat/lng/radius_km must be numbers and bbox must be south,west,north,east"})
+    if not (-90 <= origin[0] <= 90 and -180 <= origin[1] <= 180):
+        raise ValidationError({"error": "lat must be within [-90, 90] and lng within [-180, 180]"})
+    if radius_km is not None and not 0 < radius_km <= MAX_RADIUS_KM:
+        raise ValidationError({"radius_km": f"radius_km must be greater than 0 and at most {MAX_RADIUS_KM}"})
+    return origin, radius_km, box
+
+
 @api_view(["GET"])
 def public_search_properties(request):
     """
     Public API endpoint for searching properties - does not require authentication.
     Accepts query parameters: propertyType, rooms, guests, location, area, price, etc.
+    checkin/checkout (YYYY-MM-DD) keep only properties with enough free rooms
+    for every night of the stay; checkout defaults to the next day.
+    lat/lng with radius_km (default 10), or bbox=south,west,north,east, keep
+    nearby properties, nearest first, each with a distance_km.
+    q is a full-text query over name, location, amenities and description,
+    ranked by relevance (returned per result) and tolerant of misspelt
+    city and area names.
     Also add is_favorite parameter to add or remove a property from the user's favorite list.
     """
     query_snapshot = request.GET.dict()
     logger.info("Public property search requested", extra={"query_params": query_snapshot, "request_method": request.method})
     try:
-        properties = Property.objects.all().distinct()
         query_params = request.GET
 
         # Extract filters
@@ -845,96 +951,85 @@ def public_search_properties(request):
         price = query_params.get("price")
         id = query_params.get("id")
         booking_type = query_params.get("bookingType")
+        checkin, checkout = _stay_dates(query_params.get("checkin"), query_params.get("checkout"))
+        geo = _geo_area(query_params)
+        q = query_params.get("q")
 
-        # Apply filters
-        if property_type and property_type != 'all':
-            properties = properties.filter(
-                property_type__iexact=property_type
-            )
-
-        if rooms:
-            try:
-                rooms = int(rooms)
-                # Filter properties with rooms that have enough available rooms
-                properties = properties.filter(
-                    rooms__number_of_rooms__gte=rooms
-                )
-            except ValueError:
-                pass
+        try:
+            rooms = int(rooms) if rooms else None
+        except ValueError:
+            rooms = None
 
+        guests_per_room = None
         if guests:
             try:
-                guests = int(guests)
-                # Filter properties with rooms that can accommodate guests
                 # guests should be guests divided by number of rooms
-                guests = guests / rooms
-                properties = properties.filter(
-                    rooms__maxoccupancy__gte=guests
-                )
+                guests_per_room = int(guests) / rooms if rooms else int(guests)
             except ValueError:
                 pass
 
-        if location:
-            # Search across city, state, and country names
-            properties = properties.filter(
-                Q(city__name__icontains=location) |
-                Q(state__name__icontains=location) |
-                Q(country__name__icontains=location) |
-                Q(location__icontains=location) # Also search directly in location field
-            )
-
-        if area:
-            properties = properties.filter(
-                area__icontains=area
-            )
-
-        if price:
-            try:
-                price = float(price)
-                # Filter properties with rooms under price limit
-                properties = properties.filter(
-                    rooms__price__lte=price
-                )
-            except ValueError:
-                pass
-
-        if booking_type:
-            if booking_type == 'monthly':
-                properties = properties.filter(
-                    rooms__monthly_rate__gt=0
-                )
-            elif booking_type == 'yearly':
-                properties = properties.filter(
-                    rooms__yearly_rate__gt=0
-                )
-            else:
-                properties = properties.filter(
-                    Q(rooms__daily_rate__gt=0) |
-                    Q(rooms__monthly_rate__gt=0)
-                )
-
-        results_count = properties.count()
+        try:
+            price = Decimal(price) if price else None
+        except InvalidOperation:
+            price = None
+
+        # All filters run against the denormalized PropertySearchIndex
+        filters = dict(
+            property_type=property_type,
+            rooms=rooms,
+            guests_per_room=guests_per_room,
+            location=location,
+            area=area,
+            price=price,
+            booking_type=booking_type,
+            checkin=checkin,
+            checkout=checkout,
+        )
 
         # Add context with user favorites information if the user is authenticated
         context = {"request": request}
         if id:
-            user_favorites = FavoriteProperty.objects.filter(
-                user_id=id,
-                is_active=True
-            ).values_list('property_id', flat=True)
-
-            context['user_favorites'] = user_favorites
-            
-        serializer = PropertyViewSerializer(
-            properties, 
-            many=True, 
-            context=context
-        )
+            context['user_favorites'] = favorite_property_ids(id)
+
+        # q ranks by relevance; with lat/lng or bbox as well it only filters
+        # and results come nearest first
+        ranked, rank_field = None, None
+        if q:
+            ranked, rank_field = rank_property_ids(q, search_index(**filters)), "relevance"
+        if geo:
+            index = search_index(**filters)
+            if ranked is not None:
+                index = index.filter(property_id__in=[pk for _, pk in ranked])
+            ranked, rank_field = nearest_property_ids(index, *geo), "distance_km"
+
+        if ranked is not None:
+            paginator = RankedPagination()
+            ranked = paginator.paginate_ranked(ranked, request)
+            by_id = property_view_queryset(Property.objects.filter(id__in=[pk for _, pk in ranked]), reviews=False).in_bulk()
+            ranked = [(rank, by_id[pk]) for rank, pk in ranked if pk in by_id]
+            page = [prop for _, prop in ranked]
+        else:
+            paginator = KeysetPagination()
+            page = paginator.paginate_queryset(
+                property_view_queryset(Property.objects.filter(id__in=search_property_ids(**filters)), reviews=False),
+                request
+            )
+        serializer = PropertyViewSerializer(page, many=True, context=context)
+        # Cards show the review summary; reviews are paged from /properties/<id>/reviews/
+        serializer.child.fields.pop('reviews')
+        serializer = apply_sparse_fieldset(serializer, request)
+        data = serializer.data
+        if ranked is not None:
+            # Relevance is ranked as a negative score so the best sorts first
+            for item, (rank, _) in zip(data, ranked):
+                item[rank_field] = round(abs(rank), 3)
         logger.info(
             "Public property search completed",
-            extra={"query_params": query_snapshot, "results": results_count, "request_method": request.method}
+            extra={"query_params": query_snapshot, "results": len(page), "request_method": request.method}
         )
-        return Response(serializer.data)
+        return paginator.get_paginated_response(data)
+    except ValidationError:
+        raise
     except Exception as e:
         logger.exception(
             "Error in public property search",
@@ -946,6 +1041,45 @@ def public_search_properties(request):
         )
     
 
+@api_view(["POST"])
+def quote(request):
+    """
+    Price a batch of stays in one pass (property.pricing).
+      Body: { "stays": [{ "room": 1, "property": 2, "checkin": "2025-01-10T12:00:00Z",
+              "checkout": "2025-01-12T11:00:00Z", "booking_time": "daily",
+              "rooms": 1, "guests": 2, "code": "WELCOME10" }, ...] }
+      Returns { "quotes": [...] } in the same order; a stay that cannot be
+      priced gets { "room", "error" } instead of its breakdown.
+    """
+    stays = request.data.get("stays") if isinstance(request.data, dict) else None
+    logger.info(f"quote called with {len(stays) if isinstance(stays, list) else 0} stays", extra={"request_method": request.method})
+    if not isinstance(stays, list) or not stays:
+        return Response({"error": "stays must be a non-empty list"}, status=status.HTTP_400_BAD_REQUEST)
+    if len(stays) > settings.QUOTE_MAX_STAYS:
+        return Response(
+            {"error": f"At most {settings.QUOTE_MAX_STAYS} stays can be quoted at once"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    parsed, errors = [], {}
+    for position, stay in enumerate(stays):
+        serializer = QuoteStaySerializer(data=stay if isinstance(stay, dict) else {})
+        if serializer.is_valid():
+            parsed.append(serializer.to_stay())
+        else:
+            errors[position] = serializer.errors
+    if errors:
+        logger.warning(f"Invalid stays in quote request: {errors}", extra={"request_method": request.method, "errors": errors})
+        return Response({"stays": errors}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        quotes = quote_stays(parsed)
+    except Exception as e:
+        logger.exception("Error pricing stays", extra={"request_method": request.method})
+        return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+    return Response({"quotes": quotes})
+
+
 @api_view(["POST"])
 @custom_authentication_and_permissions()
 def add_favorite_property(request):
@@ -979,7 +1113,9 @@ def get_favorite_properties(request):
     """
     user = request.user
     logger.info(f"get_favorite_properties called for user {user.id}", extra={"request_method": request.method, "user_id": user.id})
-    favorite_properties = FavoriteProperty.objects.filter(user=user, is_active=True)
+    favorite_properties = FavoriteProperty.objects.filter(user=user, is_active=True).select_related(
+        "property__city", "property__state", "property__country", "property__review_summary"
+    ).prefetch_related(*property_view_prefetches("property__"))
     serializer = FavoritePropertySerializer(favorite_properties, many=True, context={"request": request})
     logger.info(f"Retrieved {len(serializer.data)} favorite properties for user {user.id}", extra={"request_method": request.method, "user_id": user.id, "count": len(serializer.data)})
     return Response(serializer.data)
@@ -1126,10 +1262,12 @@ def settings_list(request):
     Get all settings (no authentication required for reading)
     """
     logger.info("settings_list called", extra={"request_method": request.method})
-    settings = Setting.objects.filter(is_active=True)
-    settings_dict = {setting.key: setting.value for setting in settings}
-    logger.info(f"Retrieved {len(settings_dict)} settings", extra={"request_method": request.method, "count": len(settings_dict)})
-    return Response(settings_dict)
+    # Built from the database: the cached body is keyed by the current
+    # Setting version, which the registry may not have caught up with yet
+    return cached_json_response(
+        request, "settings", [Setting],
+        lambda: dict(Setting.objects.filter(is_active=True).values_list("key", "value")),
+    )
 
 
 @api_view(["GET", "PUT"])
@@ -1140,6 +1278,10 @@ def settings_detail(request, key):
     """
     logger.info(f"settings_detail called with method {request.method} for key {key}", extra={"request_method": request.method, "key": key})
     try:
+        if request.method == "GET" and settings_registry.get(key) is not None:
+            logger.info(f"Retrieved setting {key}", extra={"request_method": request.method, "key": key})
+            return Response({"key": key, "value": settings_registry.get(key), "description": settings_registry.get_description(key)})
+
         setting = Setting.objects.get(key=key)
         
         if request.method == "GET":
@@ -0,0 +1,255 @@
+"""
+Streaming pipeline for the stats report exports.
+
+Reports are described as a list of Sheets. Detail sheets iterate a
+``values()`` queryset in chunks and summary sheets are fed by GroupTotals
+accumulators filled while the detail rows stream past, so no report ever
+holds its rows in memory. Workbooks are written with xlsxwriter's
+``constant_memory`` mode into a temporary file that is streamed back with a
+FileResponse; ``?file_type=csv`` streams the first sheet as CSV instead.
+"""
+import csv
+import tempfile
+from collections import Counter
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+import xlsxwriter
+from django.http import FileResponse, StreamingHttpResponse
+from django.utils import timezone
+
+from property.models import Setting
+
+EXPORT_CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+HEADER_FORMAT = {'bold': True, 'bg_color': '#D7E4BC', 'border': 1}
+
+BOOKING_EXPORT_FIELDS = (
+    'id', 'booking_id', 'created_at', 'updated_at', 'checkin_date', 'checkout_date',
+    'status', 'booking_type', 'booking_time', 'payment_type', 'price', 'discount',
+    'number_of_guests', 'number_of_rooms',
+    'property_id', 'property__name', 'property__property_type',
+    'user_id', 'user__name', 'user__mobile', 'user__email',
+)
+
+
+class Sheet:
+    """
+    One worksheet: its name, header row and rows. ``rows`` is an iterable of
+    row sequences, or a callable returning one; callables are only invoked
+    when the sheet is written, after every earlier sheet has been consumed.
+    """
+
+    def __init__(self, name, columns, rows):
+        self.name = name
+        self.columns = list(columns)
+        self.rows = rows
+
+    def iter_rows(self):
+        return self.rows() if callable(self.rows) else iter(self.rows)
+
+
+class GroupTotals:
+    """
+    Running per-group aggregates, the streaming counterpart of
+    ``df.groupby(keys).agg(...)``. Each aggregate is one of ``'sum'``,
+    ``'count'``, ``'mean'``, ``'first'``, ``'nunique'`` or ``'mode'``;
+    ``add`` takes one value per aggregate.
+    """
+
+    def __init__(self, *aggregates):
+        self.aggregates = aggregates
+        self.groups = {}
+
+    def add(self, key, *values):
+        if not isinstance(key, tuple):
+            key = (key,)
+        state = self.groups.get(key)
+        if state is None:
+            state = self.groups[key] = [_initial(how) for how in self.aggregates]
+        for i, (how, value) in enumerate(zip(self.aggregates, values)):
+            if how == 'sum':
+                state[i] += value or 0
+            elif how == 'count':
+                state[i] += 1
+            elif how == 'mean':
+                state[i][0] += value or 0
+                state[i][1] += 1
+            elif how == 'first':
+                if state[i] is None:
+                    state[i] = value
+            elif how == 'nunique':
+                state[i].add(value)
+            else:
+                state[i][value] += 1
+
+    def __len__(self):
+        return len(self.groups)
+
+    def items(self):
+        """(key, aggregated values) pairs ordered by key."""
+        for key in sorted(self.groups, key=_sort_key):
+            yield key, [_result(how, value) for how, value in zip(self.aggregates, self.groups[key])]
+
+    def rows(self):
+        for key, values in self.items():
+            yield list(key) + values
+
+
+def _initial(how):
+    if how in ('sum', 'count'):
+        return 0
+    if how == 'mean':
+        return [0, 0]
+    if how == 'first':
+        return None
+    if how == 'nunique':
+        return set()
+    if how == 'mode':
+        return Counter()
+    raise ValueError(f"Unknown aggregate: {how}")
+
+
+def _result(how, value):
+    if how == 'mean':
+        return value[0] / value[1] if value[1] else 0
+    if how == 'nunique':
+        return len(value)
+    if how == 'mode':
+        # Most frequent value, ties broken by the smallest, as pandas' mode()[0]
+        top = max(value.values())
+        return min((v for v, n in value.items() if n == top), key=_sort_key)
+    return value
+
+
+def _sort_key(key):
+    # Groups with a missing value sort after the rest instead of failing to compare
+    if not isinstance(key, tuple):
+        key = (key,)
+    return tuple((value is None, value if value is not None else '') for value in key)
+
+
+def created_at_range(start_date, end_date):
+    """
+    Filter kwargs selecting rows created on [start_date, end_date] as an
+    indexable range on ``created_at`` rather than a ``created_at__date``
+    lookup.
+    """
+    return {
+        'created_at__gte': timezone.make_aware(datetime.combine(start_date, time.min)),
+        'created_at__lt': timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min)),
+    }
+
+
+class TaxSlabs:
+    """
+    The GST slabs of ``Setting.get_dynamic_tax_rate``, resolved once per
+    report so each row is taxed with two Decimal comparisons.
+    """
+
+    def __init__(self):
+        self.threshold = Setting.TAX_SLAB_THRESHOLD
+        self.low_rate = Setting.TAX_RATE_LOW
+        self.high_rate = Setting.TAX_RATE_HIGH
+
+    def rate(self, taxable_amount):
+        if taxable_amount <= 0:
+            return Decimal('0')
+        return self.low_rate if taxable_amount < self.threshold else self.high_rate
+
+    def taxed_amounts(self, price, discount):
+        """(taxable amount, tax rate, tax amount) of a booking's price and discount."""
+        taxable_amount = Decimal(str(price or 0)) - Decimal(str(discount or 0))
+        tax_rate = self.rate(taxable_amount)
+        return taxable_amount, tax_rate, taxable_amount * tax_rate
+
+
+def iter_values(queryset, *fields):
+    """Stream ``queryset`` as ``values()`` dicts, ``EXPORT_CHUNK_SIZE`` rows per fetch."""
+    return queryset.values(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def customer_label(row, prefix='user__'):
+    return row[f'{prefix}name'] or row[f'{prefix}mobile']
+
+
+def write_workbook(output, sheets):
+    """Write ``sheets`` to ``output`` (a path or binary file) as a constant-memory workbook."""
+    workbook = xlsxwriter.Workbook(output, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd',
+    })
+    header_format = workbook.add_format(HEADER_FORMAT)
+    for sheet in sheets:
+        worksheet = workbook.add_worksheet(sheet.name)
+        worksheet.set_column('A:Z', 15)
+        worksheet.write_row(0, 0, sheet.columns, header_format)
+        for row_num, row in enumerate(sheet.iter_rows(), start=1):
+            worksheet.write_row(row_num, 0, row)
+    workbook.close()
+
+
+def write_csv(output, sheet):
+    """Write ``sheet`` to the text file ``output`` as CSV."""
+    writer = csv.writer(output)
+    writer.writerow(sheet.columns)
+    for row in sheet.iter_rows():
+        writer.writerow(_csv_row(row))
+
+
+def write_pdf(output, title, sheets):
+    """Write ``sheets`` to the binary file ``output`` as a PDF with one section per sheet."""
+    from .reports import generate_multi_sheet_pdf
+
+    sheets_data = {
+        sheet.name: [sheet.columns] + [_csv_row(row) for row in sheet.iter_rows()]
+        for sheet in sheets
+    }
+    output.write(generate_multi_sheet_pdf(title, sheets_data, f"{title}.pdf").content)
+
+
+def _csv_row(row):
+    return ['' if value is None else value for value in row]
+
+
+def xlsx_response(filename, sheets):
+    """Write ``sheets`` to a temporary workbook and stream it back."""
+    output = tempfile.TemporaryFile()
+    try:
+        write_workbook(output, sheets)
+        output.seek(0)
+    except Exception:
+        output.close()
+        raise
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+
+class _Echo:
+    """File-like object whose ``write`` hands the line back to csv.writer's caller."""
+
+    def write(self, value):
+        return value
+
+
+def csv_response(filename, sheet):
+    """Stream ``sheet`` as CSV, one row at a time."""
+    writer = csv.writer(_Echo())
+
+    def stream():
+        yield writer.writerow(sheet.columns)
+        for row in sheet.iter_rows():
+            yield writer.writerow(_csv_row(row))
+
+    response = StreamingHttpResponse(stream(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def export_response(request, name, sheets):
+    """
+    Stream the report ``sheets`` as ``<name>.xlsx``, or only its first
+    sheet as ``<name>.csv`` when the request asks for ``?file_type=csv``.
+    """
+    if request.query_params.get('file_type') == 'csv':
+        return csv_response(f"{name}.csv", sheets[0])
+    return xlsx_response(f"{name}.xlsx", sheets)
@@ -0,0 +1,168 @@
+import io
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from booking.models import Booking
+from property.models import Property
+from stats.exports import write_csv, write_workbook
+from stats.report_builders import REPORT_BUILDERS, NoReportData
+from users.models import HsUser
+
+SEED_BATCH_SIZE = 5000
+
+
+def write_streaming(sheets, file_type):
+    """The current export: rows stream into a temporary file. Returns the bytes written."""
+    if file_type == "csv":
+        with tempfile.TemporaryFile("w+", newline="") as output:
+            write_csv(output, sheets[0])
+            return output.tell()
+    with tempfile.TemporaryFile() as output:
+        write_workbook(output, sheets)
+        return output.tell()
+
+
+def write_pandas(sheets, file_type):
+    """
+    The export as it was before streaming: every sheet is collected into a
+    list of dicts, turned into a DataFrame and written to an in-memory
+    buffer. Returns the bytes written.
+    """
+    import pandas as pd
+
+    frames = [
+        (sheet.name, pd.DataFrame([dict(zip(sheet.columns, row)) for row in sheet.iter_rows()], columns=sheet.columns))
+        for sheet in sheets
+    ]
+    if file_type == "csv":
+        return len(frames[0][1].to_csv(index=False).encode())
+    output = io.BytesIO()
+    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+        for name, frame in frames:
+            frame.to_excel(writer, sheet_name=name, index=False)
+    return len(output.getvalue())
+
+
+WRITERS = {"streaming": write_streaming, "pandas": write_pandas}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the duration and peak Python memory of one report export written by the "
+        "streaming pipeline and by the previous pandas DataFrame export. "
+        "With --seed, synthetic bookings are inserted first and rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--report", default="sales", choices=sorted(REPORT_BUILDERS))
+        parser.add_argument("--file-type", default="xlsx", choices=["xlsx", "csv"])
+        parser.add_argument("--start-date", help="YYYY-MM-DD, default 365 days before --end-date.")
+        parser.add_argument("--end-date", help="YYYY-MM-DD, default today.")
+        parser.add_argument(
+            "--property",
+            type=int,
+            action="append",
+            dest="property_ids",
+            help="Only report on the given property id (can be repeated); default every active property.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Insert this many synthetic bookings in the range before measuring; they are rolled back.",
+        )
+        parser.add_argument(
+            "--writer",
+            action="append",
+            dest="writers",
+            choices=sorted(WRITERS),
+            help="Only measure the given writer (can be repeated); default both.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            end_date = datetime.strptime(options["end_date"], "%Y-%m-%d").date() if options["end_date"] else timezone.now().date()
+            start_date = (
+                datetime.strptime(options["start_date"], "%Y-%m-%d").date()
+                if options["start_date"] else end_date - timedelta(days=365)
+            )
+        except ValueError:
+            raise CommandError("Invalid date format. Use YYYY-MM-DD")
+        if start_date > end_date:
+            raise CommandError("--start-date must not be after --end-date")
+
+        with transaction.atomic():
+            property_ids = options["property_ids"]
+            if options["seed"]:
+                property_ids = [self.seed_bookings(options["seed"], start_date, end_date)]
+            elif not property_ids:
+                property_ids = list(Property.objects.filter(is_active=True).values_list("id", flat=True))
+            try:
+                for writer in options["writers"] or ["streaming", "pandas"]:
+                    self.measure(writer, options["report"], options["file_type"], property_ids, start_date, end_date)
+            finally:
+                # Never keep the synthetic rows, user and property
+                transaction.set_rollback(True)
+
+    def seed_bookings(self, count, start_date, end_date):
+        # A mobile no real user has; the rollback removes the user again
+        user = HsUser.objects.create(mobile=f"bench{uuid.uuid4().hex[:10]}", name="Report benchmark")
+        prop = Property.objects.create(name="Report benchmark", location="Benchmark")
+        start = timezone.make_aware(datetime.combine(start_date, datetime.min.time()))
+        span = int((end_date - start_date).days + 1) * 86400
+        statuses = ["pending", "confirmed", "checked_in", "completed", "cancelled"]
+        rng = random.Random(1)
+        for offset in range(0, count, SEED_BATCH_SIZE):
+            batch = []
+            for _ in range(min(SEED_BATCH_SIZE, count - offset)):
+                created_at = start + timedelta(seconds=rng.randrange(span))
+                checkin_date = created_at.date() + timedelta(days=rng.randint(0, 30))
+                batch.append(Booking(
+                    user=user,
+                    property=prop,
+                    checkin_date=checkin_date,
+                    checkout_date=checkin_date + timedelta(days=rng.randint(1, 7)),
+                    status=rng.choice(statuses),
+                    price=Decimal(rng.randint(500, 20000)),
+                    discount=Decimal(rng.randint(0, 50)),
+                    created_at=created_at,
+                ))
+            Booking.objects.bulk_create(batch)
+        self.stdout.write(f"Seeded {count} bookings for property {prop.id}")
+        return prop.id
+
+    def export(self, writer, report_type, file_type, property_ids, start_date, end_date):
+        try:
+            report_name, sheets = REPORT_BUILDERS[report_type](property_ids, start_date, end_date)
+        except NoReportData as e:
+            raise CommandError(e.message)
+        return report_name, WRITERS[writer](sheets, file_type)
+
+    def measure(self, writer, report_type, file_type, property_ids, start_date, end_date):
+        args = (writer, report_type, file_type, property_ids, start_date, end_date)
+        # Timed without tracing, which slows allocation-heavy code down
+        started = time.perf_counter()
+        report_name, size = self.export(*args)
+        elapsed = time.perf_counter() - started
+
+        # Only what the export allocates counts: tracing starts after seeding
+        # and numpy/pandas buffers are reported to tracemalloc as well
+        tracemalloc.start()
+        try:
+            self.export(*args)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        self.stdout.write(self.style.SUCCESS(
+            f"{writer}: {report_name}.{file_type}, {size / 1024:.0f} KiB written in {elapsed:.2f}s, "
+            f"peak memory {peak / 1024 / 1024:.1f} MiB"
+        ))
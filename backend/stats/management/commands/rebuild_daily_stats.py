@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from stats.rollups import rebuild_daily_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the DailyPropertyStats rollup table from bookings and expenses."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--property",
+            type=int,
+            action="append",
+            dest="property_ids",
+            help="Only rebuild the given property id (can be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        count = rebuild_daily_stats(options.get("property_ids"))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {count} daily stats rows"))
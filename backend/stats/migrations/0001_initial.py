@@ -0,0 +1,45 @@
+# Generated by Django 4.2.27 on 2026-10-18 18:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('property', '0031_keyset_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyPropertyStats',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('date', models.DateField()),
+                ('revenue_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('revenue_confirmed', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('revenue_completed', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('revenue_cancelled', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('revenue_pending', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('bookings_total', models.IntegerField(default=0)),
+                ('bookings_confirmed', models.IntegerField(default=0)),
+                ('bookings_completed', models.IntegerField(default=0)),
+                ('bookings_cancelled', models.IntegerField(default=0)),
+                ('bookings_pending', models.IntegerField(default=0)),
+                ('expense_total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('expense_by_category', models.JSONField(blank=True, default=dict)),
+                ('occupied_room_nights', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('property', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='property.property')),
+            ],
+            options={
+                'ordering': ['date', 'property'],
+                'indexes': [models.Index(fields=['date', 'property'], name='stats_daily_date_c60b78_idx')],
+                'unique_together': {('property', 'date')},
+            },
+        ),
+    ]
@@ -1,3 +1,46 @@
 from django.db import models
+from django.utils import timezone
+from property.models import Property
 
 # Create your models here.
+
+
+class DailyPropertyStats(models.Model):
+    """
+    Per property, per day rollup of bookings, expenses and occupancy.
+
+    Sales columns bucket active bookings by the day they were created,
+    expense columns bucket active expenses by their date and
+    ``occupied_room_nights`` counts rooms occupied that night by confirmed or
+    checked-in bookings. Rows are kept current by stats.signals and can be
+    rebuilt with ``python manage.py rebuild_daily_stats``.
+    """
+    id = models.AutoField(primary_key=True)
+    property = models.ForeignKey(Property, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    revenue_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    revenue_confirmed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    revenue_completed = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    revenue_cancelled = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    revenue_pending = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    bookings_total = models.IntegerField(default=0)
+    bookings_confirmed = models.IntegerField(default=0)
+    bookings_completed = models.IntegerField(default=0)
+    bookings_cancelled = models.IntegerField(default=0)
+    bookings_pending = models.IntegerField(default=0)
+    expense_total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # {"<expense category id or 'none'>": "<total>"}
+    expense_by_category = models.JSONField(default=dict, blank=True)
+    occupied_room_nights = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['date', 'property']
+        unique_together = ('property', 'date')
+        indexes = [
+            models.Index(fields=['date', 'property']),
+        ]
+
+    def __str__(self):
+        return f"{self.property_id} - {self.date}"
@@ -0,0 +1,110 @@
+"""
+Occupancy engine shared by the stats endpoints and reports.
+
+A booking occupies ``number_of_rooms`` rooms on every night d with
+checkin_date <= d < checkout_date while its status is one of
+OCCUPIED_STATUSES. Instead of aggregating bookings per property per day,
+the overlapping bookings are fetched once and accumulated into a
+(property x day) NumPy difference array whose running sum is the
+occupancy matrix.
+"""
+from datetime import timedelta
+
+import numpy as np
+from django.db.models import Sum
+
+from booking.models import Booking
+from property.models import Property
+
+OCCUPIED_STATUSES = ('confirmed', 'checked_in')
+
+
+class OccupancyMatrix:
+    """
+    Rooms occupied per property per day between ``start_date`` and
+    ``end_date`` (both inclusive).
+
+    ``occupied[i, j]`` is the number of rooms of ``property_ids[i]`` occupied
+    on ``dates[j]``; ``total_rooms[i]`` is that property's room inventory.
+    """
+
+    def __init__(self, property_ids, start_date, end_date, total_rooms, occupied):
+        self.property_ids = property_ids
+        self.start_date = start_date
+        self.end_date = end_date
+        self.total_rooms = total_rooms
+        self.occupied = occupied
+        self._row = {property_id: i for i, property_id in enumerate(property_ids)}
+
+    @property
+    def dates(self):
+        return [self.start_date + timedelta(days=i) for i in range(self.occupied.shape[1])]
+
+    def day_index(self, day):
+        index = (day - self.start_date).days
+        if index < 0 or index >= self.occupied.shape[1]:
+            raise KeyError(day)
+        return index
+
+    def occupied_on(self, day):
+        """Occupied rooms per property on ``day`` (aligned with property_ids)."""
+        return self.occupied[:, self.day_index(day)]
+
+    def total_rooms_for(self, property_id):
+        return int(self.total_rooms[self._row[property_id]])
+
+    def occupied_for(self, property_id, day):
+        return int(self.occupied[self._row[property_id], self.day_index(day)])
+
+    def occupancy_percentage(self):
+        """Per property, per day occupancy % (0 where a property has no rooms)."""
+        totals = self.total_rooms[:, None].astype(float)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(totals > 0, self.occupied / totals * 100, 0.0)
+        return pct
+
+
+def total_room_inventory(property_ids):
+    """Room inventory per property, aligned with ``property_ids``."""
+    totals = dict(
+        Property.objects.filter(id__in=property_ids)
+        .annotate(total=Sum('rooms__number_of_rooms'))
+        .values_list('id', 'total')
+    )
+    return np.array([totals.get(property_id) or 0 for property_id in property_ids], dtype=np.int64)
+
+
+def build_occupancy_matrix(property_ids, start_date, end_date):
+    """
+    Build the OccupancyMatrix for ``property_ids`` over [start_date, end_date]
+    with two queries: one for room inventory, one for overlapping bookings.
+    """
+    property_ids = list(property_ids)
+    days = max((end_date - start_date).days + 1, 0)
+    row = {property_id: i for i, property_id in enumerate(property_ids)}
+
+    diff = np.zeros((len(property_ids), days + 1), dtype=np.int64)
+    if property_ids and days:
+        bookings = Booking.objects.filter(
+            property_id__in=property_ids,
+            checkin_date__lte=end_date,
+            checkout_date__gt=start_date,
+            status__in=OCCUPIED_STATUSES,
+            is_active=True,
+        ).values_list('property_id', 'checkin_date', 'checkout_date', 'number_of_rooms')
+
+        rows, starts, ends, rooms = [], [], [], []
+        for property_id, checkin, checkout, number_of_rooms in bookings.iterator(chunk_size=2000):
+            rows.append(row[property_id])
+            starts.append(max((checkin - start_date).days, 0))
+            ends.append(min((checkout - start_date).days, days))
+            rooms.append(number_of_rooms or 0)
+
+        if rows:
+            rows = np.array(rows, dtype=np.int64)
+            rooms = np.array(rooms, dtype=np.int64)
+            np.add.at(diff, (rows, np.array(starts, dtype=np.int64)), rooms)
+            np.add.at(diff, (rows, np.array(ends, dtype=np.int64)), -rooms)
+
+    occupied = np.cumsum(diff, axis=1)[:, :days]
+    return OccupancyMatrix(property_ids, start_date, end_date, total_room_inventory(property_ids), occupied)
@@ -0,0 +1,672 @@
+"""
+Report definitions shared by the synchronous export endpoints and the
+report job worker.
+
+Each builder takes the property ids in scope and a date range and returns
+``(report_name, sheets)`` for ``stats.exports``; it raises NoReportData
+when the range has nothing to report.
+"""
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Sum
+from django.utils import timezone
+
+from booking.models import Booking
+from expenses.models import Expense
+from property.models import Property
+from .exports import (
+    BOOKING_EXPORT_FIELDS, GroupTotals, Sheet, created_at_range, customer_label,
+    TaxSlabs, iter_values,
+)
+from .occupancy import build_occupancy_matrix
+
+
+# Cache version bumped (stats.signals) whenever data the reports read changes
+REPORT_DATA_VERSION = 'stats-report-data'
+
+
+class NoReportData(Exception):
+    """The selected range has nothing to report."""
+
+    def __init__(self, message="No data found for the selected date range"):
+        super().__init__(message)
+        self.message = message
+
+
+def report_date_range(params):
+    """
+    (start_date, end_date) from ``start_date`` / ``end_date`` params,
+    defaulting to the first of the current month through today.
+    """
+    start_date_str = params.get('start_date')
+    end_date_str = params.get('end_date')
+    if not start_date_str:
+        start_date = timezone.now().date().replace(day=1)
+    else:
+        start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
+    if not end_date_str:
+        end_date = timezone.now().date()
+    else:
+        end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
+    return start_date, end_date
+
+
+def report_property_ids(principal, property_id=None):
+    """
+    Ids of the properties the user behind ``principal`` (users.principal)
+    may report on: every active property for admins, the user's own
+    properties otherwise, narrowed to ``property_id`` when one is given.
+    Raises ValueError when ``property_id`` is not an integer.
+    """
+    if property_id:
+        try:
+            property_id = int(property_id)
+        except (TypeError, ValueError):
+            raise ValueError("property_id must be an integer")
+    if principal.is_admin:
+        if property_id:
+            return [property_id]
+        return list(Property.objects.filter(is_active=True).values_list('id', flat=True))
+    if property_id:
+        return [property_id] if property_id in principal.property_ids else []
+    return principal.property_ids
+
+
+def _bookings(property_ids, start_date, end_date, **filters):
+    return Booking.objects.filter(
+        property_id__in=property_ids,
+        is_active=True,
+        **created_at_range(start_date, end_date),
+        **filters
+    )
+
+
+# Sales & expenses
+
+def build_sales_report(property_ids, start_date, end_date):
+    bookings = _bookings(property_ids, start_date, end_date).order_by('created_at')
+    if not bookings.exists():
+        raise NoReportData()
+
+    # Summaries accumulate while the detailed rows are written
+    daily_summary = GroupTotals('sum', 'count')
+    status_summary = GroupTotals('sum', 'count')
+    property_summary = GroupTotals('sum', 'count')
+
+    def booking_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            date = booking['created_at'].strftime('%Y-%m-%d')
+            amount = float(booking['price'])
+            discount = float(booking['discount'] or 0)
+            daily_summary.add(date, amount, booking['id'])
+            status_summary.add(booking['status'], amount, booking['id'])
+            property_summary.add((booking['property__name'], booking['property__property_type']), amount, booking['id'])
+            yield [
+                booking['id'],
+                date,
+                customer_label(booking),
+                booking['property__name'],
+                booking['property__property_type'],
+                booking['checkin_date'],
+                booking['checkout_date'],
+                booking['status'],
+                amount,
+                discount,
+                amount - discount,
+                booking['booking_type'],
+                booking['number_of_guests'],
+                booking['number_of_rooms'],
+            ]
+
+    return f"Sales_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed Bookings', ['Booking ID', 'Date', 'Customer', 'Property', 'Property Type', 'Checkin Date', 'Checkout Date', 'Status', 'Amount', 'Discount', 'Net Amount', 'Booking Type', 'Guests', 'Rooms'], booking_rows()),
+        Sheet('Daily Summary', ['Date', 'Total Amount', 'Number of Bookings'], daily_summary.rows),
+        Sheet('Booking Status', ['Status', 'Total Amount', 'Number of Bookings'], status_summary.rows),
+        Sheet('Property Summary', ['Property', 'Property Type', 'Total Amount', 'Number of Bookings'], property_summary.rows),
+    ]
+
+
+def build_expense_report(property_ids, start_date, end_date):
+    expenses = Expense.objects.filter(
+        property_id__in=property_ids,
+        date__gte=start_date,
+        date__lte=end_date,
+        is_active=True
+    ).order_by('date', 'id')
+    if not expenses.exists():
+        raise NoReportData()
+
+    daily_summary = GroupTotals('sum', 'count')
+    category_summary = GroupTotals('sum', 'count')
+    property_summary = GroupTotals('sum', 'count')
+
+    def expense_rows():
+        for expense in iter_values(expenses, 'id', 'date', 'description', 'amount', 'property__name', 'category__name', 'user_id', 'user__name', 'user__mobile'):
+            property_name = expense['property__name'] or 'N/A'
+            category = expense['category__name'] or 'Uncategorized'
+            amount = float(expense['amount'])
+            daily_summary.add(expense['date'], amount, expense['id'])
+            category_summary.add(category, amount, expense['id'])
+            property_summary.add(property_name, amount, expense['id'])
+            yield [
+                expense['id'],
+                expense['date'],
+                property_name,
+                category,
+                expense['description'] or 'N/A',
+                amount,
+                customer_label(expense) if expense['user_id'] else 'N/A',
+            ]
+
+    return f"Expense_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed Expenses', ['Expense ID', 'Date', 'Property', 'Category', 'Description', 'Amount', 'Created By'], expense_rows()),
+        Sheet('Daily Summary', ['Date', 'Total Amount', 'Number of Expenses'], daily_summary.rows),
+        Sheet('Category Summary', ['Category', 'Total Amount', 'Number of Expenses'], category_summary.rows),
+        Sheet('Property Summary', ['Property', 'Total Amount', 'Number of Expenses'], property_summary.rows),
+    ]
+
+
+# Financial reports
+
+def build_revenue_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date).order_by('created_at')
+    if not bookings.exists():
+        raise NoReportData()
+
+    property_summary = GroupTotals('sum', 'sum', 'sum', 'sum', 'count')
+    booking_type_summary = GroupTotals('sum', 'count')
+    payment_summary = GroupTotals('sum', 'count')
+    daily_summary = GroupTotals('sum', 'count')
+
+    def revenue_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+            date = booking['created_at'].strftime('%Y-%m-%d')
+            booking_id = booking['booking_id'] or f"#{booking['id']}"
+            property_name = booking['property__name'] or 'N/A'
+            property_type = booking['property__property_type'] or 'N/A'
+            amount = float(booking['price'])
+            discount = float(booking['discount'] or 0)
+            net_amount = float(taxable_amount + tax_amount)
+            property_summary.add((property_name, property_type), net_amount, amount, float(tax_amount), discount, booking_id)
+            booking_type_summary.add(booking['booking_type'], net_amount, booking_id)
+            payment_summary.add(booking['payment_type'], net_amount, booking_id)
+            daily_summary.add(date, net_amount, booking_id)
+            yield [
+                date,
+                booking_id,
+                property_name,
+                property_type,
+                customer_label(booking),
+                booking['booking_type'],
+                booking['payment_type'],
+                amount,
+                discount,
+                float(taxable_amount),
+                float(tax_rate * 100),
+                float(tax_amount),
+                net_amount,
+                booking['status'],
+            ]
+
+    return f"Revenue_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed Revenue', ['Date', 'Booking ID', 'Property', 'Property Type', 'Customer', 'Booking Type', 'Payment Method', 'Amount', 'Discount', 'Taxable Amount', 'Tax Rate %', 'Tax Amount', 'Net Amount', 'Status'], revenue_rows()),
+        Sheet('Property Summary', ['Property', 'Property Type', 'Total Revenue', 'Gross Amount', 'Total Tax', 'Total Discount', 'Number of Bookings'], property_summary.rows),
+        Sheet('Booking Type Summary', ['Booking Type', 'Total Revenue', 'Number of Bookings'], booking_type_summary.rows),
+        Sheet('Payment Method Summary', ['Payment Method', 'Total Revenue', 'Number of Bookings'], payment_summary.rows),
+        Sheet('Daily Summary', ['Date', 'Total Revenue', 'Number of Bookings'], daily_summary.rows),
+    ]
+
+
+def build_profit_loss_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date)
+    expenses = Expense.objects.filter(
+        property_id__in=property_ids,
+        date__gte=start_date,
+        date__lte=end_date,
+        is_active=True
+    )
+
+    # Revenue and expenses by property; the tax slab depends on each booking's amount
+    property_totals = GroupTotals('sum', 'sum')
+    for booking in iter_values(bookings, 'price', 'discount', 'property_id', 'property__name'):
+        taxable_amount, _, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+        property_totals.add((booking['property_id'], booking['property__name'] or 'N/A'), float(taxable_amount + tax_amount), 0)
+    for item in expenses.values('property_id', 'property__name').annotate(total=Sum('amount')).order_by():
+        property_totals.add((item['property_id'], item['property__name'] or 'N/A'), 0, float(item['total'] or 0))
+
+    if not property_totals:
+        raise NoReportData()
+
+    pl_rows = []
+    for (_, property_name), (revenue, expense) in property_totals.items():
+        net_profit = revenue - expense
+        profit_margin = round(net_profit / revenue * 100, 2) if revenue else 0
+        pl_rows.append([property_name, revenue, expense, net_profit, profit_margin])
+
+    # Overall summary
+    total_revenue = sum(row[1] for row in pl_rows)
+    total_expenses = sum(row[2] for row in pl_rows)
+    total_profit = total_revenue - total_expenses
+    overall_margin = (total_profit / total_revenue * 100) if total_revenue > 0 else 0
+
+    columns = ['Property', 'Total Revenue', 'Total Expenses', 'Net Profit', 'Profit Margin %']
+    return f"Profit_Loss_Report_{start_date}_to_{end_date}", [
+        Sheet('Overall Summary', columns, [['ALL PROPERTIES', total_revenue, total_expenses, total_profit, round(overall_margin, 2)]]),
+        Sheet('Property-wise P&L', columns, pl_rows),
+    ]
+
+
+def build_gst_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date).order_by('created_at')
+    if not bookings.exists():
+        raise NoReportData()
+
+    tax_rate_summary = GroupTotals('sum', 'sum', 'sum', 'count')
+    property_summary = GroupTotals('sum', 'sum', 'sum', 'count')
+    daily_summary = GroupTotals('sum', 'sum', 'sum')
+
+    def gst_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+            date = booking['created_at'].strftime('%Y-%m-%d')
+            booking_id = booking['booking_id'] or f"#{booking['id']}"
+            property_name = booking['property__name'] or 'N/A'
+            amounts = (float(taxable_amount), float(tax_amount), float(taxable_amount + tax_amount))
+            tax_rate_pct = float(tax_rate * 100)
+            tax_rate_summary.add(tax_rate_pct, *amounts, booking_id)
+            property_summary.add(property_name, *amounts, booking_id)
+            daily_summary.add(date, *amounts)
+            yield [date, booking_id, property_name, customer_label(booking), amounts[0], tax_rate_pct, amounts[1], amounts[2]]
+
+    totals_columns = ['Total Taxable Amount', 'Total GST', 'Total Amount (Incl. GST)']
+    return f"GST_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed GST', ['Date', 'Booking ID', 'Property', 'Customer', 'Taxable Amount', 'Tax Rate %', 'GST Amount', 'Total Amount (Incl. GST)'], gst_rows()),
+        Sheet('Tax Rate Summary', ['Tax Rate %'] + totals_columns + ['Number of Bookings'], tax_rate_summary.rows),
+        Sheet('Property Summary', ['Property'] + totals_columns + ['Number of Bookings'], property_summary.rows),
+        Sheet('Daily Summary', ['Date'] + totals_columns, daily_summary.rows),
+    ]
+
+
+# Operational reports
+
+def build_booking_summary_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date).order_by('created_at')
+
+    # Statuses present in the range, the columns of the status pivot
+    statuses = sorted(bookings.order_by().values_list('status', flat=True).distinct())
+    if not statuses:
+        raise NoReportData()
+
+    property_summary = GroupTotals('count', 'sum')
+    status_by_property = GroupTotals('count')
+    status_summary = GroupTotals('count', 'sum')
+
+    def booking_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+            booking_id = booking['booking_id'] or f"#{booking['id']}"
+            property_name = booking['property__name'] or 'N/A'
+            property_type = booking['property__property_type'] or 'N/A'
+            revenue = float(taxable_amount + tax_amount)
+            property_summary.add((property_name, property_type), booking_id, revenue)
+            status_by_property.add((property_name, booking['status']), booking_id)
+            status_summary.add(booking['status'], booking_id, revenue)
+            yield [
+                booking_id,
+                booking['created_at'].strftime('%Y-%m-%d'),
+                property_name,
+                property_type,
+                customer_label(booking),
+                booking['checkin_date'].strftime('%Y-%m-%d') if booking['checkin_date'] else 'N/A',
+                booking['checkout_date'].strftime('%Y-%m-%d') if booking['checkout_date'] else 'N/A',
+                booking['status'],
+                booking['booking_type'],
+                booking['booking_time'],
+                booking['number_of_rooms'],
+                booking['number_of_guests'],
+                revenue,
+            ]
+
+    def status_pivot_rows():
+        counts = {}
+        for (property_name, booking_status), (count,) in status_by_property.items():
+            counts.setdefault(property_name, {})[booking_status] = count
+        for property_name, by_status in counts.items():
+            yield [property_name] + [by_status.get(booking_status, 0) for booking_status in statuses]
+
+    return f"Booking_Summary_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed Bookings', ['Booking ID', 'Date', 'Property', 'Property Type', 'Customer', 'Check-in Date', 'Check-out Date', 'Status', 'Booking Type', 'Booking Time', 'Number of Rooms', 'Number of Guests', 'Revenue'], booking_rows()),
+        Sheet('Property Summary', ['Property', 'Property Type', 'Total Bookings', 'Total Revenue'], property_summary.rows),
+        Sheet('Status by Property', ['Property'] + statuses, status_pivot_rows),
+        Sheet('Status Summary', ['Status', 'Total Bookings', 'Total Revenue'], status_summary.rows),
+    ]
+
+
+def build_occupancy_report(property_ids, start_date, end_date):
+    properties = list(
+        Property.objects.filter(id__in=property_ids, is_active=True).order_by('id').values('id', 'name', 'property_type')
+    )
+    if not properties or start_date > end_date:
+        raise NoReportData()
+
+    # Occupancy for every property and day in the range, from one booking query
+    occupancy = build_occupancy_matrix([prop['id'] for prop in properties], start_date, end_date)
+    occupancy_pct = occupancy.occupancy_percentage().round(2)
+    property_summary = GroupTotals('mean', 'first', 'mean')
+
+    def occupancy_rows():
+        for day_index, current_date in enumerate(occupancy.dates):
+            date = current_date.strftime('%Y-%m-%d')
+            for row, prop in enumerate(properties):
+                total_rooms = int(occupancy.total_rooms[row])
+                occupied_rooms = int(occupancy.occupied[row, day_index])
+                percentage = float(occupancy_pct[row, day_index])
+                property_summary.add((prop['name'], prop['property_type']), percentage, total_rooms, occupied_rooms)
+                yield [date, prop['name'], prop['property_type'], total_rooms, occupied_rooms, total_rooms - occupied_rooms, percentage]
+
+    def property_summary_rows():
+        for row in property_summary.rows():
+            row[2] = round(row[2], 2)
+            yield row
+
+    return f"Occupancy_Report_{start_date}_to_{end_date}", [
+        Sheet('Daily Occupancy', ['Date', 'Property', 'Property Type', 'Total Rooms', 'Occupied Rooms', 'Available Rooms', 'Occupancy %'], occupancy_rows()),
+        Sheet('Property Summary', ['Property', 'Property Type', 'Average Occupancy %', 'Total Rooms', 'Avg Occupied Rooms'], property_summary_rows),
+    ]
+
+
+def build_cancellation_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    # Most recently cancelled first
+    bookings = _bookings(property_ids, start_date, end_date, status='cancelled').order_by('-updated_at')
+    if not bookings.exists():
+        raise NoReportData()
+
+    property_summary = GroupTotals('count', 'sum', 'sum')
+    booking_type_summary = GroupTotals('count', 'sum', 'sum')
+    daily_summary = GroupTotals('count', 'sum')
+
+    def cancellation_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+            booking_id = booking['booking_id'] or f"#{booking['id']}"
+            property_name = booking['property__name'] or 'N/A'
+            property_type = booking['property__property_type'] or 'N/A'
+            cancellation_date = booking['updated_at'].strftime('%Y-%m-%d') if booking['updated_at'] else 'N/A'
+            # Calculate days between booking and cancellation
+            days_to_cancellation = (booking['updated_at'].date() - booking['created_at'].date()).days if booking['updated_at'] else 0
+            total_amount = float(taxable_amount + tax_amount)
+            # Assuming full refund for cancelled bookings
+            refund_amount = total_amount
+            property_summary.add((property_name, property_type), booking_id, total_amount, refund_amount)
+            booking_type_summary.add(booking['booking_type'], booking_id, total_amount, refund_amount)
+            daily_summary.add(cancellation_date, booking_id, refund_amount)
+            yield [
+                booking_id,
+                booking['created_at'].strftime('%Y-%m-%d'),
+                cancellation_date,
+                days_to_cancellation,
+                property_name,
+                property_type,
+                customer_label(booking),
+                booking['checkin_date'].strftime('%Y-%m-%d') if booking['checkin_date'] else 'N/A',
+                booking['checkout_date'].strftime('%Y-%m-%d') if booking['checkout_date'] else 'N/A',
+                booking['booking_type'],
+                float(booking['price']),
+                float(booking['discount'] or 0),
+                float(tax_amount),
+                total_amount,
+                refund_amount,
+            ]
+
+    return f"Cancellation_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed Cancellations', ['Booking ID', 'Booking Date', 'Cancellation Date', 'Days to Cancellation', 'Property', 'Property Type', 'Customer', 'Check-in Date', 'Check-out Date', 'Booking Type', 'Amount', 'Discount', 'Tax Amount', 'Total Amount', 'Refund Amount'], cancellation_rows()),
+        Sheet('Property Summary', ['Property', 'Property Type', 'Cancellations', 'Total Amount', 'Total Refunds'], property_summary.rows),
+        Sheet('Booking Type Summary', ['Booking Type', 'Cancellations', 'Total Amount', 'Total Refunds'], booking_type_summary.rows),
+        Sheet('Daily Trend', ['Date', 'Cancellations', 'Refund Amount'], daily_summary.rows),
+    ]
+
+
+def build_no_show_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    # No-shows are reported by check-in date rather than booking date
+    bookings = Booking.objects.filter(
+        property_id__in=property_ids,
+        status='no_show',
+        checkin_date__gte=start_date,
+        checkin_date__lte=end_date,
+        is_active=True
+    ).order_by('-checkin_date')
+    if not bookings.exists():
+        raise NoReportData()
+
+    property_summary = GroupTotals('count', 'sum')
+    booking_type_summary = GroupTotals('count', 'sum')
+    daily_summary = GroupTotals('count', 'sum')
+
+    def no_show_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+            booking_id = booking['booking_id'] or f"#{booking['id']}"
+            property_name = booking['property__name'] or 'N/A'
+            property_type = booking['property__property_type'] or 'N/A'
+            checkin_date = booking['checkin_date'].strftime('%Y-%m-%d') if booking['checkin_date'] else 'N/A'
+            total_amount = float(taxable_amount + tax_amount)
+            property_summary.add((property_name, property_type), booking_id, total_amount)
+            booking_type_summary.add(booking['booking_type'], booking_id, total_amount)
+            daily_summary.add(checkin_date, booking_id, total_amount)
+            yield [
+                booking_id,
+                booking['created_at'].strftime('%Y-%m-%d'),
+                checkin_date,
+                booking['checkout_date'].strftime('%Y-%m-%d') if booking['checkout_date'] else 'N/A',
+                property_name,
+                property_type,
+                booking['user__name'],
+                booking['user__mobile'],
+                booking['user__email'],
+                booking['booking_type'],
+                booking['payment_type'],
+                booking['number_of_rooms'],
+                booking['number_of_guests'],
+                float(booking['price']),
+                float(booking['discount'] or 0),
+                total_amount,
+            ]
+
+    return f"No_Show_Report_{start_date}_to_{end_date}", [
+        Sheet('Detailed No-Shows', ['Booking ID', 'Booking Date', 'Check-in Date', 'Check-out Date', 'Property', 'Property Type', 'Customer Name', 'Customer Mobile', 'Customer Email', 'Booking Type', 'Payment Method', 'Number of Rooms', 'Number of Guests', 'Amount', 'Discount', 'Total Amount'], no_show_rows()),
+        Sheet('Property Summary', ['Property', 'Property Type', 'No-Shows', 'Total Amount'], property_summary.rows),
+        Sheet('Booking Type Summary', ['Booking Type', 'No-Shows', 'Total Amount'], booking_type_summary.rows),
+        Sheet('Daily Trend', ['Date', 'No-Shows', 'Total Amount'], daily_summary.rows),
+    ]
+
+
+# Customer reports
+
+def build_customer_history_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date).order_by('user_id', 'created_at')
+    if not bookings.exists():
+        raise NoReportData()
+
+    customer_summary = GroupTotals('count', 'sum')
+
+    def history_rows():
+        for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+            taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+            booking_id = booking['booking_id'] or f"#{booking['id']}"
+            customer = (booking['user_id'], booking['user__name'] or 'N/A', booking['user__mobile'], booking['user__email'] or 'N/A')
+            total_amount = float(taxable_amount + tax_amount)
+            customer_summary.add(customer, booking_id, total_amount)
+            yield list(customer) + [
+                booking_id,
+                booking['created_at'].strftime('%Y-%m-%d'),
+                booking['property__name'] or 'N/A',
+                booking['property__property_type'] or 'N/A',
+                booking['checkin_date'].strftime('%Y-%m-%d') if booking['checkin_date'] else 'N/A',
+                booking['checkout_date'].strftime('%Y-%m-%d') if booking['checkout_date'] else 'N/A',
+                booking['status'],
+                booking['booking_type'],
+                booking['payment_type'],
+                booking['number_of_rooms'],
+                booking['number_of_guests'],
+                float(booking['price']),
+                float(booking['discount'] or 0),
+                total_amount,
+            ]
+
+    customer_columns = ['Customer ID', 'Customer Name', 'Customer Mobile', 'Customer Email']
+    return f"Customer_History_Report_{start_date}_to_{end_date}", [
+        Sheet('Customer Booking History', customer_columns + ['Booking ID', 'Booking Date', 'Property', 'Property Type', 'Check-in Date', 'Check-out Date', 'Status', 'Booking Type', 'Payment Method', 'Number of Rooms', 'Number of Guests', 'Amount', 'Discount', 'Total Amount'], history_rows()),
+        Sheet('Customer Summary', customer_columns + ['Total Bookings', 'Total Spent'], customer_summary.rows),
+    ]
+
+
+def build_repeat_customer_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date)
+
+    # Group by customer
+    customer_data = {}
+    for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+        customer_id = booking['user_id']
+        booking_date = booking['created_at'].date()
+        if customer_id not in customer_data:
+            customer_data[customer_id] = {
+                'Customer ID': customer_id,
+                'Customer Name': booking['user__name'] or 'N/A',
+                'Customer Mobile': booking['user__mobile'],
+                'Customer Email': booking['user__email'] or 'N/A',
+                'Total Bookings': 0,
+                'Total Amount': Decimal('0'),
+                'First Booking Date': booking_date,
+                'Last Booking Date': booking_date,
+                'Properties Visited': set(),
+                'Booking Types': set()
+            }
+
+        customer = customer_data[customer_id]
+        customer['Total Bookings'] += 1
+        taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+        customer['Total Amount'] += taxable_amount + tax_amount
+        customer['First Booking Date'] = min(customer['First Booking Date'], booking_date)
+        customer['Last Booking Date'] = max(customer['Last Booking Date'], booking_date)
+        if booking['property_id']:
+            customer['Properties Visited'].add(booking['property__name'])
+        customer['Booking Types'].add(booking['booking_type'])
+
+    # Filter only repeat customers (2+ bookings), most bookings first
+    repeat_customers = sorted(
+        (data for data in customer_data.values() if data['Total Bookings'] >= 2),
+        key=lambda data: data['Total Bookings'],
+        reverse=True,
+    )
+    if not repeat_customers:
+        raise NoReportData("No repeat customers found for the selected date range")
+
+    repeat_rows = [
+        [
+            data['Customer ID'],
+            data['Customer Name'],
+            data['Customer Mobile'],
+            data['Customer Email'],
+            data['Total Bookings'],
+            float(data['Total Amount']),
+            float(data['Total Amount'] / data['Total Bookings']),
+            data['First Booking Date'].strftime('%Y-%m-%d'),
+            data['Last Booking Date'].strftime('%Y-%m-%d'),
+            len(data['Properties Visited']),
+            ', '.join(sorted(data['Booking Types'])),
+        ]
+        for data in repeat_customers
+    ]
+
+    # Summary statistics
+    total_bookings = sum(row[4] for row in repeat_rows)
+    total_spent = sum(row[5] for row in repeat_rows)
+    summary_rows = [
+        ['Total Repeat Customers', len(repeat_rows)],
+        ['Total Bookings by Repeat Customers', total_bookings],
+        ['Total Revenue from Repeat Customers', total_spent],
+        ['Average Bookings per Repeat Customer', round(total_bookings / len(repeat_rows), 2)],
+        ['Average Revenue per Repeat Customer', round(total_spent / len(repeat_rows), 2)],
+    ]
+
+    return f"Repeat_Customer_Report_{start_date}_to_{end_date}", [
+        Sheet('Repeat Customers', ['Customer ID', 'Customer Name', 'Customer Mobile', 'Customer Email', 'Total Bookings', 'Total Spent', 'Average Booking Value', 'First Booking Date', 'Last Booking Date', 'Properties Visited', 'Booking Types'], repeat_rows),
+        Sheet('Summary', ['Metric', 'Value'], summary_rows),
+    ]
+
+
+def build_customer_demographics_report(property_ids, start_date, end_date):
+    slabs = TaxSlabs()
+    bookings = _bookings(property_ids, start_date, end_date)
+
+    # Per customer: bookings, spend, most frequent preferences and average party size
+    customer_demographics = GroupTotals('count', 'sum', 'mode', 'mode', 'mode', 'mean', 'mean')
+    property_type_summary = GroupTotals('nunique', 'count', 'sum')
+    booking_type_summary = GroupTotals('nunique', 'count', 'sum')
+    payment_summary = GroupTotals('nunique', 'count', 'sum')
+    for booking in iter_values(bookings, *BOOKING_EXPORT_FIELDS):
+        taxable_amount, tax_rate, tax_amount = slabs.taxed_amounts(booking['price'], booking['discount'])
+        total_spent = float(taxable_amount + tax_amount)
+        property_type = booking['property__property_type'] if booking['property_id'] else 'N/A'
+
+        # Extract location from mobile number (first 2 digits for state code approximation)
+        mobile = booking['user__mobile'] or ''
+        location_hint = mobile[:2] if len(mobile) >= 2 else 'Unknown'
+
+        customer_demographics.add(
+            (booking['user_id'], booking['user__name'] or 'N/A', booking['user__mobile'], booking['user__email'] or 'N/A', location_hint),
+            booking['id'],
+            total_spent,
+            property_type,
+            booking['booking_type'],
+            booking['payment_type'],
+            booking['number_of_guests'],
+            booking['number_of_rooms'],
+        )
+        property_type_summary.add(property_type, booking['user_id'], booking['id'], total_spent)
+        booking_type_summary.add(booking['booking_type'], booking['user_id'], booking['id'], total_spent)
+        payment_summary.add(booking['payment_type'], booking['user_id'], booking['id'], total_spent)
+
+    if not customer_demographics:
+        raise NoReportData()
+
+    def demographics_rows():
+        for row in customer_demographics.rows():
+            row[-2] = round(row[-2], 1)
+            row[-1] = round(row[-1], 1)
+            yield row
+
+    preference_columns = ['Unique Customers', 'Total Bookings', 'Total Revenue']
+    return f"Customer_Demographics_Report_{start_date}_to_{end_date}", [
+        Sheet('Customer Demographics', ['Customer ID', 'Customer Name', 'Customer Mobile', 'Customer Email', 'Location', 'Total Bookings', 'Total Spent', 'Preferred Property Type', 'Preferred Booking Type', 'Preferred Payment Method', 'Avg Guests', 'Avg Rooms'], demographics_rows),
+        Sheet('Property Type Preference', ['Property Type'] + preference_columns, property_type_summary.rows),
+        Sheet('Booking Type Preference', ['Booking Type'] + preference_columns, booking_type_summary.rows),
+        Sheet('Payment Method Preference', ['Payment Method'] + preference_columns, payment_summary.rows),
+    ]
+
+
+# Report type -> builder; the keys match the /api/stats/reports/<type>/excel/ routes
+REPORT_BUILDERS = {
+    'sales': build_sales_report,
+    'expenses': build_expense_report,
+    'revenue': build_revenue_report,
+    'profit-loss': build_profit_loss_report,
+    'gst': build_gst_report,
+    'booking-summary': build_booking_summary_report,
+    'occupancy': build_occupancy_report,
+    'cancellation': build_cancellation_report,
+    'no-show': build_no_show_report,
+    'customer-history': build_customer_history_report,
+    'repeat-customer': build_repeat_customer_report,
+    'customer-demographics': build_customer_demographics_report,
+}
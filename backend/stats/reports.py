@@ -64,7 +64,7 @@ def generate_pdf_report(title, data, filename):
         table = Table(table_data)
         table.setStyle(TableStyle([
             ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D7E4BC')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.hexcolor('#000000')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#000000')),
             ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
             ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
             ('FONTSIZE', (0, 0), (-1, 0), 10),
@@ -150,7 +150,7 @@ def generate_multi_sheet_pdf(title, sheets_data, filename):
             table = Table(table_data, repeatRows=1)
             table.setStyle(TableStyle([
                 ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#D7E4BC')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.hexcolor('#000000')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#000000')),
                 ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
                 ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
                 ('FONTSIZE', (0, 0), (-1, 0), 10),
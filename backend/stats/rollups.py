@@ -0,0 +1,219 @@
+"""
+Maintenance of the DailyPropertyStats rollup table.
+
+Bookings and expenses only ever dirty a handful of (property, day) buckets,
+so every change recomputes just those buckets from indexed range queries on
+the raw tables; ``rebuild_daily_stats`` recomputes everything.
+"""
+import logging
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from booking.models import Booking
+from expenses.models import Expense
+from .models import DailyPropertyStats
+from .occupancy import OCCUPIED_STATUSES, build_occupancy_matrix
+
+logger = logging.getLogger("stats")
+
+SALES_STATUSES = ('confirmed', 'completed', 'cancelled', 'pending')
+SALES_FIELDS = (
+    ['revenue_total', 'bookings_total']
+    + [f'revenue_{s}' for s in SALES_STATUSES]
+    + [f'bookings_{s}' for s in SALES_STATUSES]
+)
+EXPENSE_FIELDS = ['expense_total', 'expense_by_category']
+OCCUPANCY_FIELDS = ['occupied_room_nights']
+
+
+def _day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def local_date(value):
+    """Calendar day of an aware datetime in the project time zone."""
+    return timezone.localtime(value).date() if timezone.is_aware(value) else value.date()
+
+
+def _sales_aggregates():
+    aggregates = {
+        'revenue_total': Sum('price'),
+        'bookings_total': Count('id'),
+    }
+    for s in SALES_STATUSES:
+        aggregates[f'revenue_{s}'] = Sum('price', filter=Q(status=s))
+        aggregates[f'bookings_{s}'] = Count('id', filter=Q(status=s))
+    return aggregates
+
+
+def _sales_for_day(property_id, day):
+    totals = Booking.objects.filter(
+        property_id=property_id,
+        created_at__gte=_day_start(day),
+        created_at__lt=_day_start(day + timedelta(days=1)),
+        is_active=True,
+    ).aggregate(**_sales_aggregates())
+    return {field: totals[field] or 0 for field in SALES_FIELDS}
+
+
+def _expenses_for_day(property_id, day):
+    by_category = {}
+    total = Decimal('0')
+    rows = Expense.objects.filter(
+        property_id=property_id, date=day, is_active=True
+    ).values('category_id').annotate(total=Sum('amount'))
+    for row in rows:
+        amount = row['total'] or Decimal('0')
+        by_category[str(row['category_id'] or 'none')] = str(amount)
+        total += amount
+    return {'expense_total': total, 'expense_by_category': by_category}
+
+
+def _write_rows(property_id, values_by_day, fields):
+    """
+    Upsert ``fields`` of the (property_id, day) rows in ``values_by_day``.
+
+    A single INSERT ... ON CONFLICT (property, date) DO UPDATE, so two
+    transactions refreshing the same new bucket cannot both insert it.
+    """
+    if not values_by_day:
+        return
+    DailyPropertyStats.objects.bulk_create(
+        [DailyPropertyStats(property_id=property_id, date=day, **values) for day, values in values_by_day.items()],
+        update_conflicts=True,
+        unique_fields=['property', 'date'],
+        update_fields=fields + ['updated_at'],
+    )
+
+
+def refresh_daily_stats(property_id, sales_days=(), expense_days=(), night_days=()):
+    """
+    Recompute the sales, expense and occupancy columns of the given
+    (property_id, day) buckets from the raw Booking / Expense rows.
+    """
+    from property.models import Property
+
+    if not property_id or not Property.objects.filter(id=property_id).exists():
+        return
+    now = timezone.now()
+    with transaction.atomic():
+        sales = {}
+        for day in set(sales_days):
+            sales[day] = dict(_sales_for_day(property_id, day), updated_at=now)
+        _write_rows(property_id, sales, SALES_FIELDS)
+
+        expenses = {}
+        for day in set(expense_days):
+            expenses[day] = dict(_expenses_for_day(property_id, day), updated_at=now)
+        _write_rows(property_id, expenses, EXPENSE_FIELDS)
+
+        night_days = sorted(set(night_days))
+        if night_days:
+            occupancy = build_occupancy_matrix([property_id], night_days[0], night_days[-1])
+            nights = {
+                day: {'occupied_room_nights': occupancy.occupied_for(property_id, day), 'updated_at': now}
+                for day in night_days
+            }
+            _write_rows(property_id, nights, OCCUPANCY_FIELDS)
+
+
+def booking_stat_keys(property_id, created_at, checkin_date, checkout_date):
+    """The (property, sales days, night days) a booking contributes to."""
+    sales_days = [local_date(created_at)] if created_at else []
+    night_days = []
+    if checkin_date and checkout_date and checkout_date > checkin_date:
+        night_days = [checkin_date + timedelta(days=i) for i in range((checkout_date - checkin_date).days)]
+    return property_id, sales_days, night_days
+
+
+def rebuild_daily_stats(property_ids=None):
+    """Drop and recompute every DailyPropertyStats row (optionally for some properties)."""
+    from property.models import Property
+
+    properties = Property.objects.all()
+    if property_ids:
+        properties = properties.filter(id__in=property_ids)
+    property_ids = list(properties.values_list('id', flat=True))
+
+    rows = defaultdict(dict)
+
+    bookings = Booking.objects.filter(property_id__in=property_ids, is_active=True)
+    for item in bookings.annotate(day=TruncDate('created_at')).values('property_id', 'day').annotate(**_sales_aggregates()):
+        rows[(item['property_id'], item['day'])].update({field: item[field] or 0 for field in SALES_FIELDS})
+
+    expenses = Expense.objects.filter(property_id__in=property_ids, is_active=True)
+    for item in expenses.values('property_id', 'date', 'category_id').annotate(total=Sum('amount')):
+        row = rows[(item['property_id'], item['date'])]
+        amount = item['total'] or Decimal('0')
+        row['expense_total'] = row.get('expense_total', Decimal('0')) + amount
+        row.setdefault('expense_by_category', {})[str(item['category_id'] or 'none')] = str(amount)
+
+    span = Booking.objects.filter(
+        property_id__in=property_ids,
+        status__in=OCCUPIED_STATUSES,
+        is_active=True,
+    ).aggregate(first_night=Min('checkin_date'), last_checkout=Max('checkout_date'))
+    first_night, last_checkout = span['first_night'], span['last_checkout']
+    if first_night and last_checkout and last_checkout > first_night:
+        occupancy = build_occupancy_matrix(property_ids, first_night, last_checkout - timedelta(days=1))
+        for i, property_id in enumerate(occupancy.property_ids):
+            for j in occupancy.occupied[i].nonzero()[0]:
+                day = first_night + timedelta(days=int(j))
+                rows[(property_id, day)]['occupied_room_nights'] = int(occupancy.occupied[i, j])
+
+    with transaction.atomic():
+        DailyPropertyStats.objects.filter(property_id__in=property_ids).delete()
+        DailyPropertyStats.objects.bulk_create(
+            [DailyPropertyStats(property_id=key[0], date=key[1], **values) for key, values in rows.items()],
+            batch_size=1000,
+        )
+    logger.info(f"Rebuilt {len(rows)} daily stats rows for {len(property_ids)} properties")
+    return len(rows)
+
+
+def summarize_daily_stats(property_ids, start_date, end_date, group_by=None):
+    """
+    Sum the rollup columns over [start_date, end_date] for ``property_ids``.
+
+    ``group_by`` may be ``'date'`` or ``'month'``; without it a single dict of
+    totals is returned.
+    """
+    from django.db.models.functions import TruncMonth
+
+    rows = DailyPropertyStats.objects.filter(
+        property_id__in=property_ids,
+        date__gte=start_date,
+        date__lte=end_date,
+    )
+    sums = {field: Sum(field) for field in SALES_FIELDS + ['expense_total', 'occupied_room_nights']}
+    if group_by is None:
+        totals = rows.aggregate(**sums)
+        return {field: value or 0 for field, value in totals.items()}
+    if group_by == 'month':
+        rows = rows.annotate(month=TruncMonth('date'))
+        group_by = 'month'
+    return [
+        {field: (value or 0) if field != group_by else value for field, value in item.items()}
+        for item in rows.values(group_by).annotate(**sums).order_by(group_by)
+    ]
+
+
+def expense_totals_by_category(property_ids, start_date, end_date):
+    """Merge the per-day category breakdowns into {category id or None: Decimal}."""
+    totals = defaultdict(Decimal)
+    breakdowns = DailyPropertyStats.objects.filter(
+        property_id__in=property_ids,
+        date__gte=start_date,
+        date__lte=end_date,
+        expense_total__gt=0,
+    ).values_list('expense_by_category', flat=True)
+    for breakdown in breakdowns:
+        for category_id, amount in (breakdown or {}).items():
+            totals[None if category_id == 'none' else int(category_id)] += Decimal(amount)
+    return dict(totals)
@@ -0,0 +1,102 @@
+import logging
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from backend.cache_versions import bump_version
+from booking.models import Booking
+from expenses.models import Expense, ExpenseCategory
+from property.models import Property, Room
+from .report_builders import REPORT_DATA_VERSION
+from .rollups import booking_stat_keys, refresh_daily_stats
+
+logger = logging.getLogger("stats")
+
+
+def _booking_keys(booking):
+    return booking_stat_keys(booking.property_id, booking.created_at, booking.checkin_date, booking.checkout_date)
+
+
+def _refresh_after_commit(keys):
+    """Group (property, sales days, expense days, night days) keys and refresh once per property."""
+    merged = {}
+    for property_id, sales_days, expense_days, night_days in keys:
+        if not property_id:
+            continue
+        entry = merged.setdefault(property_id, (set(), set(), set()))
+        entry[0].update(sales_days)
+        entry[1].update(expense_days)
+        entry[2].update(night_days)
+
+    def refresh():
+        # Runs after the request's own commit; a failed refresh only leaves
+        # the rollup stale until rebuild_daily_stats, it never fails the request
+        for property_id, (sales_days, expense_days, night_days) in merged.items():
+            try:
+                refresh_daily_stats(property_id, sales_days, expense_days, night_days)
+            except Exception as e:
+                logger.exception(
+                    f"Failed to refresh daily stats for property {property_id}: {str(e)}",
+                    extra={"property_id": property_id}
+                )
+
+    if merged:
+        transaction.on_commit(refresh)
+
+
+def _bump_report_data_version():
+    transaction.on_commit(lambda: bump_version(REPORT_DATA_VERSION))
+
+
+@receiver(pre_save, sender=Booking)
+def booking_pre_save(sender, instance, **kwargs):
+    previous = None
+    if instance.pk:
+        previous = Booking.objects.filter(pk=instance.pk).only(
+            'property_id', 'created_at', 'checkin_date', 'checkout_date'
+        ).first()
+    instance._stats_previous_keys = _booking_keys(previous) if previous else None
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_changed(sender, instance, **kwargs):
+    keys = []
+    for property_id, sales_days, night_days in filter(None, [
+        _booking_keys(instance),
+        getattr(instance, '_stats_previous_keys', None),
+    ]):
+        keys.append((property_id, sales_days, (), night_days))
+    _refresh_after_commit(keys)
+    _bump_report_data_version()
+
+
+@receiver(pre_save, sender=Expense)
+def expense_pre_save(sender, instance, **kwargs):
+    previous = None
+    if instance.pk:
+        previous = Expense.objects.filter(pk=instance.pk).values_list('property_id', 'date').first()
+    instance._stats_previous_key = previous
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def expense_changed(sender, instance, **kwargs):
+    keys = [(instance.property_id, (), [instance.date] if instance.date else [], ())]
+    previous = getattr(instance, '_stats_previous_key', None)
+    if previous:
+        keys.append((previous[0], (), [previous[1]] if previous[1] else [], ()))
+    _refresh_after_commit(keys)
+    _bump_report_data_version()
+
+
+@receiver(post_save, sender=Property)
+@receiver(post_delete, sender=Property)
+@receiver(post_save, sender=Room)
+@receiver(post_delete, sender=Room)
+@receiver(post_save, sender=ExpenseCategory)
+@receiver(post_delete, sender=ExpenseCategory)
+def report_data_changed(sender, instance, **kwargs):
+    # Names, room counts and categories appear in the cached report files
+    _bump_report_data_version()
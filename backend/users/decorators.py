@@ -3,11 +3,19 @@ import re
 from functools import wraps
 from rest_framework.response import Response
 from rest_framework import status
-from .models import HsUser, UserHsPermission
+from .principal import get_principal
 from django.conf import settings
 from jwt.exceptions import InvalidSignatureError, ExpiredSignatureError, DecodeError, InvalidTokenError
 
 def custom_authentication_and_permissions(required_permissions=None, exempt_get_views=None):
+    """
+    Authenticate the Bearer JWT and check ``required_permissions``.
+
+    Sets ``request.user`` and ``request.principal`` (users.principal) from the
+    cached principal, so an authenticated request costs no database queries.
+    GET requests whose path fully matches a pattern in ``exempt_get_views``
+    skip authentication.
+    """
     if exempt_get_views is None:
         exempt_get_views = []
 
@@ -32,11 +40,11 @@ def custom_authentication_and_permissions(required_permissions=None, exempt_get_
                 if not user_id:
                     return Response({'error': 'Invalid token', 'detail': 'Token missing user_id'}, status=status.HTTP_401_UNAUTHORIZED)
                 
-                try:
-                    user = HsUser.objects.get(id=user_id)
-                    request.user = user
-                except HsUser.DoesNotExist:
+                principal = get_principal(user_id)
+                if principal is None:
                     return Response({'error': 'Invalid user'}, status=status.HTTP_401_UNAUTHORIZED)
+                request.user = principal.user
+                request.principal = principal
             except (InvalidSignatureError, ExpiredSignatureError, DecodeError, InvalidTokenError) as e:
                 # Catch all JWT exceptions to prevent Simple JWT from being invoked
                 return Response({'error': 'Invalid token', 'detail': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
@@ -45,13 +53,8 @@ def custom_authentication_and_permissions(required_permissions=None, exempt_get_
                 return Response({'error': 'Token validation failed', 'detail': str(e)}, status=status.HTTP_401_UNAUTHORIZED)
             
             # Check for required permissions
-            if required_permissions:
-                user_permissions = UserHsPermission.objects.filter(user=user).values_list('permission_group__permissions__name', flat=True)
-                user_permissions_set = set(user_permissions)  # Convert to set for faster lookup
-                
-                for perm in required_permissions:
-                    if perm not in user_permissions_set:
-                        return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
+            if required_permissions and not principal.has_permissions(required_permissions):
+                return Response({'error': 'Unauthorized'}, status=status.HTTP_403_FORBIDDEN)
 
             return view_func(request, *args, **kwargs)
         return wrapper
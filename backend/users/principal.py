@@ -0,0 +1,129 @@
+"""
+Cached authentication principal: everything the auth decorator and the
+views need to know about the requesting user.
+
+A principal bundles the HsUser row, the names of the user's permission
+groups and permissions, and the ids of the properties assigned to the user.
+It is cached per user under a key that embeds two version counters
+(backend.cache_versions): the user's own, bumped when the user, their
+UserHsPermission rows or their UserProperty rows change, and a global one,
+bumped when permission groups or permissions change. A cache hit costs no
+database queries.
+"""
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+from backend.cache_versions import bump_version, get_versions
+from property.models import UserProperty
+from .models import HsUser, UserHsPermission
+
+logger = logging.getLogger("users")
+
+PRINCIPAL_KEY_PREFIX = "principal:"
+# Bumped when any permission group or permission changes
+PERMISSIONS_VERSION = "principal-permissions"
+
+# The HsUser columns a principal carries: every column views may read (the
+# profile serializer shows them all) except the credentials, which never
+# enter the cache and load from the database if something asks for them.
+CREDENTIAL_FIELDS = ('password', 'last_login')
+USER_FIELDS = [field.attname for field in HsUser._meta.concrete_fields if field.attname not in CREDENTIAL_FIELDS]
+
+
+def user_version_name(user_id):
+    return f"principal-user:{user_id}"
+
+
+def invalidate_principal(user_id):
+    if user_id:
+        bump_version(user_version_name(user_id))
+
+
+def invalidate_all_principals():
+    bump_version(PERMISSIONS_VERSION)
+
+
+class Principal:
+    """The requesting user together with their permissions and properties."""
+
+    def __init__(self, user, groups, permissions, property_ids):
+        self.user = user
+        self.groups = frozenset(groups)
+        self.permissions = frozenset(permissions)
+        self.property_ids = list(property_ids)
+
+    @property
+    def id(self):
+        return self.user.id
+
+    @property
+    def is_admin(self):
+        return 'admin' in self.groups
+
+    @property
+    def is_customer(self):
+        return 'customer' in self.groups
+
+    def has_permissions(self, required_permissions):
+        return all(perm in self.permissions for perm in required_permissions or ())
+
+    def to_cache(self):
+        return {
+            'user': [getattr(self.user, attname) for attname in USER_FIELDS],
+            'groups': sorted(self.groups),
+            'permissions': sorted(self.permissions),
+            'property_ids': self.property_ids,
+        }
+
+    @classmethod
+    def from_cache(cls, data):
+        # from_db marks the instance as loaded with the credentials deferred,
+        # so saving it updates the row without touching them
+        user = HsUser.from_db('default', USER_FIELDS, data['user'])
+        return cls(user, data['groups'], data['permissions'], data['property_ids'])
+
+
+def load_principal(user_id):
+    """Build the principal of ``user_id`` from the database, or None if the user does not exist."""
+    user = HsUser.objects.filter(id=user_id).only(*USER_FIELDS).first()
+    if user is None:
+        return None
+    groups = set()
+    permissions = set()
+    rows = UserHsPermission.objects.filter(user=user).values_list(
+        'permission_group__name', 'permission_group__permissions__name'
+    )
+    for group, permission in rows:
+        if group:
+            groups.add(group)
+        if permission:
+            permissions.add(permission)
+    property_ids = UserProperty.objects.filter(user=user, is_active=True).order_by('property_id').values_list('property_id', flat=True)
+    return Principal(user, groups, permissions, property_ids)
+
+
+def get_principal(user_id):
+    """
+    Principal of ``user_id``, from the cache when possible. Falls back to
+    the database when the cache is unavailable.
+    """
+    try:
+        user_version, permissions_version = get_versions(user_version_name(user_id), PERMISSIONS_VERSION)
+        key = f"{PRINCIPAL_KEY_PREFIX}{user_id}:{user_version}:{permissions_version}"
+        data = cache.get(key)
+    except Exception as e:
+        logger.warning(f"Principal cache unavailable for user {user_id}: {str(e)}")
+        return load_principal(user_id)
+
+    if data is not None:
+        return Principal.from_cache(data)
+
+    principal = load_principal(user_id)
+    if principal is not None:
+        try:
+            cache.set(key, principal.to_cache(), timeout=settings.AUTH_PRINCIPAL_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning(f"Could not cache principal for user {user_id}: {str(e)}")
+    return principal
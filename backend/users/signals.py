@@ -0,0 +1,35 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from property.models import UserProperty
+from .models import HsPermission, HsPermissionGroup, HsUser, UserHsPermission
+from .principal import invalidate_all_principals, invalidate_principal
+
+
+def _invalidate_after_commit(user_id):
+    # After commit, so a concurrent request cannot re-cache the old rows
+    transaction.on_commit(lambda: invalidate_principal(user_id))
+
+
+@receiver(post_save, sender=HsUser)
+@receiver(post_delete, sender=HsUser)
+def user_changed(sender, instance, **kwargs):
+    _invalidate_after_commit(instance.pk)
+
+
+@receiver(post_save, sender=UserHsPermission)
+@receiver(post_delete, sender=UserHsPermission)
+@receiver(post_save, sender=UserProperty)
+@receiver(post_delete, sender=UserProperty)
+def user_access_changed(sender, instance, **kwargs):
+    _invalidate_after_commit(instance.user_id)
+
+
+@receiver(post_save, sender=HsPermission)
+@receiver(post_delete, sender=HsPermission)
+@receiver(post_save, sender=HsPermissionGroup)
+@receiver(post_delete, sender=HsPermissionGroup)
+@receiver(m2m_changed, sender=HsPermissionGroup.permissions.through)
+def permissions_changed(sender, **kwargs):
+    transaction.on_commit(invalidate_all_principals)
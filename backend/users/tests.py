@@ -1,3 +1,37 @@
+from datetime import timedelta
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
 from django.test import TestCase
+from django.utils import timezone
+
+from .models import HsUser
+from .principal import Principal, load_principal
+
+
+class CachedPrincipalTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = HsUser.objects.create(mobile="9999999999", name="Guest", email="guest@example.com", user_role="customer")
+        self.user.set_password("secret")
+        self.user.save()
+        token = jwt.encode(
+            {'user_id': self.user.id, 'exp': timezone.now() + timedelta(minutes=15), 'type': 'access'},
+            settings.SECRET_KEY,
+            algorithm='HS256',
+        )
+        self.auth = {"HTTP_AUTHORIZATION": f"Bearer {token}"}
+
+    def test_profile_makes_no_queries_with_a_cached_principal(self):
+        expected = self.client.get("/api/users/profile/", **self.auth).json()
+        with self.assertNumQueries(0):
+            response = self.client.get("/api/users/profile/", **self.auth)
+        self.assertEqual(response.json(), expected)
+        self.assertEqual(expected["email"], "guest@example.com")
+        self.assertEqual(expected["user_role"], "customer")
 
-# Create your tests here.
+    def test_credentials_stay_out_of_the_cache(self):
+        principal = load_principal(self.user.id)
+        self.assertNotIn(self.user.password, principal.to_cache()['user'])
+        self.assertEqual(Principal.from_cache(principal.to_cache()).user.get_deferred_fields(), {'password', 'last_login'})
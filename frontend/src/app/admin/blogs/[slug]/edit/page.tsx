@@ -71,7 +71,7 @@ export default function EditBlogPage() {
       
       setTitle(blogData.title)
       setNewSlug(blogData.slug)
-      setContent(blogData.content)
+      setContent(blogData.content ?? '')
       setCategoryId(blogData.category?.id || null)
       setFeaturedImageId(blogData.featured_image?.id || null)
       setGalleryImages(blogData.images?.map(img => ({
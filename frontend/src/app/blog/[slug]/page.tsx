@@ -242,7 +242,7 @@ export default function BlogDetailPage() {
               {/* Content */}
               <div 
                 className="prose prose-lg max-w-none mb-12"
-                dangerouslySetInnerHTML={{ __html: lexicalToHtml(blog.content) }}
+                dangerouslySetInnerHTML={{ __html: blog.content_html ?? lexicalToHtml(blog.content ?? '') }}
               />
 
               {/* Tags */}
@@ -338,7 +338,7 @@ export default function BlogDetailPage() {
                         </h3>
                       </Link>
                       <p className="text-sm text-gray-600 overflow-hidden" style={{ display: '-webkit-box', WebkitLineClamp: 2, WebkitBoxOrient: 'vertical', lineHeight: '1.2em', maxHeight: '2.4em' }}>
-                        {relatedBlog.content ? relatedBlog.content.replace(/<[^>]*>/g, '').substring(0, 150) + '...' : 'No content available'}
+                        {relatedBlog.excerpt || 'No content available'}
                       </p>
                     </div>
                   </div>
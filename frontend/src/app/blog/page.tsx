@@ -13,7 +13,6 @@ import { Blog, BlogCategory } from '@/types/blog'
 import Image from 'next/image'
 import Link from 'next/link'
 import { format } from 'date-fns'
-import { extractPlainTextFromLexical } from '@/lib/utils/lexicalToHtml'
 import { LoadingIndicator } from '@/components/ui/LoadingIndicator'
 import { LoginDialog } from '@/components/LoginDialog'
 
@@ -239,7 +238,7 @@ export default function BlogListPage() {
                     </Link>
                     
                     <p className="text-gray-600 text-sm mb-4 line-clamp-2 flex-grow">
-                      {blog.content ? extractPlainTextFromLexical(blog.content) || 'No content available' : 'No content available'}
+                      {blog.excerpt || 'No content available'}
                     </p>
 
                     <div className="flex items-center justify-between text-sm text-gray-500">
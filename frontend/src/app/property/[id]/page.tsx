@@ -786,13 +786,11 @@ export default function PropertyDetails() {
             <div className="flex items-center gap-2">
               <Badge variant="outline" className="bg-green-50 border-[#B11E43]">
                 <Star className="h-4 w-4 text-[#B11E43] fill-current mr-1" />
-                {property.reviews && property.reviews.length > 0
-                  ? (property.reviews.reduce((sum, review) => sum + review.rating, 0) / property.reviews.length).toFixed(1)
-                  : 'New'}
+                {property.rating != null ? property.rating.toFixed(1) : 'New'}
               </Badge>
               <span className="text-sm text-gray-600">
-                {property.reviews && property.reviews.length > 0
-                  ? `${property.reviews.length} ${property.reviews.length === 1 ? 'review' : 'reviews'}`
+                {property.review_count
+                  ? `${property.review_count} ${property.review_count === 1 ? 'review' : 'reviews'}`
                   : 'No reviews yet'}
               </span>
             </div>
@@ -836,7 +834,7 @@ export default function PropertyDetails() {
               }}
               className="px-3 sm:px-6 py-3 text-sm sm:text-base text-gray-600 hover:text-gray-800 font-medium border-b-2 border-transparent hover:border-gray-300 hover:bg-gray-50"
             >
-              Reviews ({property.reviews?.length || 0})
+              Reviews ({property.review_count || 0})
             </button>
             <button
               onClick={(e) => {
@@ -1280,7 +1278,13 @@ export default function PropertyDetails() {
             {/* Reviews */}
             <section id="reviews" className="property-section">
               <h2 className="text-xl font-semibold mb-3">Ratings and reviews</h2>
-              <ReviewSection reviews={property.reviews || []} />
+              <ReviewSection
+                propertyId={property.id}
+                reviews={property.reviews || []}
+                rating={property.rating}
+                reviewCount={property.review_count}
+                histogram={property.rating_histogram}
+              />
             </section>
 
             {/* Policies */}
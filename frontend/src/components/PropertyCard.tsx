@@ -1,6 +1,6 @@
 'use client'
 
-import { Property, Review } from '@/types/property'
+import { Property } from '@/types/property'
 import { Button } from "@/components/ui/button"
 import { Badge } from "@/components/ui/badge"
 import { Star, MapPin, Wifi, Coffee, ShieldCheck, UserRoundCheck, BellRing, Beer, Soup, Building, BatteryCharging, Heater, ChefHat, AirVent, Tv, Utensils, StarHalf, Heart, User, Users } from 'lucide-react'
@@ -160,12 +160,10 @@ export function PropertyCard({ property, searchParams }: PropertyCardProps) {
     }
   };
 
-  // Calculate actual rating from property reviews
-  const hasReviews = property.reviews && Array.isArray(property.reviews) && property.reviews.length > 0
-  const averageRating = hasReviews && property.reviews 
-    ? property.reviews.reduce((sum: number, review: Review) => sum + review.rating, 0) / property.reviews.length 
-    : 0
-  const reviewCount = hasReviews && property.reviews ? property.reviews.length : 0
+  // Rating summary over all of the property's reviews
+  const averageRating = property.rating ?? 0
+  const reviewCount = property.review_count ?? 0
+  const hasReviews = reviewCount > 0
   const displayRating = averageRating > 0 ? averageRating.toFixed(1) : "New"
 
   return (
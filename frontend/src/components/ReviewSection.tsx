@@ -5,6 +5,7 @@ import { Button } from "@/components/ui/button"
 import { Badge } from "@/components/ui/badge"
 import { Star, X, ChevronDown } from 'lucide-react'
 import Image from 'next/image'
+import { fetchPropertyReviews } from '@/lib/api/fetchPropertyReviews'
 import { Dialog, DialogContent, DialogDescription, DialogFooter, DialogHeader, DialogTitle, DialogTrigger } from "@/components/ui/dialog"
 
 interface Review {
@@ -19,23 +20,60 @@ interface Review {
 }
 
 interface ReviewSectionProps {
+  // Latest reviews embedded in the property
   reviews: Review[]
+  // Rating summary over all reviews; without it the metrics come from `reviews`
+  propertyId?: number | string
+  rating?: number | null
+  reviewCount?: number
+  histogram?: Record<'1' | '2' | '3' | '4' | '5', number>
 }
 
-export function ReviewSection({ reviews }: ReviewSectionProps) {
+export function ReviewSection({ reviews, propertyId, rating, reviewCount, histogram }: ReviewSectionProps) {
   const [isDialogOpen, setIsDialogOpen] = useState(false)
+  const [allReviews, setAllReviews] = useState<Review[]>(reviews)
+  const [nextPage, setNextPage] = useState<string | null>(null)
+  const [hasFetched, setHasFetched] = useState(false)
+  const [isLoadingMore, setIsLoadingMore] = useState(false)
 
   // Check if there are reviews first
-  const hasReviews = Array.isArray(reviews) && reviews.length > 0
+  const hasSummary = reviewCount !== undefined
+  const hasReviews = hasSummary ? reviewCount > 0 : Array.isArray(reviews) && reviews.length > 0
   
   // Calculate metrics only if we have reviews
-  const averageRating = hasReviews 
-    ? reviews.reduce((sum, review) => sum + review.rating, 0) / reviews.length 
-    : 0
-  const totalReviews = hasReviews ? reviews.length : 0
+  const averageRating = hasSummary
+    ? rating ?? 0
+    : hasReviews
+      ? reviews.reduce((sum, review) => sum + review.rating, 0) / reviews.length 
+      : 0
+  const totalReviews = hasSummary ? reviewCount : hasReviews ? reviews.length : 0
+
+  // The dialog pages through every review of the property
+  const loadReviews = async (next?: string | null) => {
+    if (!propertyId || isLoadingMore) return
+    setIsLoadingMore(true)
+    try {
+      const page = await fetchPropertyReviews(propertyId, next)
+      setAllReviews((current) => (next ? [...current, ...page.results] : page.results))
+      setNextPage(page.next)
+      setHasFetched(true)
+    } catch {
+      // Keep showing the embedded reviews
+    } finally {
+      setIsLoadingMore(false)
+    }
+  }
+
+  useEffect(() => {
+    if (isDialogOpen && !hasFetched) {
+      loadReviews()
+    }
+  }, [isDialogOpen])
   
   // Use a type-safe approach for rating distribution
-  const ratingDistribution = hasReviews 
+  const ratingDistribution = histogram
+    ? { 1: histogram['1'], 2: histogram['2'], 3: histogram['3'], 4: histogram['4'], 5: histogram['5'] } as Record<1 | 2 | 3 | 4 | 5, number>
+    : hasReviews
     ? reviews.reduce((acc, review) => {
         const rating = review.rating as 1 | 2 | 3 | 4 | 5;
         acc[rating] = (acc[rating] || 0) + 1;
@@ -139,9 +177,9 @@ export function ReviewSection({ reviews }: ReviewSectionProps) {
         ))}
       </div>
 
-      <Dialog>
+      <Dialog open={isDialogOpen} onOpenChange={setIsDialogOpen}>
         <DialogTrigger asChild>
-          {reviews.length > 1 && (
+          {totalReviews > 1 && (
             <Button variant="neutral" className="w-full">
               See all reviews
             </Button>
@@ -155,7 +193,7 @@ export function ReviewSection({ reviews }: ReviewSectionProps) {
           }}
         >
           <DialogHeader className="relative">
-            <DialogTitle>All Reviews ({reviews.length})</DialogTitle>
+            <DialogTitle>All Reviews ({totalReviews})</DialogTitle>
             <DialogDescription>
               Average rating: {averageRating.toFixed(1)}★ • {getRatingDescription(averageRating)}
             </DialogDescription>
@@ -163,7 +201,7 @@ export function ReviewSection({ reviews }: ReviewSectionProps) {
           
           <div className="relative">
             <div className="space-y-6 overflow-y-auto max-h-[calc(80vh-120px)] pr-2 pb-2">
-              {reviews.map((review) => (
+              {allReviews.map((review) => (
                 <div key={review.id} className="border-b pb-6 last:border-0">
                   <div className="flex items-start gap-4">
                     <div className="min-w-10 h-10 rounded-full bg-red-600 flex items-center justify-center">
@@ -196,6 +234,11 @@ export function ReviewSection({ reviews }: ReviewSectionProps) {
                   </div>
                 </div>
               ))}
+              {nextPage && (
+                <Button variant="neutral" className="w-full" disabled={isLoadingMore} onClick={() => loadReviews(nextPage)}>
+                  {isLoadingMore ? 'Loading...' : 'Load more reviews'}
+                </Button>
+              )}
             </div>
             
             {/* Scroll indicator */}
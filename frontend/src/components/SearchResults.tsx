@@ -306,23 +306,13 @@ function SearchResultsContent() {
       });
     } else if (selectedSort === "Rating: High to Low") {
       return filtered.sort((a, b) => {
-        const getRating = (property: Property) => {
-          if (property.reviews && Array.isArray(property.reviews) && property.reviews.length > 0) {
-            return property.reviews.reduce((sum, review) => sum + review.rating, 0) / property.reviews.length;
-          }
-          return 0;
-        };
+        const getRating = (property: Property) => property.rating ?? 0;
 
         return getRating(b) - getRating(a);
       });
     } else if (selectedSort === "Rating: Low to High") {
       return filtered.sort((a, b) => {
-        const getRating = (property: Property) => {
-          if (property.reviews && Array.isArray(property.reviews) && property.reviews.length > 0) {
-            return property.reviews.reduce((sum, review) => sum + review.rating, 0) / property.reviews.length;
-          }
-          return 0;
-        };
+        const getRating = (property: Property) => property.rating ?? 0;
 
         return getRating(a) - getRating(b);
       });
@@ -11,7 +11,6 @@ import { Blog } from '@/types/blog'
 import Image from 'next/image'
 import Link from 'next/link'
 import { format } from 'date-fns'
-import { extractPlainTextFromLexical } from '@/lib/utils/lexicalToHtml'
 
 interface HighlightedBlogsProps {
   type: 'hotel' | 'hostel'
@@ -141,7 +140,7 @@ export default function HighlightedBlogs({ type }: HighlightedBlogsProps) {
                   )}
                   
                   <p className="text-gray-600 text-base mb-5 line-clamp-2 flex-grow">
-                    {blog.content ? extractPlainTextFromLexical(blog.content) || "Discover more about this topic and explore our latest insights." : "Discover more about this topic and explore our latest insights."}
+                    {blog.excerpt || "Discover more about this topic and explore our latest insights."}
                   </p>
 
                   {/* CTA - Prominent like in the image */}
@@ -262,4 +262,34 @@ export const apiPatch = <T>(endpoint: string, body: any, options?: Omit<ApiOptio
   apiClient<T>(endpoint, { ...options, method: 'PATCH', body })
 
 export const apiDelete = <T>(endpoint: string, options?: Omit<ApiOptions, 'method'>) => 
-  apiClient<T>(endpoint, { ...options, method: 'DELETE' }) 
\ No newline at end of file
+  apiClient<T>(endpoint, { ...options, method: 'DELETE' }) 
+/** One page of a cursor-paginated list endpoint */
+export interface CursorPage<T> {
+  next: string | null
+  first?: string
+  results: T[]
+}
+
+/**
+ * Fetches every page of a cursor-paginated list endpoint by following `next`
+ * 
+ * @param endpoint List endpoint, with any filters already in its query string
+ * @param options Request options
+ * @param pageSize Rows per request (the API caps it at 200)
+ * @returns Promise with the rows of all pages, in the endpoint's order
+ */
+export async function apiGetAllPages<T>(
+  endpoint: string,
+  options?: Omit<ApiOptions, 'method' | 'body'>,
+  pageSize = 200
+): Promise<T[]> {
+  const separator = endpoint.includes('?') ? '&' : '?'
+  let next: string | null = `${endpoint}${separator}page_size=${pageSize}`
+  const rows: T[] = []
+  while (next) {
+    const page: CursorPage<T> = await apiGet<CursorPage<T>>(next, options)
+    rows.push(...page.results)
+    next = page.next
+  }
+  return rows
+}
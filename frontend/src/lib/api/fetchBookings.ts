@@ -1,4 +1,4 @@
-import { apiGet } from './apiClient'
+import { apiGetAllPages } from './apiClient'
 import { Booking } from '@/app/admin/bookings/page'
 
 /**
@@ -11,7 +11,7 @@ export async function fetchBookings(): Promise<Booking[]> {
   
   try {
     const userId = localStorage.getItem('userId')
-    return await apiGet<Booking[]>(`booking/bookings/user/?user_id=${userId}`)
+    return await apiGetAllPages<Booking>(`booking/bookings/user/?user_id=${userId}`)
   } catch (error) {
     // Error handling is already done in apiClient
     return []
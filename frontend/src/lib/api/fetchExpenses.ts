@@ -1,4 +1,4 @@
-import { apiGet } from './apiClient'
+import { apiGetAllPages } from './apiClient'
 import { type Expense } from '@/types/expense'
 
 /**
@@ -8,7 +8,7 @@ import { type Expense } from '@/types/expense'
  */
 export async function fetchExpenses(): Promise<Expense[]> {
   try {
-    return await apiGet<Expense[]>('expenses/expense/')
+    return await apiGetAllPages<Expense>('expenses/expense/')
   } catch (error) {
     // Error handling is already done in apiClient
     return []
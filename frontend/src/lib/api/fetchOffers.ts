@@ -1,4 +1,4 @@
-import { apiGet } from './apiClient'
+import { apiGetAllPages } from './apiClient'
 import { type Offer } from '@/types/offer'
 
 /**
@@ -8,7 +8,7 @@ import { type Offer } from '@/types/offer'
  */
 export async function fetchOffers(): Promise<Offer[]> {
   try {
-    return await apiGet<Offer[]>('offers/offers/')
+    return await apiGetAllPages<Offer>('offers/offers/')
   } catch (error) {
     // Error handling is already done in apiClient
     return []
@@ -0,0 +1,21 @@
+import { apiGet } from './apiClient'
+import { Review } from '@/types/property'
+
+export interface PropertyReviewsPage {
+  next: string | null
+  results: Review[]
+}
+
+/**
+ * One page of a property's active reviews, newest first. Pass the previous
+ * page's `next` URL to get the following page.
+ */
+export async function fetchPropertyReviews(propertyId: number | string, next?: string | null, pageSize = 20) {
+  const endpoint = next || `property/properties/${propertyId}/reviews/?page_size=${pageSize}`
+  try {
+    return await apiGet<PropertyReviewsPage>(endpoint, { includeAuth: false })
+  } catch (error) {
+    console.error('Failed to fetch property reviews', error)
+    throw error
+  }
+}
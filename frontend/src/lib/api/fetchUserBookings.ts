@@ -1,4 +1,4 @@
-import { apiGet } from './apiClient'
+import { apiGetAllPages } from './apiClient'
 import { Booking } from '@/types/booking'
 
 /**
@@ -7,7 +7,7 @@ import { Booking } from '@/types/booking'
  */
 export async function getUserBookings(): Promise<Booking[]> {
   try {
-    return await apiGet<Booking[]>('booking/bookings/user/')
+    return await apiGetAllPages<Booking>('booking/bookings/user/')
   } catch (error) {
     throw error
   }
@@ -1,6 +1,6 @@
 import { API_URL } from '../../lib/config'
 import { Property } from '@/types/property'
-import { apiGet } from './apiClient'
+import { apiGetAllPages } from './apiClient'
 
 /**
  * Fetch properties using public search API (no authentication required)
@@ -24,13 +24,13 @@ export async function searchProperties(
     
     console.log(`Fetching properties from: ${API_URL}${endpoint}`)
     
-    // Make the API request using apiGet
+    // Fetch every page of results
     if (localStorage.getItem('accessToken')) {
-      const properties = await apiGet<Property[]>(endpoint, { includeAuth: true });
+      const properties = await apiGetAllPages<Property>(endpoint, { includeAuth: true });
       console.log(`Successfully fetched ${properties.length} properties`)
       return properties
     } else {
-      const properties = await apiGet<Property[]>(endpoint, { includeAuth: false });
+      const properties = await apiGetAllPages<Property>(endpoint, { includeAuth: false });
       console.log(`Successfully fetched ${properties.length} properties`)
       return properties
     }
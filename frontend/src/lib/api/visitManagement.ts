@@ -1,4 +1,4 @@
-import { apiGet, apiPut, apiPost } from './apiClient'
+import { apiGetAllPages, apiPut, apiPost } from './apiClient'
 
 export interface HostelVisit {
   id: number
@@ -42,7 +42,7 @@ export interface UpdateVisitStatusRequest {
  * @returns Promise with visits array
  */
 export async function fetchVisits(): Promise<HostelVisit[]> {
-  return await apiGet<HostelVisit[]>('/booking/visits/')
+  return await apiGetAllPages<HostelVisit>('/booking/visits/')
 }
 
 /**
@@ -42,7 +42,9 @@ export interface Blog {
   author: BlogAuthor;
   featured_image?: BlogImage;
   images?: BlogImage[];
-  content: string; // JSON string from Lexical
+  content?: string; // JSON string from Lexical (detail responses only)
+  content_html?: string; // Sanitized HTML rendered from content (detail responses only)
+  excerpt: string; // Plain-text excerpt of content
   category?: BlogCategory;
   tags: BlogTag[];
   is_highlighted: boolean;
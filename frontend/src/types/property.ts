@@ -59,7 +59,11 @@ export interface Property {
     is_active: boolean;
   };
   area: string;
-  reviews?: Review[]; // Add reviews property
+  reviews?: Review[]; // Latest few only; the rest come from fetchPropertyReviews
+  rating?: number | null; // Average of all active reviews, null when there are none
+  review_count?: number;
+  rating_histogram?: Record<'1' | '2' | '3' | '4' | '5', number>;
+  best_offer?: any; // Best of the offers applying now; `offers` lists only those
   nearby_places?: NearbyPlace[];
   
   // Additional properties for PropertyForm compatibility
@@ -94,6 +94,30 @@ class ApiClient {
     return await _handleResponse(response, requestBody: null);
   }
 
+  /// Fetches every page of a cursor-paginated list endpoint by following
+  /// `next`, and returns the rows of all pages.
+  Future<List<dynamic>> getAllPages(String endpoint, {bool requiresAuth = false, int pageSize = 200}) async {
+    final rows = <dynamic>[];
+    final first = Uri.parse('$_baseUrl$endpoint');
+    final params = {...first.queryParameters, 'page_size': pageSize.toString()};
+    while (true) {
+      final headers = await _getHeaders(requiresAuth: requiresAuth);
+      final response = await _handleResponse(
+        await http.get(first.replace(queryParameters: params), headers: headers),
+      );
+      if (response.statusCode != 200) {
+        throw Exception('Failed to fetch $endpoint: ${response.body}');
+      }
+      final page = jsonDecode(response.body) as Map<String, dynamic>;
+      rows.addAll(page['results'] as List<dynamic>);
+      final next = page['next'] as String?;
+      if (next == null) {
+        return rows;
+      }
+      params['cursor'] = Uri.parse(next).queryParameters['cursor']!;
+    }
+  }
+
   Future<http.Response> post(String endpoint, Map<String, dynamic> body, {bool requiresAuth = false}) async {
     final headers = await _getHeaders(requiresAuth: requiresAuth);
     final bodyString = jsonEncode(body);
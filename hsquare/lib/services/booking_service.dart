@@ -27,16 +27,11 @@ class BookingService {
       throw Exception('User not authenticated');
     }
 
-    final response = await _apiClient.get(
+    final data = await _apiClient.getAllPages(
       '/booking/bookings/user/?user_id=$userId',
       requiresAuth: true,
     );
-
-    if (response.statusCode == 200) {
-      final List<dynamic> data = jsonDecode(response.body);
-      return data.map((json) => Booking.fromJson(json)).toList();
-    }
-    throw Exception('Failed to fetch bookings: ${response.body}');
+    return data.map((json) => Booking.fromJson(json)).toList();
   }
 
   Future<Booking> getBooking(int bookingId) async {
@@ -51,13 +51,8 @@ class PropertyService {
       endpoint += '?$queryString';
     }
     
-    final response = await _apiClient.get(endpoint, requiresAuth: false);
-    
-    if (response.statusCode == 200) {
-      final List<dynamic> data = jsonDecode(response.body);
-      return data.map((json) => Property.fromJson(json)).toList();
-    }
-    throw Exception('Failed to search properties: ${response.body}');
+    final data = await _apiClient.getAllPages(endpoint, requiresAuth: false);
+    return data.map((json) => Property.fromJson(json)).toList();
   }
 
   Future<Property> getProperty(int propertyId) async {
@@ -86,6 +86,26 @@ class ApiService {
     }
   }
   
+  // GET every page of a cursor-paginated list endpoint, following `next`
+  static Future<List<dynamic>> getAllPages(
+    String endpoint, {
+    Map<String, String>? queryParams,
+    bool includeAuth = true,
+    int pageSize = 200,
+  }) async {
+    final params = {...?queryParams, 'page_size': pageSize.toString()};
+    final rows = <dynamic>[];
+    while (true) {
+      final page = await get(endpoint, queryParams: params, includeAuth: includeAuth);
+      rows.addAll(page['results'] as List<dynamic>);
+      final next = page['next'] as String?;
+      if (next == null) {
+        return rows;
+      }
+      params['cursor'] = Uri.parse(next).queryParameters['cursor']!;
+    }
+  }
+  
   // POST request
   static Future<dynamic> post(
     String endpoint, {
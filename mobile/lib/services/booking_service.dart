@@ -6,20 +6,12 @@ class BookingService {
   // Get user bookings
   static Future<List<Booking>> getUserBookings() async {
     try {
-      final response = await ApiService.get(
+      final response = await ApiService.getAllPages(
         ApiConfig.userBookings,
         includeAuth: true,
       );
       
-      if (response == null) {
-        return [];
-      }
-      
-      if (response is List) {
-        return response.map((json) => Booking.fromJson(json)).toList();
-      }
-      
-      return [];
+      return response.map((json) => Booking.fromJson(json)).toList();
     } catch (e) {
       throw Exception('Failed to get user bookings: ${e.toString()}');
     }
@@ -201,21 +193,13 @@ class BookingService {
       if (limit != null) queryParams['limit'] = limit.toString();
       if (status != null) queryParams['status'] = status;
       
-      final response = await ApiService.get(
+      final response = await ApiService.getAllPages(
         ApiConfig.bookings,
         queryParams: queryParams,
         includeAuth: true,
       );
       
-      if (response == null) {
-        return [];
-      }
-      
-      if (response is List) {
-        return response.map((json) => Booking.fromJson(json)).toList();
-      }
-      
-      return [];
+      return response.map((json) => Booking.fromJson(json)).toList();
     } catch (e) {
       throw Exception('Failed to get all bookings: ${e.toString()}');
     }
@@ -82,21 +82,13 @@ class PropertyService {
       if (page != null) queryParams['page'] = page.toString();
       if (limit != null) queryParams['limit'] = limit.toString();
       
-      final response = await ApiService.get(
+      final response = await ApiService.getAllPages(
         ApiConfig.searchProperties,
         queryParams: queryParams,
         includeAuth: false,
       );
       
-      if (response == null) {
-        return [];
-      }
-      
-      if (response is List) {
-        return response.map((json) => Property.fromJson(json)).toList();
-      }
-      
-      return [];
+      return response.map((json) => Property.fromJson(json)).toList();
     } catch (e) {
       throw Exception('Failed to search properties: ${e.toString()}');
     }